@@ -8,6 +8,52 @@ import { DatasetProfile } from '../../../codegen/app/models';
 
 const execAsync = promisify(exec);
 
+// Warm profiling worker (python -m codegen.agents.profiling_worker)
+const PROFILING_WORKER_URL = process.env.PROFILING_WORKER_URL || 'http://127.0.0.1:8765';
+
+/**
+ * Profile the upload with the resident worker pool.
+ * Returns null when the worker is not running so the caller can fall back to a one-off script run.
+ */
+async function profileWithWorker(uploadPath: string): Promise<string | null> {
+    let response: Response;
+    try {
+        response = await fetch(`${PROFILING_WORKER_URL}/profile`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ file_path: uploadPath })
+        });
+    } catch {
+        return null;
+    }
+
+    const result = await response.json();
+    if (!response.ok) {
+        throw new Error(result.error || 'Profiling worker failed');
+    }
+    return result.profile_path;
+}
+
+async function profileWithScript(uploadPath: string): Promise<string> {
+    console.log(uploadPath);
+
+    // Run as a module from the repository root so package-relative imports resolve
+    const { stdout, stderr } = await execAsync(`pnpm exec python3 -m codegen.agents.base_eda "${uploadPath}"`, {
+        cwd: process.cwd()
+    });
+
+    // Only throw if stderr contains actual error messages (not INFO logs)
+    if (stderr && !stderr.includes('INFO:')) {
+        console.error('Python script error:', stderr);
+        throw new Error(stderr);
+    }
+
+    // Get the profile JSON file path from Python output
+    return stderr.includes('Profile saved to:')
+        ? stderr.split('Profile saved to:')[1].trim()
+        : stdout.trim();
+}
+
 export async function POST(request: NextRequest) {
     try {
         const formData = await request.formData();
@@ -34,23 +80,8 @@ export async function POST(request: NextRequest) {
         await writeFile(uploadPath, buffer);
 
         try {
-            // Execute the Python profiling script
-            const scriptPath = join(process.cwd(), 'codegen/agents/base_eda.py');
-            console.log(scriptPath);
-            console.log(uploadPath);
-
-            const { stdout, stderr } = await execAsync(`pnpm exec python3 "${scriptPath}" "${uploadPath}"`);
-            
-            // Only throw if stderr contains actual error messages (not INFO logs)
-            if (stderr && !stderr.includes('INFO:')) {
-                console.error('Python script error:', stderr);
-                throw new Error(stderr);
-            }
-
-            // Get the profile JSON file path from Python output
-            const profilePath = stderr.includes('Profile saved to:') 
-                ? stderr.split('Profile saved to:')[1].trim()
-                : stdout.trim();
+            // Prefer the warm worker pool; spawn the script only when it is not running
+            const profilePath = (await profileWithWorker(uploadPath)) ?? (await profileWithScript(uploadPath));
             
             // Read and parse the profile JSON file
             const profileContent = await readFile(profilePath, 'utf-8');
@@ -1,18 +1,27 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, Any
+from __future__ import annotations
+
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from pathlib import Path
 import json
 import argparse
 import sys
 import os
 from datetime import datetime
-from ydata_profiling import ProfileReport
 import logging
+
+if __package__ in (None, ""):
+    # Run as a script (python codegen/agents/base_eda.py <file>): resolve the relative
+    # imports against the package, as ``python -m codegen.agents.base_eda`` does (PEP 366)
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    import codegen.agents
+    __package__ = "codegen.agents"
+from ..metrics import stage
 # from app.models import DatasetProfile
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# pandas and ydata_profiling are imported on first use to keep CLI start-up cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 class DataProfiler:
@@ -22,47 +31,88 @@ class DataProfiler:
 
     def load_data(self, file_path: str) -> pd.DataFrame:
         """Load data from various file formats"""
+        import pandas as pd
+
         try:
-            if file_path.endswith('.csv'):
-                return pd.read_csv(file_path)
-            elif file_path.endswith(('.xls', '.xlsx')):
-                return pd.read_excel(file_path)
-            else:
-                raise ValueError("Unsupported file format")
+            with stage("load"):
+                if file_path.endswith('.csv'):
+                    return pd.read_csv(file_path)
+                elif file_path.endswith(('.xls', '.xlsx')):
+                    return pd.read_excel(file_path)
+                else:
+                    raise ValueError("Unsupported file format")
         except Exception as e:
             logger.error(f"Error loading file: {str(e)}")
             raise
 
-    def generate_profile(self, df: pd.DataFrame, dataset_name: str) -> Dict[str, Any]:
+    def generate_profile(self, df: pd.DataFrame, dataset_name: str,
+                         source_path: Optional[str] = None) -> Dict[str, Any]:
         """Generate profile using YData Profiling"""
+        from ydata_profiling import ProfileReport
+        from .correlations import compute_correlations
+        from .sketches import high_cardinality_columns, merge_sketched_variables, sketch_columns
+        from .time_index import (TimeIndexCache, choose_time_index, compute_rollups,
+                                 describe_time_index, parse_datetime_columns, write_rollups)
+
         try:
             # Get the directory where the current script is located
             current_dir = Path(__file__).parent
             config_path = current_dir / 'config.yml'
             
-            # Create YData profile with absolute path to config
-            profile = ProfileReport(df, title=dataset_name, config_file=str(config_path))
-            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{dataset_name}_{timestamp}_profile.json"
             filepath = self.upload_dir / filename
 
-            print(f"Profile saved to: {filepath}")
-
-            # Get profile as JSON data
-            str_data = profile.to_json()
+            # Parse date columns once (cached per source file) so ydata and the rollups see datetime64
+            with stage("time_index"):
+                cache = TimeIndexCache(str(self.upload_dir / "time_index_cache")) if source_path else None
+                parse_datetime_columns(df, cache=cache, source=source_path)
+                time_column = choose_time_index(df)
+
+            # ID-like and free-text columns get streaming sketches instead of ydata's full
+            # value_counts, most of which clean_profile_data throws away
+            with stage("sketch"):
+                sketched = high_cardinality_columns(df)
+                if len(sketched) == len(df.columns):
+                    sketched = []
+                sketches = sketch_columns(df, sketched)
+
+            with stage("profile"):
+                # Create YData profile with absolute path to config
+                profile = ProfileReport(df.drop(columns=sketched), title=dataset_name,
+                                        config_file=str(config_path))
+
+                # Get profile as JSON data (the report is computed lazily here)
+                str_data = profile.to_json()
             
             # Convert string to JSON if needed
-            if isinstance(str_data, str):
-                json_data = json.loads(str_data)
+            json_data = json.loads(str_data) if isinstance(str_data, str) else str_data
 
-            print([x for x in json_data['variables']])
+            logger.debug(f"Profiled variables: {list(json_data['variables'])}")
 
             # Clean the profile data
-            cleaned_data = clean_profile_data(json_data)
+            with stage("clean"):
+                cleaned_data = clean_profile_data(json_data)
+                merge_sketched_variables(cleaned_data, df, sketches)
+                table = cleaned_data.get("table", {})
+                # Rows can only look duplicated because a sketched column was left out
+                if sketches and table.get("n_duplicates"):
+                    table["n_duplicates"] = int(df.duplicated().sum())
+                    table["p_duplicates"] = table["n_duplicates"] / len(df)
+
+            # ydata's full correlation matrices are disabled in config.yml (quadratic in
+            # column count); keep only the strongest pairs instead
+            with stage("correlations"):
+                cleaned_data["correlations"] = compute_correlations(df)
             
+            # Precompute day/week/month rollups so time-trend charts don't touch the raw data
+            if time_column:
+                with stage("rollups"):
+                    cleaned_data["time_index_analysis"] = describe_time_index(df, time_column)
+                    write_rollups(str(filepath), compute_rollups(df, time_column))
+
             # Write cleaned JSON to file
-            with open(filepath, 'w') as f:
+            with stage("write"), open(filepath, 'w') as f:
                 json.dump(cleaned_data, f, indent=2)
             
             return str(filepath)
@@ -78,7 +128,7 @@ class DataProfiler:
         try:
             dataset_name = Path(file_path).stem
             df = self.load_data(file_path)
-            profile_path = self.generate_profile(df, dataset_name)
+            profile_path = self.generate_profile(df, dataset_name, source_path=file_path)
             
             
             logger.info(f"Profile saved to: {profile_path}")
@@ -89,6 +139,10 @@ class DataProfiler:
             raise
 
 
+# Most frequent levels kept per categorical variable
+CATEGORY_TOP_K = 20
+
+
 def clean_profile_data(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """Clean the profile data by removing specified keys at top level and within variables.
         Also truncates dictionaries with more than 100 elements to first 10 elements in variables.
@@ -131,6 +185,13 @@ def clean_profile_data(profile_data: Dict[str, Any]) -> Dict[str, Any]:
         if "variables" in cleaned_data and isinstance(cleaned_data["variables"], dict):
             for var_name, var_data in cleaned_data["variables"].items():
                 if isinstance(var_data, dict):
+                    # Keep the most frequent levels of categoricals (for drift checks between
+                    # versions) before the full value counts are dropped
+                    value_counts = var_data.get("value_counts_without_nan")
+                    if var_data.get("type") in ("Categorical", "Boolean") and isinstance(value_counts, dict):
+                        top = sorted(value_counts.items(), key=lambda item: -item[1])[:CATEGORY_TOP_K]
+                        var_data["top_k"] = [{"value": str(value), "count": int(count), "error": 0}
+                                             for value, count in top]
                     # First filter out keys to remove
                     filtered_dict = {k: v for k, v in var_data.items() 
                                   if k not in variable_keys_to_remove}
@@ -153,6 +214,7 @@ def main():
     parser.add_argument('input_file', help='Path to the input data file')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
     
     try:
         profiler = DataProfiler()
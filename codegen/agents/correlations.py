@@ -0,0 +1,257 @@
+"""Blocked, top-k correlation engine for wide tables.
+
+Pearson and Spearman are computed for numeric columns and Cramér's V for
+low-cardinality categoricals, one block of column pairs at a time, optionally
+across a process pool. Only the strongest pairs are kept (``top_k`` per column and
+``global_top_k`` overall), so memory stays linear in the number of columns
+instead of materializing full correlation matrices.
+"""
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Rows are sampled down to this many before correlating (None keeps every row)
+DEFAULT_SAMPLE_ROWS = 50_000
+# Columns per block; a block pair is one unit of work
+DEFAULT_BLOCK_SIZE = 256
+DEFAULT_TOP_K = 5
+DEFAULT_GLOBAL_TOP_K = 20
+# Weaker relationships are not worth reporting
+MIN_ABS_CORRELATION = 0.1
+# Pairs need at least this many rows where both values are present
+MIN_PAIR_COUNT = 10
+# Same limit ydata uses for categorical correlations (categorical_maximum_correlation_distinct)
+CRAMERS_MAX_LEVELS = 100
+NUMERIC_METHODS = ("pearson", "spearman")
+# Rows × column pairs below which a single-block method isn't worth a process pool
+MIN_PARALLEL_WORK = 50_000_000
+
+# Matrices shared with pool workers; inherited without copying under fork
+_SHARED: Dict[str, Any] = {}
+
+Candidate = Tuple[int, int, float]
+
+
+def _init_shared(shared: Dict[str, Any]) -> None:
+    _SHARED.clear()
+    _SHARED.update(shared)
+
+
+def _prepare_numeric(values: np.ndarray) -> Dict[str, Any]:
+    """Center columns over their present values; missing cells become 0 so they drop out of the sums"""
+    mask = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        centered = values - np.nanmean(values, axis=0)
+    centered[~mask] = 0.0
+    prepared = {"z": centered, "missing": not mask.all()}
+    if prepared["missing"]:
+        prepared["z2"] = centered * centered
+        prepared["mask"] = mask.astype(np.float64)
+    else:
+        prepared["ss"] = np.einsum("ij,ij->j", centered, centered)
+    return prepared
+
+
+def _numeric_block(method: str, a: slice, b: slice) -> np.ndarray:
+    """Correlation sub-matrix between column blocks ``a`` and ``b``"""
+    data = _SHARED[method]
+    z = data["z"]
+    num = z[:, a].T @ z[:, b]
+    if data["missing"]:
+        # Pairwise: each side's sum of squares only over rows where the other side is present
+        mask, z2 = data["mask"], data["z2"]
+        den = (z2[:, a].T @ mask[:, b]) * (mask[:, a].T @ z2[:, b])
+        counts = mask[:, a].T @ mask[:, b]
+    else:
+        den = np.outer(data["ss"][a], data["ss"][b])
+        counts = np.full(num.shape, len(z))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = num / np.sqrt(den)
+    r[counts < MIN_PAIR_COUNT] = np.nan
+    return r
+
+
+def _cramers_block(a: slice, b: slice) -> np.ndarray:
+    """Cramér's V between categorical column blocks ``a`` and ``b``"""
+    codes, levels = _SHARED["cramers"]["codes"], _SHARED["cramers"]["levels"]
+    out = np.full((a.stop - a.start, b.stop - b.start), np.nan)
+    for i in range(a.start, a.stop):
+        for j in range(max(b.start, i + 1) if a == b else b.start, b.stop):
+            ci, cj = codes[:, i], codes[:, j]
+            valid = (ci >= 0) & (cj >= 0)
+            n = int(valid.sum())
+            if n < MIN_PAIR_COUNT:
+                continue
+            table = np.bincount(ci[valid] * levels[j] + cj[valid], minlength=levels[i] * levels[j])
+            table = table.reshape(levels[i], levels[j]).astype(np.float64)
+            rows, cols = table.sum(axis=1), table.sum(axis=0)
+            table = table[np.ix_(rows > 0, cols > 0)]
+            rows, cols = rows[rows > 0], cols[cols > 0]
+            k = min(len(rows), len(cols)) - 1
+            if k < 1:
+                continue
+            # chi2 / n, from observed counts against the independence expectation
+            phi2 = (table * table / np.outer(rows, cols)).sum() - 1.0
+            out[i - a.start, j - b.start] = np.sqrt(max(phi2, 0.0) / k)
+    if a == b:
+        # Only the upper triangle is computed; mirror it so rows see every partner
+        out = np.where(np.isnan(out), out.T, out)
+    return out
+
+
+def _top_candidates(r: np.ndarray, a: slice, b: slice, top_k: int, global_top_k: int) -> List[Candidate]:
+    """Strongest pairs in one block: top-k per row, per column and for the whole block"""
+    strength = np.nan_to_num(np.abs(r), nan=0.0)
+    if a == b:
+        np.fill_diagonal(strength, 0.0)
+    strength[strength < MIN_ABS_CORRELATION] = 0.0
+
+    picks = set()
+    for axis in (1, 0):
+        k = min(top_k, strength.shape[axis])
+        top = np.argpartition(-strength, k - 1, axis=axis).take(range(k), axis=axis)
+        for other, best in np.ndenumerate(top):
+            i, j = (other[0], best) if axis == 1 else (best, other[1])
+            picks.add((i, j))
+    flat = strength.ravel()
+    k = min(global_top_k, flat.size)
+    for idx in np.argpartition(-flat, k - 1)[:k]:
+        picks.add(divmod(int(idx), strength.shape[1]))
+
+    candidates = []
+    for i, j in picks:
+        if strength[i, j] > 0.0:
+            gi, gj = a.start + int(i), b.start + int(j)
+            if a == b and gi > gj:
+                gi, gj = gj, gi
+            candidates.append((gi, gj, float(r[i, j])))
+    return candidates
+
+
+def _run_block(task: Tuple[str, slice, slice, int, int]) -> Tuple[str, List[Candidate]]:
+    method, a, b, top_k, global_top_k = task
+    r = _cramers_block(a, b) if method == "cramers" else _numeric_block(method, a, b)
+    return method, _top_candidates(r, a, b, top_k, global_top_k)
+
+
+def _blocks(n: int, block_size: int) -> List[slice]:
+    return [slice(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+
+def _summarize(names: List[str], candidates: Dict[Tuple[int, int], float],
+               top_k: int, global_top_k: int) -> Dict[str, Any]:
+    """Turn candidate pairs into the compact top-pairs / per-column section"""
+    by_strength = lambda item: abs(item[1])
+    top_pairs = heapq.nlargest(global_top_k, candidates.items(), key=by_strength)
+
+    partners: Dict[int, List[Tuple[int, float]]] = {}
+    for (i, j), value in candidates.items():
+        partners.setdefault(i, []).append((j, value))
+        partners.setdefault(j, []).append((i, value))
+
+    return {
+        "top_pairs": [{"a": names[i], "b": names[j], "value": round(value, 4)}
+                      for (i, j), value in top_pairs],
+        "per_column": {
+            names[i]: [{"column": names[j], "value": round(value, 4)}
+                       for j, value in heapq.nlargest(top_k, found, key=by_strength)]
+            for i, found in sorted(partners.items())
+        },
+    }
+
+
+def _split_columns(df: pd.DataFrame, max_levels: int) -> Tuple[List[str], List[str]]:
+    numeric, categorical = [], []
+    for name, dtype in df.dtypes.items():
+        if dtype.kind in "iuf":
+            numeric.append(name)
+        elif dtype.kind in "bOSU" or str(dtype) in ("category", "string"):
+            n_levels = df[name].nunique(dropna=True)
+            if 1 < n_levels <= max_levels:
+                categorical.append(name)
+    return numeric, categorical
+
+
+def compute_correlations(df: pd.DataFrame, top_k: int = DEFAULT_TOP_K,
+                         global_top_k: int = DEFAULT_GLOBAL_TOP_K,
+                         sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS,
+                         block_size: int = DEFAULT_BLOCK_SIZE, workers: Optional[int] = None,
+                         max_levels: int = CRAMERS_MAX_LEVELS) -> Dict[str, Any]:
+    """Top-k Pearson, Spearman and Cramér's V relationships for every column.
+
+    Returns ``{"n_rows_used", "sampled", "pearson", "spearman", "cramers"}``, where
+    each method holds ``top_pairs`` (strongest overall) and ``per_column``
+    (strongest partners of each column). ``workers`` defaults to the CPU count;
+    a pool is only started when some method has more than one block of work, or
+    the matrices are large (``MIN_PARALLEL_WORK``); otherwise it runs inline.
+    """
+    sampled = sample_rows is not None and len(df) > sample_rows
+    if sampled:
+        df = df.take(np.random.default_rng(0).choice(len(df), size=sample_rows, replace=False))
+
+    numeric, categorical = _split_columns(df, max_levels)
+    values = df[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Constant and empty columns have no correlation
+    varying = np.fmax.reduce(values, axis=0, initial=-np.inf) > np.fmin.reduce(values, axis=0, initial=np.inf)
+    numeric = [name for name, keep in zip(numeric, varying) if keep]
+
+    shared: Dict[str, Any] = {}
+    if len(numeric) > 1:
+        shared["pearson"] = _prepare_numeric(values[:, varying])
+        # Spearman is Pearson on average ranks
+        shared["spearman"] = _prepare_numeric(df[numeric].rank().to_numpy(dtype=np.float64, na_value=np.nan))
+    if len(categorical) > 1:
+        codes = np.empty((len(df), len(categorical)), dtype=np.int64)
+        levels = np.empty(len(categorical), dtype=np.int64)
+        for idx, name in enumerate(categorical):
+            column_codes, uniques = df[name].factorize(use_na_sentinel=True)
+            codes[:, idx], levels[idx] = column_codes, max(len(uniques), 1)
+        shared["cramers"] = {"codes": codes, "levels": levels}
+
+    tasks = []
+    multi_block, work = False, 0
+    for method in shared:
+        n_columns = len(categorical if method == "cramers" else numeric)
+        blocks = _blocks(n_columns, block_size)
+        multi_block = multi_block or len(blocks) > 1
+        work += len(df) * n_columns * n_columns
+        tasks.extend((method, a, b, top_k, global_top_k)
+                     for ai, a in enumerate(blocks) for b in blocks[ai:])
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if not multi_block and work < MIN_PARALLEL_WORK:
+        # One small block per method: forking workers costs more than it saves
+        workers = 1
+    if workers > 1:
+        context = multiprocessing.get_context(
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_shared, initargs=(shared,)) as pool:
+            results = list(pool.map(_run_block, tasks))
+    else:
+        _init_shared(shared)
+        try:
+            results = [_run_block(task) for task in tasks]
+        finally:
+            _SHARED.clear()
+
+    candidates: Dict[str, Dict[Tuple[int, int], float]] = {method: {} for method in shared}
+    for method, found in results:
+        for i, j, value in found:
+            candidates[method][(i, j)] = value
+
+    section: Dict[str, Any] = {"n_rows_used": len(df), "sampled": sampled}
+    for method in (*NUMERIC_METHODS, "cramers"):
+        names = categorical if method == "cramers" else numeric
+        section[method] = (_summarize(names, candidates[method], top_k, global_top_k)
+                           if method in candidates else None)
+    return section
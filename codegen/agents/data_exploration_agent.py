@@ -1,4 +1,3 @@
-import pandas as pd
 from pathlib import Path
 from typing import Dict, Any
 
@@ -6,11 +5,12 @@ class DataExplorationAgent:
     """Automates basic EDA and suggests visuals."""
 
     def explore(self, csv_path: str) -> Dict[str, Any]:
+        import pandas as pd
+        from .summary_engine import summarize_frame, suggest_visuals
+        from .time_index import parse_datetime_columns
+
         df = pd.read_csv(csv_path)
-        summary = df.describe(include='all').to_dict()
-        visuals = []
-        if 'date' in df.columns or any('date' in c.lower() for c in df.columns):
-            visuals.append({'type': 'line', 'x': 'date', 'y': df.columns[1]})
-        if len(df.columns) >= 2:
-            visuals.append({'type': 'bar', 'x': df.columns[0], 'y': df.columns[1]})
+        parse_datetime_columns(df)
+        summary = summarize_frame(df)
+        visuals = suggest_visuals(summary)
         return {'summary': summary, 'suggested_visuals': visuals}
@@ -1,20 +1,22 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
-from openai import OpenAI
-from dotenv import load_dotenv
+from .llm import create_chat_completion
 
-# Load environment variables from .env file
-load_dotenv()
-
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DatasetProfilerAgent:
     """Agent responsible for analyzing and summarizing dataset profile information"""
     
     def __init__(self):
+        # Deferred so importing the module stays cheap for CLI calls and tests
+        from openai import OpenAI
+        from dotenv import load_dotenv
+
+        # Load environment variables from .env file
+        load_dotenv()
+
         api_key = os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables")
@@ -32,6 +34,7 @@ class DatasetProfilerAgent:
             4. Variable Analysis - key columns and their distributions
             5. Relationships - notable correlations or patterns
             6. Potential Issues - data quality alerts or concerns
+            7. Changes - when a drift section is given, what changed since the previous version
             
             Go through each section of the JSON data given without skipping any keys.
             Your response be in line with idea of driving a user to efficiently explore the data.
@@ -42,22 +45,35 @@ class DatasetProfilerAgent:
             """
         }
 
-    def generate_profile_summary(self, profile_path: str) -> str:
-        """Generate a complete summary of the dataset profile using OpenAI"""
+    def generate_profile_summary(self, profile_path: str, previous_profile_path: Optional[str] = None) -> str:
+        """Generate a complete summary of the dataset profile using OpenAI.
+
+        If an earlier profile of the same dataset exists (or is given), a drift
+        section computed from the two profiles is included.
+        """
+        from app.profile_diff import diff_profile_files, format_drift, previous_profile_path as find_previous
+
         try:
             # Load profile data
             with open(profile_path, 'r') as f:
                 profile_data = json.load(f)
             
+            content = f"Please analyze this dataset profile and provide a structured summary:\n{json.dumps(profile_data, indent=2)}"
+            previous_profile_path = previous_profile_path or find_previous(profile_path)
+            if previous_profile_path:
+                drift = format_drift(diff_profile_files(previous_profile_path, profile_path))
+                content += f"\n\nChanges since the previous version of this dataset:\n{drift}"
             
             # Create user message with the profile data
             user_message = {
                 "role": "user", 
-                "content": f"Please analyze this dataset profile and provide a structured summary:\n{json.dumps(profile_data, indent=2)}"
+                "content": content
             }
             
-            # Call OpenAI API with proper message structure
-            response = self.client.chat.completions.create(
+            # Call OpenAI API with proper message structure (streamed so TTFT is measured)
+            return create_chat_completion(
+                self.client,
+                agent="dataset_profiler",
                 extra_headers={
                     "HTTP-Referer": "", 
                     "X-Title": "",
@@ -74,8 +90,6 @@ class DatasetProfilerAgent:
                 max_tokens=2048,
                 top_p=1
             )
-            
-            return response.choices[0].message.content
 
         except Exception as e:
             logger.error(f"Error generating profile summary: {str(e)}")
@@ -84,6 +98,7 @@ class DatasetProfilerAgent:
     
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     import sys
     
     if len(sys.argv) > 1:
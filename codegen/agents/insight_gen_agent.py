@@ -1,19 +1,21 @@
 import os
 from typing import Dict, Any, Tuple, List
 import logging
-from openai import OpenAI
-from dotenv import load_dotenv
+from .llm import create_chat_completion
 
-# Load environment variables from .env file
-load_dotenv()
-
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class InsightGenAgent:
     """Agent responsible for generating insights and questions based on dataset profile summaries"""
     
     def __init__(self):
+        # Deferred so importing the module stays cheap for CLI calls and tests
+        from openai import OpenAI
+        from dotenv import load_dotenv
+
+        # Load environment variables from .env file
+        load_dotenv()
+
         api_key = os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables")
@@ -56,8 +58,10 @@ class InsightGenAgent:
                 "content": f"Based on this dataset profile summary, generate three insights and create three relevant open-ended questions which are connected to the insights:\n\n{profile_summary}"
             }
             
-            # Call OpenAI API with proper message structure
-            response = self.client.chat.completions.create(
+            # Call OpenAI API with proper message structure (streamed so TTFT is measured)
+            content = create_chat_completion(
+                self.client,
+                agent="insight_gen",
                 extra_headers={
                     "HTTP-Referer": "", 
                     "X-Title": "",
@@ -73,7 +77,6 @@ class InsightGenAgent:
             )
             
             # Parse response
-            content = response.choices[0].message.content
             insights = []
             questions = []
             
@@ -115,7 +118,23 @@ class InsightGenAgent:
             logger.error(f"Error generating insights and questions: {str(e)}")
             raise
 
+    def complete(self, prompt: str) -> str:
+        """Raw completion for a chart prompt (the ``llm`` callable the orchestrator builds dashboards with)"""
+        return create_chat_completion(
+            self.client,
+            agent="dashboard_config",
+            extra_headers={
+                "HTTP-Referer": "",
+                "X-Title": "",
+            },
+            model="mistralai/mistral-small-3.1-24b-instruct:free",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=2048,
+        )
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     # Example usage
     example_summary = """
    ### Dataset Overview  
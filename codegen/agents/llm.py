@@ -0,0 +1,39 @@
+import time
+from typing import Any
+
+from ..metrics import observe_llm_call
+
+
+def create_chat_completion(client: Any, agent: str, **kwargs: Any) -> str:
+    """Stream a chat completion and return its text, recording latency, TTFT and token usage"""
+    model = kwargs.get("model", "unknown")
+    start = time.perf_counter()
+    ttft = None
+    usage = None
+    parts = []
+
+    stream = client.chat.completions.create(
+        stream=True,
+        stream_options={"include_usage": True},
+        **kwargs
+    )
+    for chunk in stream:
+        if getattr(chunk, "usage", None):
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            parts.append(content)
+
+    observe_llm_call(
+        agent=agent,
+        model=model,
+        duration=time.perf_counter() - start,
+        ttft=ttft,
+        prompt_tokens=getattr(usage, "prompt_tokens", None),
+        completion_tokens=getattr(usage, "completion_tokens", None),
+    )
+    return "".join(parts)
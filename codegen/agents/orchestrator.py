@@ -1,29 +1,76 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Callable, Optional
 from app.models import DatasetProfile
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from .insight_gen_agent import InsightGenAgent
 from app.context_manager import ContextManager
+from app.compact_profile import CompactProfile
+from app.summary_agent_prompt_template import format_dataset_profile, generate_dashboard_config
+import json
 import logging
+import re
+import threading
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CONVERSATION_TURNS = 3
+# A superseded build may still be waiting on the LLM, so the next one gets its own worker
+SPECULATION_WORKERS = 2
+# Only a bare confirmation accepts the offer; anything longer is a new requirement
+AFFIRMATIVE = re.compile(r"\s*(?:(?:yes|y|yeah|yep|sure|ok|okay)(?:,?\s*please)?|please(?: do)?|go ahead|"
+                         r"(?:generate|build|do) it)\s*[.!]*\s*", re.IGNORECASE)
+
+
+class SpeculationCancelled(Exception):
+    """A speculative dashboard build was superseded by newer user input"""
+
+
+@dataclass
+class Speculation:
+    """A dashboard build started in the background for the requirements gathered so far"""
+    generation: int
+    requirements: str
+    cancelled: threading.Event
+    future: Future
+
+
 class Orchestrator:
     """Agent responsible for orchestrating conversations with users about their dashboard needs"""
     
-    def __init__(self, context_manager: ContextManager):
-        """Initialize the orchestrator with a context manager"""
+    def __init__(self, context_manager: ContextManager, llm: Optional[Callable[[str], str]] = None,
+                 insight_agent: Optional[InsightGenAgent] = None, speculate: bool = True):
+        """Initialize the orchestrator with a context manager.
+
+        ``llm`` takes a chart prompt and returns the raw completion (see
+        ``generate_dashboard_config``); it defaults to the insight agent's client
+        when that agent is created here. With ``speculate``, a dashboard is built in
+        the background after every answer, so it is ready when the user asks for it.
+        """
         self.context_manager = context_manager
-        self.insight_agent = InsightGenAgent()
+        if insight_agent is None:
+            insight_agent = InsightGenAgent()
+            llm = llm or insight_agent.complete
+        self.insight_agent = insight_agent
+        self.llm = llm
+        self.speculate = speculate
+        self.profile: Optional[DatasetProfile] = None
         self.current_turn = 0
         self.insights = []
         self.questions = []
+        self.responses: List[str] = []
+        self._generation = 0
+        self._speculation: Optional[Speculation] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
         
     def initialize_conversation(self, profile: DatasetProfile) -> str:
         """Initialize the conversation by getting insights and questions"""
         try:
+            self.profile = profile
             # Get insights and questions from insight agent
-            self.insights, self.questions = self.insight_agent.generate_insight_and_question(profile)
+            self.insights, self.questions = self.insight_agent.generate_insight_and_question(
+                format_dataset_profile(profile))
             
             # Start first turn of conversation
             return self._format_turn_message(0)
@@ -37,12 +84,21 @@ class Orchestrator:
         try:
             # Store user's response
             self.context_manager.add_user_input(user_response)
+
+            # A yes to the dashboard offer picks up the build that started with the last answer
+            if self.current_turn >= CONVERSATION_TURNS and AFFIRMATIVE.fullmatch(user_response):
+                config = self.generate_dashboard()
+                return f"Here's your dashboard configuration:\n{json.dumps(config, indent=2)}"
+
+            # Anything else adds to the requirements and restarts the background build
+            self.responses.append(user_response)
+            self._speculate()
             
             # Move to next turn
             self.current_turn += 1
             
             # If we still have turns left
-            if self.current_turn < 3:
+            if self.current_turn < CONVERSATION_TURNS:
                 return self._format_turn_message(self.current_turn)
             
             # If we're done with all turns
@@ -52,6 +108,81 @@ class Orchestrator:
             logger.error(f"Error processing response: {str(e)}")
             raise
             
+    def requirements(self) -> str:
+        """The user's answers so far, each after the question it answers"""
+        parts = []
+        for i, response in enumerate(self.responses):
+            parts.append(f"{self.questions[i]}\n{response}" if i < len(self.questions) else response)
+        return "\n\n".join(parts)
+
+    def _build_dashboard(self, requirements: str, cancelled: threading.Event,
+                         use_llm: bool = True) -> Dict[str, Any]:
+        if cancelled.is_set():
+            raise SpeculationCancelled()
+        llm = None
+        if use_llm and self.llm is not None:
+            def llm(prompt: str) -> str:
+                # Last point to back out before paying for the LLM call
+                if cancelled.is_set():
+                    raise SpeculationCancelled()
+                return self.llm(prompt)
+        return generate_dashboard_config(self.profile, requirements, llm=llm)
+
+    def _speculate(self) -> None:
+        """Start building the dashboard for the current requirements, cancelling the previous build"""
+        if not self.speculate or self.profile is None:
+            return
+        with self._lock:
+            self._cancel_speculation()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=SPECULATION_WORKERS,
+                                                    thread_name_prefix="dashboard-speculation")
+            self._generation += 1
+            requirements, cancelled = self.requirements(), threading.Event()
+            future = self._executor.submit(self._build_dashboard, requirements, cancelled)
+            self._speculation = Speculation(self._generation, requirements, cancelled, future)
+
+    def _cancel_speculation(self) -> None:
+        if self._speculation is not None:
+            self._speculation.cancelled.set()
+            self._speculation.future.cancel()
+            logger.debug(f"Cancelled speculative dashboard {self._speculation.generation}")
+            self._speculation = None
+
+    def generate_dashboard(self) -> Dict[str, Any]:
+        """Dashboard config for the requirements so far, reusing the background build when it matches.
+
+        If that build failed, the rule engine's dashboard is returned rather than
+        repeating the failing LLM call while the user waits.
+        """
+        if self.profile is None:
+            raise ValueError("No dataset profile; call initialize_conversation() first")
+        requirements = self.requirements()
+        with self._lock:
+            speculation = self._speculation
+        if speculation is not None and speculation.requirements == requirements:
+            try:
+                return speculation.future.result()
+            except Exception as e:
+                logger.warning(f"Speculative dashboard {speculation.generation} failed, "
+                               f"using the rule engine: {str(e)}")
+                return self._build_dashboard(requirements, threading.Event(), use_llm=False)
+        return self._build_dashboard(requirements, threading.Event())
+
+    def close(self) -> None:
+        """Cancel any background build and stop the worker threads"""
+        with self._lock:
+            self._cancel_speculation()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def __enter__(self) -> "Orchestrator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _format_turn_message(self, turn_index: int) -> str:
         """Format the message for a given turn"""
         return f"""
@@ -65,13 +196,15 @@ if __name__ == "__main__":
     # Example usage
     import sys
     import json
+
+    logging.basicConfig(level=logging.INFO)
     
     if len(sys.argv) > 1:
         with open(sys.argv[1], 'r') as f:
             profile_data = json.load(f)
-            profile = DatasetProfile(**profile_data)
+            profile = CompactProfile.from_dict(profile_data)
             context_manager = ContextManager()
-            orchestrator = Orchestrator(context_manager)
-            print(orchestrator.initialize_conversation(profile))
+            with Orchestrator(context_manager) as orchestrator:
+                print(orchestrator.initialize_conversation(profile))
     else:
         print("Please provide a path to a profile JSON file") 
\ No newline at end of file
@@ -1,6 +1,5 @@
 import os
 from typing import Dict, List, Any
-from openai import OpenAI
 
 class ClarificationRequired(Exception):
     """Raised when the user must clarify missing fields."""
@@ -14,6 +13,8 @@ class OpenAIOrchestratorAgent:
     def __init__(self, assistant_id: str | None = None):
         api_key = os.getenv("OPENROUTER_API_KEY")
         if api_key:
+            # Only pay for the SDK import when a key is configured
+            from openai import OpenAI
             self.client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
         else:
             self.client = None
@@ -0,0 +1,317 @@
+"""Long-lived profiling worker.
+
+Keeps a pool of warm Python processes with pandas and ydata_profiling already
+imported, and serves ``DataProfiler.process_file`` over a local HTTP endpoint
+(TCP or Unix socket). Uploads then only pay for the profiling itself instead of
+interpreter start-up and heavy imports on every request.
+
+Concurrent requests for the same file content are coalesced into one profiling
+run, and admission control caps how many distinct jobs run or wait at once;
+requests beyond that are rejected with 503 so callers can retry.
+
+Run from the repository root:
+
+    python -m codegen.agents.profiling_worker --port 8765 --workers 2
+
+Endpoints:
+    GET  /health   -> {"status": "ok", "workers": 2, "jobs_completed": 10}
+    GET  /metrics  -> per-stage metrics in the Prometheus text format
+    POST /profile  {"file_path": "..."} -> {"profile_path": "..."}
+"""
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socketserver
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .. import metrics
+from .single_flight import AdmissionController, AdmissionRejected, SingleFlight, file_content_hash
+
+logger = logging.getLogger(__name__)
+
+# Modules imported once in the fork server so every worker starts warm
+HEAVY_MODULES = ["pandas", "numpy", "ydata_profiling", "codegen.agents.base_eda"]
+
+
+def _warm_up(modules: List[str] = HEAVY_MODULES) -> None:
+    """Pool initializer: make sure heavy modules are imported before the first job"""
+    for name in modules:
+        importlib.import_module(name)
+
+
+def _profile_file(file_path: str, upload_dir: str) -> Tuple[str, Dict[str, Any]]:
+    """Run the profiling pipeline for one file inside a pool worker.
+
+    Returns the absolute profile path and the stage metrics recorded for this job,
+    which the parent merges into its own registry.
+    """
+    from codegen.agents.base_eda import DataProfiler
+
+    # Fresh registry per job so only this job's observations are shipped back
+    metrics.registry = metrics.MetricsRegistry(enabled=metrics.registry.enabled)
+    profile_path = DataProfiler(upload_dir=upload_dir).process_file(file_path)
+    return str(Path(profile_path).resolve()), metrics.registry.export_state()
+
+
+class ProfilingPool:
+    """Pool of warm profiling processes that are recycled after a number of jobs"""
+
+    def __init__(self, workers: int = 2, recycle_after: int = 50,
+                 upload_dir: str = "uploads/", job_timeout: Optional[float] = 600,
+                 max_waiting: int = 8, warm_modules: Optional[List[str]] = None):
+        self.workers = workers
+        self.warm_modules = HEAVY_MODULES if warm_modules is None else warm_modules
+        self.recycle_after = recycle_after
+        self.upload_dir = upload_dir
+        self.job_timeout = job_timeout
+        self.jobs_completed = 0
+        self.jobs_coalesced = 0
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+        self.admission = AdmissionController(max_concurrent=workers, max_waiting=max_waiting)
+        self.pools_replaced = 0
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # forkserver preloads the heavy modules once; recycled workers fork from it warm
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(self.warm_modules)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_warm_up,
+            initargs=(self.warm_modules,),
+            max_tasks_per_child=self.recycle_after,
+        )
+
+    def prime(self) -> None:
+        """Start the workers up front so the first upload does not pay for imports"""
+        futures = [self._executor.submit(_warm_up, self.warm_modules) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+        logger.info(f"Profiling pool ready with {self.workers} warm workers")
+
+    def _submit(self, fn: Callable, *args: Any) -> Any:
+        """Run ``fn`` in a worker once admitted; a worker that dies breaks the whole executor, so it is replaced.
+
+        The admission slot is held until the job finishes, so a job that outlives
+        ``job_timeout`` still counts against the cap.
+        """
+        executor = self._executor
+        try:
+            future = self.admission.submit(lambda: executor.submit(fn, *args))
+            return future.result(timeout=self.job_timeout)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            raise
+
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # Concurrent jobs see the same broken executor; only the first replaces it
+            if self._executor is not broken:
+                return
+            self._executor = self._new_executor()
+            self.pools_replaced += 1
+        logger.error("A profiling worker died; replaced the process pool")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def profile(self, file_path: str) -> str:
+        """Profile a file in a warm worker and return the absolute profile path.
+
+        Identical concurrent requests (same file name and content) share one run.
+        """
+        key = f"{Path(file_path).stem}:{file_content_hash(file_path)}"
+        profile_path, shared = self._single_flight.do(
+            key,
+            lambda: self._run_job(file_path),
+            timeout=self.job_timeout,
+        )
+        if shared:
+            with self._lock:
+                self.jobs_coalesced += 1
+            logger.info(f"Coalesced duplicate profiling request for {file_path}")
+        return profile_path
+
+    def _run_job(self, file_path: str) -> str:
+        with metrics.stage("profile_job"):
+            profile_path, job_metrics = self._submit(_profile_file, file_path, self.upload_dir)
+        metrics.registry.merge_state(job_metrics)
+        with self._lock:
+            self.jobs_completed += 1
+        return profile_path
+
+    def shutdown(self) -> None:
+        """Let running jobs finish, then stop the workers"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ProfilingRequestHandler(BaseHTTPRequestHandler):
+    """JSON-over-HTTP front end for the profiling pool"""
+
+    server_version = "YudaiProfilingWorker/1.0"
+
+    @property
+    def pool(self) -> ProfilingPool:
+        return self.server.pool
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            data = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found"})
+            return
+        self._send_json(200, {
+            "status": "ok",
+            "workers": self.pool.workers,
+            "jobs_completed": self.pool.jobs_completed,
+            "jobs_coalesced": self.pool.jobs_coalesced,
+            "jobs_running": self.pool.admission.running,
+            "jobs_waiting": self.pool.admission.waiting,
+            "pools_replaced": self.pool.pools_replaced,
+        })
+
+    def do_POST(self) -> None:
+        if self.path != "/profile":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Request body must be JSON"})
+            return
+        if not isinstance(payload, dict):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return
+
+        file_path = payload.get("file_path")
+        if not file_path or not isinstance(file_path, str):
+            self._send_json(400, {"error": "file_path is required"})
+            return
+        if not os.path.exists(file_path):
+            self._send_json(404, {"error": f"File not found: {file_path}"})
+            return
+
+        status, body = self._run_profile(file_path)
+        self._send_json(status, body)
+
+    def _run_profile(self, file_path: str) -> Tuple[int, Dict[str, Any]]:
+        try:
+            return 200, {"profile_path": self.pool.profile(file_path)}
+        except AdmissionRejected as e:
+            logger.warning(f"Rejected profiling request for {file_path}: {str(e)}")
+            return 503, {"error": "Profiling queue is full, retry later"}
+        except FutureTimeoutError:
+            logger.error(f"Profiling timed out: {file_path}")
+            return 504, {"error": "Profiling timed out"}
+        except BrokenProcessPool:
+            logger.error(f"Profiling worker crashed on {file_path}")
+            return 500, {"error": "Profiling worker crashed; the pool was restarted"}
+        except Exception as e:
+            logger.error(f"Error profiling {file_path}: {str(e)}")
+            return 500, {"error": str(e)}
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) pair
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info(f"{self.address_string()} - {format % args}")
+
+
+class ProfilingHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server over TCP that carries a reference to the pool"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], pool: ProfilingPool):
+        self.pool = pool
+        super().__init__(address, ProfilingRequestHandler)
+
+
+class ProfilingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server over a Unix domain socket"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pool: ProfilingPool):
+        self.pool = pool
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, ProfilingRequestHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a warm profiling worker pool.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind (TCP mode)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind (TCP mode)")
+    parser.add_argument("--socket", help="Serve on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=2, help="Number of warm worker processes")
+    parser.add_argument("--recycle-after", type=int, default=50,
+                        help="Replace a worker after it has run this many jobs")
+    parser.add_argument("--upload-dir", default="uploads/", help="Directory for profile JSON output")
+    parser.add_argument("--job-timeout", type=float, default=600, help="Seconds before a job is abandoned")
+    parser.add_argument("--max-waiting", type=int, default=8,
+                        help="Distinct jobs allowed to wait for a worker before requests are rejected")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    pool = ProfilingPool(
+        workers=args.workers,
+        recycle_after=args.recycle_after,
+        upload_dir=args.upload_dir,
+        job_timeout=args.job_timeout,
+        max_waiting=args.max_waiting,
+    )
+    pool.prime()
+
+    if args.socket:
+        server = ProfilingUnixServer(args.socket, pool)
+        logger.info(f"Profiling worker listening on unix:{args.socket}")
+    else:
+        server = ProfilingHTTPServer((args.host, args.port), pool)
+        logger.info(f"Profiling worker listening on http://{args.host}:{args.port}")
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
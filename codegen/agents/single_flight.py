@@ -0,0 +1,110 @@
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class AdmissionRejected(Exception):
+    """Raised when too many jobs are already running or waiting."""
+    def __init__(self, running: int, waiting: int):
+        self.running = running
+        self.waiting = waiting
+        super().__init__(f"Admission rejected: {running} running, {waiting} waiting")
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller for a key runs the function; callers that arrive while it is
+    running wait for and share its result (or exception). Nothing is cached once
+    the call finishes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def do(self, key: str, func: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """Run ``func`` once per in-flight key. Returns (result, shared)"""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            return future.result(timeout=timeout), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def inflight(self) -> int:
+        """Number of keys currently being computed"""
+        with self._lock:
+            return len(self._inflight)
+
+
+class AdmissionController:
+    """Caps how many jobs run at once and how many may wait for a slot"""
+
+    def __init__(self, max_concurrent: int, max_waiting: int):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.waiting = 0
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.running >= self.max_concurrent and self.waiting >= self.max_waiting:
+                raise AdmissionRejected(self.running, self.waiting)
+            self.waiting += 1
+
+        self._slots.acquire()
+        with self._lock:
+            self.waiting -= 1
+            self.running += 1
+
+    def _release(self, *_: Any) -> None:
+        with self._lock:
+            self.running -= 1
+        self._slots.release()
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        """Run ``func`` once a slot is free, or raise AdmissionRejected if the queue is full"""
+        self._acquire()
+        try:
+            return func()
+        finally:
+            self._release()
+
+    def submit(self, start: Callable[[], Future]) -> Future:
+        """Like ``run`` for background work: ``start`` returns a future, and the slot is
+        held until that future finishes, even if the caller stops waiting for it"""
+        self._acquire()
+        try:
+            future = start()
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
@@ -0,0 +1,216 @@
+"""Vectorized one-pass summary of a DataFrame.
+
+Columns are grouped by dtype. Numeric columns are summarized in batched NumPy
+reductions, categorical columns with a single factorize + bincount each (falling
+back to streaming sketches for ID-like columns), and the result is returned in a compact
+columnar layout: one list per statistic, aligned with the column names.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .sketches import sketch_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Numeric columns are converted to float64 this many at a time to bound memory
+NUMERIC_BATCH_SIZE = 16
+# Quartiles are computed on a random row sample of this size for longer frames
+QUANTILE_SAMPLE_SIZE = 1_000_000
+# Categorical columns longer than this are first hashed on a sample
+CATEGORICAL_SAMPLE_SIZE = 100_000
+# A sample whose unique ratio exceeds this is treated as ID-like / free text
+HIGH_CARDINALITY_RATIO = 0.5
+# Categoricals with at most this many levels are good bar/pie axes
+LOW_CARDINALITY_MAX = 20
+PIE_MAX_LEVELS = 8
+
+
+def _clean(values: np.ndarray) -> List[Optional[float]]:
+    """NumPy floats to JSON-friendly Python floats, with NaN as None"""
+    return [None if math.isnan(v) else float(v) for v in values.tolist()]
+
+
+def _group_columns(df: pd.DataFrame) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {"numeric": [], "categorical": [], "datetime": []}
+    for name, dtype in df.dtypes.items():
+        kind = dtype.kind
+        if kind in "iuf":
+            groups["numeric"].append(name)
+        elif kind == "M":
+            groups["datetime"].append(name)
+        else:
+            groups["categorical"].append(name)
+    return groups
+
+
+def summarize_numeric(df: pd.DataFrame, columns: List[str],
+                      quantile_sample_size: int = QUANTILE_SAMPLE_SIZE) -> Dict[str, Any]:
+    """Count, missing, mean, std, min, quartiles and max for numeric columns.
+
+    Quartiles come from a shared random row sample when the frame is longer than
+    ``quantile_sample_size`` (flagged in ``quantiles_sampled``); every other
+    statistic is exact.
+    """
+    stats: Dict[str, List[Any]] = {k: [] for k in
+                                   ("count", "missing", "mean", "std", "min", "p25", "p50", "p75", "max",
+                                    "id_like")}
+    n_rows = len(df)
+    sample_rows = None
+    if n_rows > quantile_sample_size:
+        sample_rows = np.random.default_rng(0).choice(n_rows, size=quantile_sample_size, replace=False)
+
+    for start in range(0, len(columns), NUMERIC_BATCH_SIZE):
+        names = columns[start:start + NUMERIC_BATCH_SIZE]
+        # to_numpy always copies here, so the batch can be modified in place below
+        batch = df[names].to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        mask = np.isnan(batch)
+        missing = mask.sum(axis=0)
+        count = n_rows - missing
+
+        with np.errstate(all="ignore"):
+            quantile_source = batch[sample_rows] if sample_rows is not None else batch
+            quartiles = (np.nanpercentile(quantile_source, [25, 50, 75], axis=0) if n_rows
+                         else np.full((3, len(names)), np.nan))
+            # fmin/fmax skip NaN without copying the batch
+            lo = np.fmin.reduce(batch, axis=0) if n_rows else np.full(len(names), np.nan)
+            hi = np.fmax.reduce(batch, axis=0) if n_rows else np.full(len(names), np.nan)
+
+            batch[mask] = 0.0
+            mean = batch.sum(axis=0) / count
+            batch -= mean
+            batch[mask] = 0.0
+            std = np.sqrt(np.einsum("ij,ij->j", batch, batch) / (count - 1))
+
+        stats["count"].extend(count.tolist())
+        stats["missing"].extend(missing.tolist())
+        stats["mean"].extend(_clean(mean))
+        stats["std"].extend(_clean(std))
+        stats["min"].extend(_clean(lo))
+        stats["p25"].extend(_clean(quartiles[0]))
+        stats["p50"].extend(_clean(quartiles[1]))
+        stats["p75"].extend(_clean(quartiles[2]))
+        stats["max"].extend(_clean(hi))
+        # Increasing integer columns are usually row ids or sequences rather than measures
+        stats["id_like"].extend(df[name].dtype.kind in "iu" and bool(df[name].is_monotonic_increasing)
+                                for name in names)
+    return {"columns": list(columns), "quantiles_sampled": sample_rows is not None, **stats}
+
+
+def _top_counts(values: pd.Series, top_k: int):
+    """Missing count, unique count and top-k (value, count) pairs via one factorize + bincount"""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    valid = codes[codes >= 0]
+    missing = len(codes) - len(valid)
+    if len(uniques) == 0:
+        return missing, 0, []
+    counts = np.bincount(valid, minlength=len(uniques))
+    k = min(top_k, len(counts))
+    top = np.argpartition(counts, -k)[-k:]
+    top = top[np.argsort(-counts[top], kind="stable")]
+    return missing, len(uniques), [(str(uniques[i]), int(counts[i])) for i in top]
+
+
+def summarize_categorical(df: pd.DataFrame, columns: List[str], top_k: int = 5,
+                          sample_size: int = CATEGORICAL_SAMPLE_SIZE) -> Dict[str, Any]:
+    """Count, missing, unique count and top-k values for categorical columns.
+
+    Columns longer than ``sample_size`` are hashed on a sample first; when that
+    sample is mostly unique (ID-like or free text) the full column is sketched
+    instead of counted and ``n_unique``/``top_values`` are estimates flagged in
+    ``approximate``.
+    """
+    stats: Dict[str, List[Any]] = {k: [] for k in
+                                   ("count", "missing", "n_unique", "approximate", "top", "freq", "top_values")}
+    n_rows = len(df)
+    sample_rows = None
+    if n_rows > sample_size:
+        sample_rows = np.random.default_rng(0).choice(n_rows, size=sample_size, replace=False)
+
+    for name in columns:
+        series = df[name]
+        approximate = False
+        if sample_rows is not None:
+            sample = series.take(sample_rows)
+            sample_missing, n_unique, top_values = _top_counts(sample, top_k)
+            sample_count = sample_size - sample_missing
+            approximate = bool(sample_count) and n_unique / sample_count > HIGH_CARDINALITY_RATIO
+
+        if approximate:
+            # One streaming pass with bounded memory instead of a full factorize
+            sketch = sketch_columns(df, [name], top_k=top_k)[name]
+            missing, n_unique = sketch["n_missing"], sketch["n_distinct"]
+            # The sketch only keeps values known to repeat
+            top_values = [(item["value"], item["count"]) for item in sketch["top_k"]]
+        else:
+            missing, n_unique, top_values = _top_counts(series, top_k)
+
+        stats["count"].append(n_rows - missing)
+        stats["missing"].append(missing)
+        stats["n_unique"].append(n_unique)
+        stats["approximate"].append(approximate)
+        stats["top"].append(top_values[0][0] if top_values else None)
+        stats["freq"].append(top_values[0][1] if top_values else None)
+        stats["top_values"].append(top_values)
+    return {"columns": list(columns), **stats}
+
+
+def summarize_datetime(df: pd.DataFrame, columns: List[str]) -> Dict[str, Any]:
+    """Count, missing, min and max for datetime columns"""
+    stats: Dict[str, List[Any]] = {k: [] for k in ("count", "missing", "min", "max")}
+    for name in columns:
+        series = df[name]
+        missing = int(series.isna().sum())
+        stats["count"].append(len(series) - missing)
+        stats["missing"].append(missing)
+        stats["min"].append(None if missing == len(series) else series.min().isoformat())
+        stats["max"].append(None if missing == len(series) else series.max().isoformat())
+    return {"columns": list(columns), **stats}
+
+
+def summarize_frame(df: pd.DataFrame, top_k: int = 5) -> Dict[str, Any]:
+    """Columnar summary of every column, grouped by dtype"""
+    groups = _group_columns(df)
+    return {
+        "n_rows": len(df),
+        "n_columns": len(df.columns),
+        "numeric": summarize_numeric(df, groups["numeric"]),
+        "categorical": summarize_categorical(df, groups["categorical"], top_k=top_k),
+        "datetime": summarize_datetime(df, groups["datetime"]),
+    }
+
+
+def suggest_visuals(summary: Dict[str, Any], max_visuals: int = 4) -> List[Dict[str, Any]]:
+    """Chart suggestions derived from column dtypes and cardinality"""
+    numeric = summary["numeric"]
+    categorical = summary["categorical"]
+    datetimes = summary["datetime"]["columns"]
+
+    # Measures: numeric columns that are neither constant nor ID-like sequences
+    measures = [name for name, std, id_like in
+                zip(numeric["columns"], numeric["std"], numeric["id_like"]) if std and not id_like]
+    # Dimensions: low-cardinality categoricals, fewest levels first
+    dimensions = sorted(
+        (n_unique, name) for name, n_unique, approximate in
+        zip(categorical["columns"], categorical["n_unique"], categorical["approximate"])
+        if not approximate and 1 < n_unique <= LOW_CARDINALITY_MAX
+    )
+
+    visuals = []
+    if datetimes and measures:
+        visuals.append({"type": "line", "x": datetimes[0], "y": measures[0]})
+    if dimensions and measures:
+        visuals.append({"type": "bar", "x": dimensions[0][1], "y": measures[0], "agg": "sum"})
+    if dimensions and dimensions[0][0] <= PIE_MAX_LEVELS:
+        visuals.append({"type": "pie", "x": dimensions[0][1]})
+    if measures:
+        visuals.append({"type": "histogram", "x": measures[0]})
+    if len(measures) >= 2:
+        visuals.append({"type": "scatter", "x": measures[0], "y": measures[1]})
+    return visuals[:max_visuals]
@@ -0,0 +1,288 @@
+"""Datetime column detection and precomputed time rollups.
+
+Text columns are sample-parsed with an inferred strftime format, so the full
+column is converted with one vectorized ``to_datetime`` call instead of
+per-value guessing. Parsed columns can be cached on disk (keyed by file content
+and column name) so later readers skip parsing entirely, and day/week/month
+rollups of the numeric measures are computed once at profile time and stored
+next to the profile.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from .single_flight import file_content_hash
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns with at least this share of sampled values parsing as dates are treated as datetimes
+DATETIME_PARSE_RATIO = 0.9
+DATETIME_SAMPLE_SIZE = 1_000
+# Grains precomputed at profile time, finest first
+ROLLUP_GRAINS = ("day", "week", "month")
+# A grain with more periods than this is skipped; charts fall back to raw data
+MAX_ROLLUP_PERIODS = 10_000
+MAX_ROLLUP_MEASURES = 50
+MIXED_FORMAT = "mixed"
+# Parsed columns kept on disk; least recently used files are removed beyond this
+DEFAULT_TIME_INDEX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def infer_datetime_format(sample: pd.Series) -> Optional[str]:
+    """strftime format that parses at least DATETIME_PARSE_RATIO of the sample, if any"""
+    import pandas as pd
+    from pandas.tseries.api import guess_datetime_format
+
+    values = sample.dropna().astype(str)
+    # Bare numbers ("2021", "20240103") are far more often ids or amounts than dates
+    if values.empty or values.str.fullmatch(r"[+-]?\d+(\.\d+)?").mean() > 0.5:
+        return None
+
+    # Guess from values spread over the sample, both month- and day-first, and keep
+    # the format that parses the most values ("01/02/2024" alone is ambiguous)
+    spread = values.iloc[::max(1, len(values) // 20)]
+    with warnings.catch_warnings():
+        # guess_datetime_format warns when the day-first reading wins, which is expected here
+        warnings.simplefilter("ignore", UserWarning)
+        # Month-first guesses come first so they win ties
+        guesses = dict.fromkeys(guess_datetime_format(v, dayfirst=dayfirst)
+                                for dayfirst in (False, True) for v in spread)
+    best, best_ratio = None, 0.0
+    for fmt in (g for g in guesses if g):
+        ratio = pd.to_datetime(values, format=fmt, errors="coerce").notna().mean()
+        if ratio > best_ratio:
+            best, best_ratio = fmt, ratio
+    if best_ratio >= DATETIME_PARSE_RATIO:
+        return best
+
+    # Inconsistent formats: per-value parsing, only worth it if the sample agrees
+    parsed = pd.to_datetime(values, format=MIXED_FORMAT, errors="coerce")
+    return MIXED_FORMAT if parsed.notna().mean() >= DATETIME_PARSE_RATIO else None
+
+
+def detect_datetime_columns(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+    """Map datetime-like columns to their inferred format (None for columns already datetime64)"""
+    detected: Dict[str, Optional[str]] = {}
+    for name in columns if columns is not None else df.columns:
+        kind = df[name].dtype.kind
+        if kind == "M":
+            detected[name] = None
+        elif kind == "O" or str(df[name].dtype) == "string":
+            values = df[name].dropna()
+            # Evenly spaced rather than the first rows, which often share one day
+            fmt = infer_datetime_format(values.iloc[::max(1, len(values) // DATETIME_SAMPLE_SIZE)])
+            if fmt:
+                detected[name] = fmt
+    return detected
+
+
+def to_datetime(values: pd.Series, fmt: Optional[str]) -> pd.Series:
+    """Parse with a known format; timezone-aware results are normalized to naive UTC"""
+    import numpy as np
+    import pandas as pd
+
+    # Dates repeat a lot (one per day across many rows): parse each distinct string once
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # utc=True keeps mixed offsets in one datetime64 column; naive values are left as they are
+    parsed = pd.to_datetime(pd.Series(uniques), format=fmt, errors="coerce", utc=True).dt.tz_convert(None)
+    taken = np.where(codes >= 0, parsed.to_numpy()[np.maximum(codes, 0)], np.datetime64("NaT"))
+    return pd.Series(taken.astype("datetime64[ns]"), index=values.index, name=values.name)
+
+
+class TimeIndexCache:
+    """Parsed datetime64 columns stored as .npy files, keyed by source content hash and column.
+
+    Total size is bounded by ``max_bytes``; reads refresh a file's mtime, so the
+    least recently used columns (e.g. of deleted or replaced uploads) go first.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_TIME_INDEX_CACHE_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._hashes: Dict[str, str] = {}
+
+    def _path(self, source: str, column: str) -> Path:
+        if source not in self._hashes:
+            self._hashes[source] = file_content_hash(source)
+        column_key = hashlib.sha256(column.encode()).hexdigest()[:12]
+        return self.cache_dir / f"{self._hashes[source][:16]}_{column_key}.npy"
+
+    def get(self, source: str, column: str) -> Optional[np.ndarray]:
+        import numpy as np
+
+        path = self._path(source, column)
+        try:
+            values = np.load(path)
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return values
+
+    def put(self, source: str, column: str, values: pd.Series) -> None:
+        import numpy as np
+
+        path = self._path(source, column)
+        tmp = path.with_suffix(".tmp.npy")
+        np.save(tmp, values.to_numpy(dtype="datetime64[ns]"))
+        tmp.replace(path)
+        self.prune()
+
+    def prune(self) -> int:
+        """Remove least recently used files until the cache fits ``max_bytes``; returns how many"""
+        files = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+def parse_datetime_columns(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                           cache: Optional[TimeIndexCache] = None,
+                           source: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Convert datetime-like text columns to datetime64 in place; returns the detected formats.
+
+    With a ``cache`` and the ``source`` file the frame was read from, columns
+    parsed before are loaded from the cache instead of being re-parsed.
+    """
+    import pandas as pd
+
+    candidates = [name for name in (columns if columns is not None else df.columns)
+                  if df[name].dtype.kind != "M"]
+    detected = {}
+    for name in candidates:
+        cached = cache.get(source, name) if cache and source else None
+        if cached is not None and len(cached) == len(df):
+            df[name] = pd.Series(cached, index=df.index)
+            detected[name] = "cached"
+            continue
+        fmt = detect_datetime_columns(df, [name]).get(name)
+        if fmt is None:
+            continue
+        df[name] = to_datetime(df[name], fmt)
+        detected[name] = fmt
+        if cache and source:
+            cache.put(source, name, df[name])
+    return detected
+
+
+def choose_time_index(df: pd.DataFrame) -> Optional[str]:
+    """The datetime column best suited as the time axis: most non-null, then most distinct values"""
+    datetimes = [name for name, dtype in df.dtypes.items() if dtype.kind == "M"]
+    if not datetimes:
+        return None
+    return max(datetimes, key=lambda name: (df[name].notna().sum(), df[name].nunique()))
+
+
+def _frequency_label(index: pd.Series) -> Optional[str]:
+    """Human label for the typical spacing between distinct timestamps"""
+    import pandas as pd
+
+    distinct = pd.Series(index.dropna().unique()).sort_values()
+    if len(distinct) < 2:
+        return None
+    step = distinct.diff().median()
+    for limit, label in ((pd.Timedelta(seconds=1), "sub-second"), (pd.Timedelta(minutes=1), "secondly"),
+                         (pd.Timedelta(hours=1), "minutely"), (pd.Timedelta(days=1), "hourly"),
+                         (pd.Timedelta(days=7), "daily"), (pd.Timedelta(days=28), "weekly"),
+                         (pd.Timedelta(days=90), "monthly"), (pd.Timedelta(days=365), "quarterly")):
+        if step < limit:
+            return label
+    return "yearly"
+
+
+def describe_time_index(df: pd.DataFrame, column: str) -> str:
+    """One-line time_index_analysis for the profile"""
+    series = df[column]
+    frequency = _frequency_label(series)
+    parts = [f"{column}: {series.min().isoformat()} to {series.max().isoformat()}",
+             f"{series.nunique():,} distinct timestamps"]
+    if frequency:
+        parts.append(f"{frequency} frequency")
+    if not series.dropna().is_monotonic_increasing:
+        parts.append("not sorted")
+    return ", ".join(parts)
+
+
+def compute_rollups(df: pd.DataFrame, time_column: str, measures: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Sum, mean and row count of numeric measures per day, week and month.
+
+    Only non-empty periods are stored. Each grain is laid out columnar:
+    ``{"period": [...], "count": [...], "sum": {measure: [...]}, "mean": {...}}``.
+    """
+    import numpy as np
+
+    if measures is None:
+        # Increasing integer columns are row ids or sequences, not measures
+        measures = [name for name, dtype in df.dtypes.items()
+                    if dtype.kind in "iuf" and name != time_column
+                    and not (dtype.kind in "iu" and df[name].is_monotonic_increasing)][:MAX_ROLLUP_MEASURES]
+    timestamps = df[time_column]
+    valid = timestamps.notna().to_numpy()
+    values = df.loc[valid, measures]
+    days = timestamps.to_numpy()[valid].astype("datetime64[D]")
+    # NumPy truncation instead of Period objects; 1970-01-01 was a Thursday, so weeks start on Monday
+    period_starts = {
+        "day": days,
+        "week": days - ((days.astype(np.int64) + 3) % 7).astype("timedelta64[D]"),
+        "month": days.astype("datetime64[M]"),
+    }
+
+    clean = lambda array: [None if np.isnan(v) else float(v) for v in array]
+    rollups: Dict[str, Any] = {}
+    for grain in ROLLUP_GRAINS:
+        grouped = values.groupby(period_starts[grain], sort=True)
+        sums = grouped.sum(min_count=1)
+        if len(sums) > MAX_ROLLUP_PERIODS:
+            logger.debug(f"Skipping {grain} rollup: {len(sums)} periods")
+            continue
+        means = grouped.mean()
+        rollups[grain] = {
+            "period": np.datetime_as_string(sums.index.to_numpy().astype("datetime64[s]")).tolist(),
+            "count": grouped.size().astype(int).tolist(),
+            "sum": {m: clean(sums[m].to_numpy(dtype=np.float64, na_value=np.nan)) for m in measures},
+            "mean": {m: clean(means[m].to_numpy(dtype=np.float64, na_value=np.nan)) for m in measures},
+        }
+    return {"time_column": time_column, "measures": measures, "grains": rollups}
+
+
+def rollups_path_for(profile_path: str) -> Path:
+    """Where the rollups for a profile are stored"""
+    path = Path(profile_path)
+    return path.with_name(f"{path.stem}_rollups.json")
+
+
+def write_rollups(profile_path: str, rollups: Dict[str, Any]) -> Path:
+    path = rollups_path_for(profile_path)
+    with open(path, "w") as f:
+        json.dump(rollups, f)
+    return path
+
+
+def load_rollups(profile_path: str) -> Optional[Dict[str, Any]]:
+    path = rollups_path_for(profile_path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
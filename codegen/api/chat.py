@@ -1,9 +1,15 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
 import logging
-from ..main import process_message, process_file
+import sys
+import threading
+import uuid
+from .. import metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,11 +33,90 @@ class MessageResponse(BaseModel):
     message: str
     code: Optional[str] = None
 
+class ChartDataRequest(BaseModel):
+    file_path: str
+    spec: Dict
+    profile_path: Optional[str] = None
+
+class QueryRequest(BaseModel):
+    file_path: str
+    query: Dict
+
+class DashboardRequest(BaseModel):
+    file_path: str
+    profile_path: str
+    requirements: str = ""
+
+class TransformationRequest(BaseModel):
+    description: str
+    version: Optional[str] = None
+
+class DbtPipelineRequest(BaseModel):
+    steps: Optional[List[str]] = None
+    select: Optional[str] = None
+    concurrency: int = 1
+    state: Optional[str] = None
+
+_dashboard_cache = None
+_context_manager = None
+# Completion callable for dashboards the rule engine isn't confident about; False when unavailable
+_dashboard_llm = None
+# Event streams of recent dbt pipeline runs, by run id
+_dbt_runs: "OrderedDict[str, object]" = OrderedDict()
+MAX_DBT_RUNS = 20
+
+def _ensure_app_importable() -> None:
+    # The app modules import each other as ``app.*`` with codegen/ on the path
+    codegen_dir = str(Path(__file__).resolve().parents[1])
+    if codegen_dir not in sys.path:
+        sys.path.insert(0, codegen_dir)
+
+def _ensure_project_importable() -> None:
+    # The dbt orchestration modules live at the repository root
+    project_dir = str(Path(__file__).resolve().parents[2])
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+
+def _get_context_manager():
+    global _context_manager
+    if _context_manager is None:
+        _ensure_app_importable()
+        from app.context_manager import ContextManager
+
+        _context_manager = ContextManager()
+    return _context_manager
+
+def _get_dashboard_cache():
+    """Process-wide dashboard cache, invalidated by the session's transformations"""
+    global _dashboard_cache
+    if _dashboard_cache is None:
+        _ensure_app_importable()
+        from app.dashboard_cache import DashboardCache
+
+        _dashboard_cache = DashboardCache()
+        _dashboard_cache.attach(_get_context_manager())
+    return _dashboard_cache
+
+def _get_dashboard_llm():
+    """The insight agent's LLM client, or None (rule engine only) without an API key"""
+    global _dashboard_llm
+    if _dashboard_llm is None:
+        from ..agents.insight_gen_agent import InsightGenAgent
+
+        try:
+            _dashboard_llm = InsightGenAgent().complete
+        except ValueError as e:
+            logger.warning(f"Dashboards will use the rule engine only: {str(e)}")
+            _dashboard_llm = False
+    return _dashboard_llm or None
+
 @app.post("/chat/message", response_model=MessageResponse)
 async def handle_message(request: MessageRequest):
     """Handle incoming chat messages"""
     try:
-        # Process message using main module
+        # Process message using main module (imported lazily to keep app start-up cheap)
+        from ..main import process_message
+
         result = process_message(request.message)
         return MessageResponse(**result)
         
@@ -44,6 +129,8 @@ async def handle_file_upload(file_path: str):
     """Handle file uploads"""
     try:
         # Process file using main module
+        from ..main import process_file
+
         result = process_file(file_path)
         return {"success": True, "data": result}
         
@@ -52,3 +139,140 @@ async def handle_file_upload(file_path: str):
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def handle_metrics():
+    """Expose pipeline metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type=metrics.CONTENT_TYPE)
+
+@app.post("/chart-data")
+async def handle_chart_data(request: ChartDataRequest):
+    """Return bounded, ECharts-ready series for a chart spec"""
+    try:
+        _ensure_app_importable()
+        from app.chart_data import ChartSpec, chart_data_for_file
+
+        spec = ChartSpec(**request.spec)
+        return chart_data_for_file(request.file_path, spec, profile_path=request.profile_path)
+
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error building chart data: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/query")
+async def handle_query(request: QueryRequest):
+    """Answer a dashboard filter/aggregation query from the embedded query engine"""
+    try:
+        _ensure_app_importable()
+        from app.query_engine import Query, QueryError, get_engine
+
+        return get_engine().query_file(request.file_path, Query(**request.query))
+
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except (QueryError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error running query: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/dashboard")
+async def handle_dashboard(request: DashboardRequest):
+    """Generate a dashboard (chart configs plus their data), served from the cache when possible"""
+    try:
+        import json
+
+        cache = _get_dashboard_cache()
+        from app.chart_data import ChartSpec, chart_data_for_file
+        from app.compact_profile import CompactProfile
+        from app.summary_agent_prompt_template import generate_dashboard_config
+
+        with open(request.profile_path) as f:
+            # Column-wise, so wide profiles don't become a validated model per column
+            profile = CompactProfile.from_dict(json.load(f))
+
+        def build():
+            config = generate_dashboard_config(profile, request.requirements, llm=_get_dashboard_llm())
+            chart_data = {
+                chart["id"]: chart_data_for_file(request.file_path, ChartSpec(**chart["spec"]),
+                                                 profile_path=request.profile_path)
+                for chart in config.get("charts", []) if chart.get("spec")
+            }
+            return config, chart_data
+
+        artifact, cached = cache.get_or_build(profile, request.requirements, build)
+        return {"cached": cached, **artifact.to_dict()}
+
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except Exception as e:
+        logger.error(f"Error generating dashboard: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/dashboard/{key}")
+async def handle_dashboard_preview(key: str):
+    """Preview/export a previously generated dashboard straight from the cache"""
+    artifact = _get_dashboard_cache().get(key)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Dashboard not found; generate it again")
+    return artifact.to_dict()
+
+@app.post("/transformations")
+async def handle_transformation(request: TransformationRequest):
+    """Record a transformation of the current dataset; its cached dashboards are dropped"""
+    try:
+        _get_dashboard_cache()
+        transformation = _get_context_manager().add_transformation(request.description, request.version)
+        return transformation.dict()
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _run_dbt_pipeline(request: DbtPipelineRequest, events) -> None:
+    """Run a pipeline on a background thread, publishing its progress to ``events``"""
+    try:
+        from orchestrate_dbt import DbtOrchestrator
+
+        orchestrator = DbtOrchestrator(project_dir=str(Path(__file__).resolve().parents[2]), events=events)
+        results = orchestrator.run_pipeline(steps=request.steps, select=request.select,
+                                            concurrency=request.concurrency, state=request.state)
+        events.publish({"type": "pipeline_finished", "success": all(r.success for r in results.values()),
+                        "steps": {step: r.success for step, r in results.items()}})
+    except Exception as e:
+        logger.error(f"Error running dbt pipeline: {str(e)}")
+        events.publish({"type": "pipeline_finished", "success": False, "error": str(e)})
+    finally:
+        events.close()
+
+@app.post("/dbt/pipeline")
+async def handle_dbt_pipeline(request: DbtPipelineRequest):
+    """Start a dbt pipeline; follow it at /dbt/runs/{run_id}/events"""
+    _ensure_project_importable()
+    from dbt_log_stream import EventStream
+
+    run_id = uuid.uuid4().hex
+    events = EventStream()
+    _dbt_runs[run_id] = events
+    while len(_dbt_runs) > MAX_DBT_RUNS:
+        _dbt_runs.popitem(last=False)
+    threading.Thread(target=_run_dbt_pipeline, args=(request, events), daemon=True).start()
+    return {"run_id": run_id}
+
+@app.get("/dbt/runs/{run_id}/events")
+async def handle_dbt_events(run_id: str, after: int = -1):
+    """Server-sent progress events (command and node started/finished) for a pipeline run"""
+    events = _dbt_runs.get(run_id)
+    if events is None:
+        raise HTTPException(status_code=404, detail="Unknown dbt run")
+    from dbt_log_stream import sse_format
+
+    def stream():
+        for item in events.follow(after):
+            # Comment lines keep idle connections open through proxies
+            yield ": keep-alive\n\n" if item is None else sse_format(*item)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
@@ -0,0 +1,329 @@
+"""Server-side chart data for ECharts dashboards.
+
+Takes a chart spec (type, x, y, optional group) and returns ECharts-ready axes
+and series whose size is bounded regardless of dataset size:
+
+- line: aggregated per x value, then downsampled with LTTB to ``max_points``
+- histogram: binned server-side into ``bins`` buckets
+- bar / pie: aggregated per category, top ``top_n`` plus an "Other" bucket
+- scatter: uniformly sampled to ``max_points``
+"""
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field, model_validator
+
+from codegen.agents.time_index import ROLLUP_GRAINS, TimeIndexCache, load_rollups, parse_datetime_columns
+
+OTHER_LABEL = "Other"
+
+
+class ChartSpec(BaseModel):
+    type: Literal["line", "bar", "pie", "histogram", "scatter"]
+    x: str
+    y: Optional[str] = None
+    group: Optional[str] = None
+    agg: Literal["sum", "mean", "count", "min", "max"] = "sum"
+    max_points: int = Field(default=1000, ge=3, le=20_000)
+    top_n: int = Field(default=10, ge=1, le=100)
+    bins: int = Field(default=30, ge=1, le=500)
+
+    @model_validator(mode="after")
+    def _check_group(self) -> "ChartSpec":
+        if self.group and self.group in (self.x, self.y):
+            raise ValueError("group must differ from x and y")
+        return self
+
+    def columns(self) -> List[str]:
+        return [c for c in dict.fromkeys([self.x, self.y, self.group]) if c]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling; returns the indices to keep.
+
+    ``x`` must be sorted ascending. The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    # Bucket boundaries over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (the last bucket's "next" is the final point)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        ax, ay = x[selected], y[selected]
+        bx, by = x[start:end], y[start:end]
+        areas = np.abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+        selected = start + int(np.argmax(areas))
+        keep[i + 1] = selected
+    return keep
+
+
+def _is_datetime(series: pd.Series) -> bool:
+    return series.dtype.kind == "M"
+
+
+def _finite(value: Any) -> Optional[float]:
+    """``value`` as a float, or None for NaN/inf, which aren't valid JSON"""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _axis_type(values: pd.Series) -> str:
+    return "time" if _is_datetime(values) else "value"
+
+
+def _axis_value(values: pd.Series) -> List[Any]:
+    if _is_datetime(values):
+        return [v.isoformat() for v in values]
+    return values.tolist()
+
+
+def _aggregate(df: pd.DataFrame, keys: List[str], spec: ChartSpec) -> pd.DataFrame:
+    """Aggregate ``spec.y`` by ``keys`` into a ``value`` column (plus sum/count for "Other")"""
+    grouped = df.groupby(keys, observed=True, sort=False)
+    if spec.y is None or spec.agg == "count":
+        out = grouped.size().to_frame("value")
+        out["sum"], out["count"] = out["value"], out["value"]
+        return out.reset_index()
+    # Only compute what the value and the "Other" bucket need
+    funcs = ["sum", "count"] if spec.agg == "mean" else [spec.agg]
+    out = grouped[spec.y].agg(funcs)
+    out["value"] = out["sum"] / out["count"] if spec.agg == "mean" else out[spec.agg]
+    return out.reset_index()
+
+
+def _other_value(rest: pd.DataFrame, agg: str) -> Optional[float]:
+    """Value of the "Other" bucket, or None when it has nothing to aggregate"""
+    if agg in ("sum", "count"):
+        return _finite(rest["value"].sum())
+    if agg == "mean":
+        count = rest["count"].sum()
+        return _finite(rest["sum"].sum() / count) if count else None
+    return _finite(rest["value"].min() if agg == "min" else rest["value"].max())
+
+
+def _top_n_with_other(agg_df: pd.DataFrame, key: str, spec: ChartSpec) -> pd.DataFrame:
+    """Keep the ``top_n`` categories by value and fold the rest into "Other" """
+    # mean/min/max of an all-missing y is NaN, which isn't valid JSON
+    agg_df = agg_df[np.isfinite(agg_df["value"].astype(np.float64))].sort_values("value", ascending=False)
+    if len(agg_df) <= spec.top_n:
+        return agg_df[[key, "value"]]
+    head, rest = agg_df.iloc[:spec.top_n], agg_df.iloc[spec.top_n:]
+    other_value = _other_value(rest, spec.agg)
+    if other_value is None:
+        return head[[key, "value"]]
+    other = pd.DataFrame({key: [OTHER_LABEL], "value": [other_value]})
+    return pd.concat([head[[key, "value"]].astype({key: object}), other], ignore_index=True)
+
+
+def _fold(series: pd.Series, keep: List[Any]) -> pd.Series:
+    """Categorical of ``series`` with every value outside ``keep`` folded into "Other".
+
+    Works on factorized codes, so the column is never converted to Python objects.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapping = np.full(len(uniques), len(keep), dtype=np.int64)
+    positions = pd.Index(uniques).get_indexer(keep)
+    mapping[positions[positions >= 0]] = np.flatnonzero(positions >= 0)
+    folded = np.where(codes >= 0, mapping[codes], -1)
+    categories = [str(v) for v in keep]
+    if (folded == len(keep)).any():
+        categories.append(OTHER_LABEL)
+    return pd.Series(pd.Categorical.from_codes(folded, categories=categories), index=series.index)
+
+
+def _top_groups(df: pd.DataFrame, spec: ChartSpec) -> pd.Series:
+    """Restrict ``spec.group`` to its ``top_n`` most frequent values, the rest become "Other" """
+    return _fold(df[spec.group], df[spec.group].value_counts().index[:spec.top_n].tolist())
+
+
+def line_chart(df: pd.DataFrame, spec: ChartSpec) -> Dict[str, Any]:
+    df = df.dropna(subset=[spec.x])
+    # Text that didn't parse as dates is plotted as ordered categories
+    categorical_x = not _is_datetime(df[spec.x]) and not pd.api.types.is_numeric_dtype(df[spec.x])
+    if categorical_x:
+        df = df.assign(**{spec.x: df[spec.x].astype(str)})
+    if spec.group:
+        df = df.assign(**{spec.group: _top_groups(df, spec)})
+        agg_df = _aggregate(df, [spec.x, spec.group], spec).sort_values(spec.x)
+    elif spec.y and df[spec.x].is_monotonic_increasing and df[spec.x].is_unique:
+        # Already one row per x in order; nothing to aggregate
+        agg_df = df.assign(value=df[spec.y])
+    else:
+        agg_df = _aggregate(df, [spec.x], spec).sort_values(spec.x)
+    # Missing y (or all-missing groups) would be NaN, which isn't valid JSON
+    agg_df = agg_df[agg_df["value"].notna()]
+
+    series = []
+    groups = agg_df.groupby(spec.group, observed=True, sort=False) if spec.group else [(spec.y or "count", agg_df)]
+    per_series = max(3, spec.max_points // max(1, agg_df[spec.group].nunique() if spec.group else 1))
+    for name, part in groups:
+        x_values = part[spec.x]
+        if categorical_x:
+            x_numeric = np.arange(len(part))
+        else:
+            x_numeric = (x_values.astype("int64") if _is_datetime(x_values) else x_values).to_numpy()
+        keep = lttb(x_numeric, part["value"].to_numpy(), per_series)
+        part = part.iloc[keep]
+        series.append({
+            "name": str(name),
+            "type": "line",
+            "showSymbol": False,
+            "data": [list(p) for p in zip(_axis_value(part[spec.x]), part["value"].tolist())],
+        })
+
+    x_type = "category" if categorical_x else "time" if _is_datetime(agg_df[spec.x]) else "value"
+    return {"xAxis": {"type": x_type}, "yAxis": {"type": "value"}, "series": series}
+
+
+def histogram_chart(df: pd.DataFrame, spec: ChartSpec) -> Dict[str, Any]:
+    values = pd.to_numeric(df[spec.x], errors="coerce")
+    valid = values.notna().to_numpy()
+    data = values.to_numpy()[valid]
+    if len(data) == 0:
+        return {"xAxis": {"type": "category", "data": []}, "yAxis": {"type": "value"}, "series": []}
+
+    edges = np.histogram_bin_edges(data, bins=spec.bins)
+    labels = [f"{lo:.4g} - {hi:.4g}" for lo, hi in zip(edges[:-1], edges[1:])]
+
+    if spec.group:
+        groups = _top_groups(df, spec).cat
+        codes = groups.codes.to_numpy()[valid]
+        series = [
+            {"name": name, "type": "bar", "stack": "total",
+             "data": np.histogram(data[codes == code], bins=edges)[0].tolist()}
+            for code, name in enumerate(groups.categories)
+        ]
+    else:
+        series = [{"name": spec.x, "type": "bar", "barWidth": "99%",
+                   "data": np.histogram(data, bins=edges)[0].tolist()}]
+    return {"xAxis": {"type": "category", "data": labels}, "yAxis": {"type": "value"}, "series": series}
+
+
+def bar_chart(df: pd.DataFrame, spec: ChartSpec) -> Dict[str, Any]:
+    if not spec.group:
+        top = _top_n_with_other(_aggregate(df, [spec.x], spec), spec.x, spec)
+        return {
+            "xAxis": {"type": "category", "data": [str(v) for v in top[spec.x]]},
+            "yAxis": {"type": "value"},
+            "series": [{"name": spec.y or "count", "type": "bar", "data": top["value"].tolist()}],
+        }
+
+    # Pick the top categories on the overall total, then fold the rest per group
+    totals = _aggregate(df, [spec.x], spec).nlargest(spec.top_n, "value")
+    df = df.assign(**{spec.x: _fold(df[spec.x], totals[spec.x].tolist()), spec.group: _top_groups(df, spec)})
+    categories = df[spec.x].cat.categories.tolist()
+    grouped = _aggregate(df, [spec.x, spec.group], spec)
+    pivot = grouped.pivot(index=spec.x, columns=spec.group, values="value").reindex(categories)
+    series = [
+        {"name": str(name), "type": "bar", "stack": "total",
+         "data": [_finite(v) for v in pivot[name]]}
+        for name in pivot.columns
+    ]
+    return {"xAxis": {"type": "category", "data": categories}, "yAxis": {"type": "value"}, "series": series}
+
+
+def pie_chart(df: pd.DataFrame, spec: ChartSpec) -> Dict[str, Any]:
+    top = _top_n_with_other(_aggregate(df, [spec.x], spec), spec.x, spec)
+    return {"series": [{
+        "name": spec.y or spec.x,
+        "type": "pie",
+        "radius": "60%",
+        "data": [{"name": str(n), "value": float(v)} for n, v in zip(top[spec.x], top["value"])],
+    }]}
+
+
+def scatter_chart(df: pd.DataFrame, spec: ChartSpec) -> Dict[str, Any]:
+    if not spec.y:
+        raise ValueError("Scatter charts need both x and y")
+    points = df.dropna(subset=[spec.x, spec.y])
+    for column in (spec.x, spec.y):
+        if pd.api.types.is_float_dtype(points[column]):
+            points = points[np.isfinite(points[column])]
+    if len(points) > spec.max_points:
+        points = points.sample(n=spec.max_points, random_state=0)
+    return {
+        "xAxis": {"type": _axis_type(points[spec.x])},
+        "yAxis": {"type": _axis_type(points[spec.y])},
+        "series": [{"name": f"{spec.x} vs {spec.y}", "type": "scatter", "symbolSize": 4,
+                    "data": [list(p) for p in zip(_axis_value(points[spec.x]), _axis_value(points[spec.y]))]}],
+    }
+
+
+_BUILDERS = {
+    "line": line_chart,
+    "histogram": histogram_chart,
+    "bar": bar_chart,
+    "pie": pie_chart,
+    "scatter": scatter_chart,
+}
+
+
+def build_chart_data(df: pd.DataFrame, spec: ChartSpec) -> Dict[str, Any]:
+    """Build bounded ECharts axes/series for a chart spec"""
+    missing = [c for c in spec.columns() if c not in df.columns]
+    if missing:
+        raise ValueError(f"Unknown columns: {missing}")
+    return _BUILDERS[spec.type](df, spec)
+
+
+def rollup_line_chart(rollups: Dict[str, Any], spec: ChartSpec) -> Optional[Dict[str, Any]]:
+    """Line chart from the precomputed time rollups, or None if they can't answer the spec.
+
+    Uses the finest grain (day, week, month) that fits in ``max_points``.
+    """
+    if (spec.type != "line" or spec.group or spec.x != rollups["time_column"]
+            or spec.agg not in ("sum", "mean", "count")
+            or (spec.agg != "count" and spec.y not in rollups["measures"])):
+        return None
+    for grain in ROLLUP_GRAINS:
+        table = rollups["grains"].get(grain)
+        if table is None or len(table["period"]) > spec.max_points:
+            continue
+        values = table["count"] if spec.agg == "count" or spec.y is None else table[spec.agg][spec.y]
+        return {
+            "xAxis": {"type": "time"},
+            "yAxis": {"type": "value"},
+            "series": [{"name": spec.y or "count", "type": "line", "showSymbol": False,
+                        "data": [list(p) for p in zip(table["period"], values)]}],
+        }
+    return None
+
+
+def load_chart_frame(file_path: str, spec: ChartSpec, cache: Optional[TimeIndexCache] = None) -> pd.DataFrame:
+    """Read only the columns a chart needs, parsing the x axis as dates for line charts"""
+    if file_path.endswith(('.xls', '.xlsx')):
+        df = pd.read_excel(file_path, usecols=spec.columns())
+    else:
+        df = pd.read_csv(file_path, usecols=spec.columns())
+    if spec.type == "line":
+        parse_datetime_columns(df, columns=[spec.x], cache=cache, source=file_path)
+    return df
+
+
+def chart_data_for_file(file_path: str, spec: ChartSpec, profile_path: Optional[str] = None,
+                        cache: Optional[TimeIndexCache] = None) -> Dict[str, Any]:
+    """Chart data for an uploaded dataset file.
+
+    With the dataset's ``profile_path``, time-trend charts are served from the
+    rollups stored next to the profile without reading the file.
+    """
+    if profile_path and spec.type == "line":
+        rollups = load_rollups(profile_path)
+        option = rollup_line_chart(rollups, spec) if rollups else None
+        if option is not None:
+            return option
+    return build_chart_data(load_chart_frame(file_path, spec, cache), spec)
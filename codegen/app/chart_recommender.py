@@ -0,0 +1,205 @@
+"""Rule-based dashboard recommender: the fast path that skips the LLM.
+
+Candidate charts are scored from the profile's variable types and cardinality
+(plus the time index and correlations sections when present), and the four best
+complementary ones are turned into ECharts configs. Each config carries the
+chart-data ``spec`` the frontend sends to ``/chart-data`` to fetch its series.
+
+The result includes a confidence score; callers fall back to the LLM when it is
+low or when the user's requirements ask for something the rules cannot express.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.compact_profile import CompactProfile
+from app.models import DatasetProfile
+
+DASHBOARD_SIZE = 4
+# Categoricals with at most this many levels make readable bar/pie axes
+MAX_BAR_LEVELS = 20
+MAX_PIE_LEVELS = 8
+# Each extra chart of an already-picked type is scored down by this much
+REPEAT_TYPE_PENALTY = 0.2
+# Requirements mentioning any of these (as whole words) need reasoning the rules don't do
+LLM_KEYWORDS = (
+    r"forecast\w*", r"predict\w*", "why", r"explain\w*", r"anomal\w*", "outliers?", "cohorts?", "funnels?",
+    "retention", "maps?", "geo", "compare .* (to|with|against)", "versus", "vs",
+    "growth rate", "percent change", "year over year", "yoy", "heatmaps?", "sankey",
+)
+# Name parts that, on an all-distinct whole-number or text column, mark an identifier
+ID_TOKENS = {"id", "uuid", "guid", "key", "code", "no", "num", "number", "ref"}
+# Confidence is capped here when the requirements need the LLM
+LLM_REQUIRED_CONFIDENCE = 0.3
+
+TIME_TYPES = ("DateTime",)
+NUMERIC_TYPES = ("Numeric",)
+CATEGORICAL_TYPES = ("Categorical", "Boolean", "Text")
+
+
+def _is_whole_or_text(variable) -> bool:
+    if variable.type in CATEGORICAL_TYPES:
+        return True
+    bounds = [variable.min, variable.max]
+    # Without bounds the values can't be checked, so only the name decides
+    return all(v is None or (isinstance(v, (int, float)) and float(v).is_integer()) for v in bounds)
+
+
+def _looks_like_id(name: str, variable) -> bool:
+    lowered = name.lower()
+    if lowered == "id" or lowered.endswith(("_id", " id", "uuid")):
+        return True
+    # Continuous measures (price, revenue) are usually all-distinct too, so uniqueness alone isn't enough
+    tokens = set(re.split(r"[\W_]+", lowered))
+    return bool(variable.is_unique and tokens & ID_TOKENS and _is_whole_or_text(variable))
+
+
+def classify_variables(profile: DatasetProfile) -> Dict[str, List[Tuple[str, int]]]:
+    """Split variables into time, measure and dimension roles; returns (name, n_distinct) pairs"""
+    roles: Dict[str, List[Tuple[str, int]]] = {"time": [], "measure": [], "dimension": []}
+    time_index = (profile.time_index_analysis or "").split(":", 1)[0]
+    for name, variable in profile.variables.items():
+        if variable.type in TIME_TYPES:
+            roles["time"].append((name, variable.n_distinct))
+        elif variable.type in NUMERIC_TYPES:
+            if not _looks_like_id(name, variable):
+                roles["measure"].append((name, variable.n_distinct))
+        elif variable.type in CATEGORICAL_TYPES:
+            if 1 < variable.n_distinct <= MAX_BAR_LEVELS and not _looks_like_id(name, variable):
+                roles["dimension"].append((name, variable.n_distinct))
+    # The profiled time index first, then the most granular datetime column
+    roles["time"].sort(key=lambda item: (item[0] != time_index, -item[1]))
+    # Fewest levels first: they read best as bars and slices
+    roles["dimension"].sort(key=lambda item: item[1])
+    return roles
+
+
+def _strongest_pair(profile: DatasetProfile, measures: List[str]) -> Optional[Tuple[str, str, float]]:
+    if not profile.correlations or not profile.correlations.pearson:
+        return None
+    for pair in profile.correlations.pearson.top_pairs:
+        if pair.a in measures and pair.b in measures:
+            return pair.a, pair.b, abs(pair.value)
+    return None
+
+
+def candidate_charts(profile: DatasetProfile) -> List[Dict[str, Any]]:
+    """Every chart the rules can justify, with a 0-1 score"""
+    roles = classify_variables(profile)
+    times = [name for name, _ in roles["time"]]
+    measures = [name for name, _ in roles["measure"]]
+    dimensions = roles["dimension"]
+
+    candidates = []
+    if times:
+        for rank, measure in enumerate(measures[:3]):
+            candidates.append({"type": "line", "x": times[0], "y": measure, "agg": "sum",
+                               "score": 0.95 - 0.05 * rank})
+        candidates.append({"type": "line", "x": times[0], "agg": "count", "score": 0.6})
+    for rank, (dimension, levels) in enumerate(dimensions[:3]):
+        for m_rank, measure in enumerate(measures[:2]):
+            candidates.append({"type": "bar", "x": dimension, "y": measure, "agg": "sum",
+                               "score": 0.9 - 0.01 * levels - 0.05 * (rank + m_rank)})
+        candidates.append({"type": "bar", "x": dimension, "agg": "count", "score": 0.55 - 0.05 * rank})
+        if levels <= MAX_PIE_LEVELS:
+            candidates.append({"type": "pie", "x": dimension, "agg": "count",
+                               "score": (0.8 if levels <= 6 else 0.65) - 0.05 * rank})
+    for rank, measure in enumerate(measures[:3]):
+        candidates.append({"type": "histogram", "x": measure, "score": 0.75 - 0.05 * rank})
+    if len(measures) >= 2:
+        pair = _strongest_pair(profile, measures)
+        x, y, strength = pair if pair else (measures[0], measures[1], 0.0)
+        candidates.append({"type": "scatter", "x": x, "y": y, "score": 0.5 + 0.4 * strength})
+    return candidates
+
+
+def _mentioned_columns(profile: DatasetProfile, requirements: str) -> List[str]:
+    text = requirements.lower()
+    return [name for name in profile.variables
+            if name.lower() in text or name.lower().replace("_", " ") in text]
+
+
+def requirements_need_llm(requirements: str) -> bool:
+    """True when the requirements ask for analysis the rule engine can't express"""
+    text = requirements.lower()
+    return any(re.search(rf"\b(?:{keyword})\b", text) for keyword in LLM_KEYWORDS)
+
+
+def select_charts(candidates: List[Dict[str, Any]], mentioned: List[str],
+                  size: int = DASHBOARD_SIZE) -> List[Dict[str, Any]]:
+    """Greedy pick of complementary charts: repeated chart types and columns are scored down"""
+    picked: List[Dict[str, Any]] = []
+    remaining = [dict(c) for c in candidates]
+    for candidate in remaining:
+        # Charts on columns the user named come first
+        if {candidate["x"], candidate.get("y")} & set(mentioned):
+            candidate["score"] = min(1.0, candidate["score"] + 0.1)
+
+    while remaining and len(picked) < size:
+        def adjusted(candidate):
+            repeats = sum(p["type"] == candidate["type"] for p in picked)
+            same_columns = any(p["x"] == candidate["x"] and p.get("y") == candidate.get("y") for p in picked)
+            return candidate["score"] - REPEAT_TYPE_PENALTY * repeats - (0.5 if same_columns else 0.0)
+
+        best = max(remaining, key=adjusted)
+        remaining.remove(best)
+        picked.append({**best, "score": round(max(adjusted(best), 0.0), 3)})
+    return picked
+
+
+def _title(chart: Dict[str, Any]) -> str:
+    label = lambda name: name.replace("_", " ").title()
+    if chart["type"] == "line":
+        return f"{label(chart['y']) if chart.get('y') else 'Records'} Over Time"
+    if chart["type"] == "bar":
+        return f"{label(chart['y']) if chart.get('y') else 'Records'} by {label(chart['x'])}"
+    if chart["type"] == "pie":
+        return f"{label(chart['x'])} Distribution"
+    if chart["type"] == "histogram":
+        return f"Distribution of {label(chart['x'])}"
+    return f"{label(chart['x'])} vs {label(chart['y'])}"
+
+
+def echarts_config(chart: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """ECharts option shell for a picked chart; the series come from the chart-data service"""
+    chart_type = chart["type"]
+    option: Dict[str, Any] = {
+        "title": {"text": _title(chart)},
+        "tooltip": {"trigger": "item" if chart_type in ("pie", "scatter") else "axis"},
+    }
+    if chart_type == "line":
+        option.update({"xAxis": {"type": "time"}, "yAxis": {"type": "value"},
+                       "series": [{"type": "line", "smooth": True, "areaStyle": {}}]})
+    elif chart_type in ("bar", "histogram"):
+        option.update({"xAxis": {"type": "category"}, "yAxis": {"type": "value"},
+                       "series": [{"type": "bar"}]})
+    elif chart_type == "pie":
+        option.update({"legend": {"orient": "vertical", "left": "left"},
+                       "series": [{"type": "pie", "radius": "60%"}]})
+    else:
+        option.update({"xAxis": {"type": "value", "name": chart["x"]},
+                       "yAxis": {"type": "value", "name": chart["y"]},
+                       "series": [{"type": "scatter"}]})
+
+    spec = {key: chart[key] for key in ("type", "x", "y", "agg") if chart.get(key)}
+    return {"id": f"chart_{index + 1}", "title": option["title"]["text"], "type": chart_type,
+            "score": chart["score"], "spec": spec, "option": option}
+
+
+def recommend_charts(profile: DatasetProfile, user_requirements: str = "") -> Dict[str, Any]:
+    """Four complementary chart configs and the rule engine's confidence in them (0-1)"""
+    if isinstance(profile, dict):
+        profile = CompactProfile.from_dict(profile)
+
+    mentioned = _mentioned_columns(profile, user_requirements)
+    picked = select_charts(candidate_charts(profile), mentioned)
+    charts = [echarts_config(chart, i) for i, chart in enumerate(picked)]
+
+    # Empty slots count as zero, so sparse profiles get low confidence
+    confidence = sum(chart["score"] for chart in picked) / DASHBOARD_SIZE
+    used = {column for chart in picked for column in (chart["x"], chart.get("y"))}
+    if any(column not in used for column in mentioned):
+        confidence *= 0.5
+    if requirements_need_llm(user_requirements):
+        confidence = min(confidence, LLM_REQUIRED_CONFIDENCE)
+
+    return {"source": "rules", "confidence": round(confidence, 3), "charts": charts}
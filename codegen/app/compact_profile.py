@@ -0,0 +1,351 @@
+"""Columnar in-memory form of a dataset profile, for very wide datasets.
+
+A validated ``DatasetProfile`` keeps a ``Variable`` object per column, and each
+one has about 50 fields, many of them nested dicts. With thousands of columns,
+that adds up to hundreds of thousands of Python objects. ``CompactProfile``
+stores each scalar statistic as one NumPy array across all variables:
+- missing values are NaN, or -1 for booleans and string codes;
+- statistics no variable has get no array at all;
+- strings (names, types, datetime bounds) live in one shared string table;
+- nested fields are kept as each variable's JSON in one byte buffer, decoded on
+  access.
+
+``profile.variables[name]`` returns a small view that reads those arrays and
+answers the same attribute access as ``Variable``. So code that only reads a
+profile (chart recommendation, dashboard keys, drift) can take either form.
+``save``/``load`` write the arrays as ``.npy`` files plus a JSON header, and
+load them back memory-mapped without copying.
+"""
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union, get_args
+
+import numpy as np
+
+from app.models import Analysis, Correlations, DatasetProfile, Table, Transformation, Variable
+
+FORMAT_VERSION = 1
+HEADER_FILE = "profile.json"
+NUMBER, BOOLEAN, STRING, NUMBER_OR_STRING, NESTED = "number", "boolean", "string", "number_or_string", "nested"
+# Marks a missing boolean or string in their int arrays
+MISSING_CODE = -1
+
+
+def _field_kind(annotation: Any) -> str:
+    types = {t for t in (get_args(annotation) or (annotation,)) if t is not type(None)}
+    if types == {float, str}:
+        return NUMBER_OR_STRING
+    if types == {bool}:
+        return BOOLEAN
+    if types <= {int, float}:
+        return NUMBER
+    if types == {str}:
+        return STRING
+    return NESTED
+
+
+def _is_int(annotation: Any) -> bool:
+    return annotation is int or int in get_args(annotation)
+
+
+# Variable field -> (storage kind, key in ydata's output, whether it is an int)
+FIELDS = {name: (_field_kind(field.annotation), field.alias or name, _is_int(field.annotation))
+          for name, field in Variable.model_fields.items()}
+
+
+class StringTable:
+    """Strings packed into one UTF-8 buffer with offsets; code ``i`` is ``buffer[offsets[i]:offsets[i + 1]]``"""
+
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings: List[str]) -> "StringTable":
+        encoded = [s.encode() for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code: int) -> str:
+        return self.buffer[self.offsets[code]:self.offsets[code + 1]].tobytes().decode()
+
+
+class _StringCodes:
+    """Assigns each distinct string one code while building"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        return self.codes.setdefault(value, len(self.codes))
+
+    def table(self) -> StringTable:
+        return StringTable.from_strings(list(self.codes))
+
+
+class VariableView:
+    """One variable of a ``CompactProfile``, read lazily with ``Variable``'s attributes"""
+
+    __slots__ = ("_profile", "_index")
+
+    def __init__(self, profile: "CompactProfile", index: int):
+        self._profile = profile
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in FIELDS:
+            raise AttributeError(f"'Variable' object has no attribute '{name}'")
+        return self._profile._value(name, self._index)
+
+    @property
+    def name(self) -> str:
+        return self._profile.strings[self._index]
+
+    def model_dump(self, by_alias: bool = False) -> Dict[str, Any]:
+        """Same dict as ``Variable.model_dump``"""
+        return {(FIELDS[name][1] if by_alias else name): self._profile._value(name, self._index)
+                for name in FIELDS}
+
+    def to_variable(self) -> Variable:
+        return Variable.model_validate(self.model_dump())
+
+    def __repr__(self) -> str:
+        return f"VariableView({self.name!r}, type={self.type!r})"
+
+
+class VariableTable(Mapping):
+    """Read-only ``name -> VariableView`` mapping in column order"""
+
+    def __init__(self, profile: "CompactProfile"):
+        self._profile = profile
+        self._index: Optional[Dict[str, int]] = None
+
+    def _positions(self) -> Dict[str, int]:
+        # Built on first lookup by name; iterating doesn't need it
+        if self._index is None:
+            self._index = {self._profile.strings[i]: i for i in range(len(self))}
+        return self._index
+
+    def __getitem__(self, name: str) -> VariableView:
+        return VariableView(self._profile, self._positions()[name])
+
+    def __iter__(self) -> Iterator[str]:
+        strings = self._profile.strings
+        return (strings[i] for i in range(len(self)))
+
+    def __len__(self) -> int:
+        return self._profile.n_variables
+
+    def items(self):
+        return ((view.name, view) for view in (VariableView(self._profile, i) for i in range(len(self))))
+
+    def values(self):
+        return (VariableView(self._profile, i) for i in range(len(self)))
+
+
+class CompactProfile:
+    """A dataset profile with its variables stored column-wise; reads like ``DatasetProfile``"""
+
+    def __init__(self, header: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self.header = header
+        self.arrays = arrays
+        self.n_variables = header["n_variables"]
+        self.strings = StringTable(arrays["strings"], arrays["string_offsets"])
+        self.variables = VariableTable(self)
+
+    # Profile-level sections are small, so they stay ordinary models
+
+    @property
+    def analysis(self) -> Analysis:
+        return Analysis(**self.header["analysis"])
+
+    @property
+    def table(self) -> Table:
+        return Table(**self.header["table"])
+
+    @property
+    def time_index_analysis(self) -> Optional[str]:
+        return self.header.get("time_index_analysis")
+
+    @property
+    def alerts(self) -> List[str]:
+        return self.header.get("alerts", [])
+
+    @property
+    def correlations(self) -> Optional[Correlations]:
+        correlations = self.header.get("correlations")
+        return Correlations(**correlations) if correlations else None
+
+    @property
+    def transformations(self) -> List[Transformation]:
+        return [Transformation(**t) for t in self.header.get("transformations", [])]
+
+    @classmethod
+    def from_dict(cls, profile: Dict[str, Any]) -> "CompactProfile":
+        """Build straight from a profile dict (ydata key names), without creating ``Variable`` objects"""
+        variables = profile["variables"]
+        names = list(variables)
+        n = len(names)
+        strings = _StringCodes()
+        for name in names:
+            strings.code(name)
+
+        arrays: Dict[str, np.ndarray] = {}
+        nested_blobs: List[bytes] = [b""] * n
+        nested_values: List[Dict[str, Any]] = [{} for _ in range(n)]
+        for field, (kind, key, _) in FIELDS.items():
+            values = [variables[name].get(key) for name in names]
+            if Variable.model_fields[field].is_required():
+                missing = [name for name, value in zip(names, values) if value is None]
+                if missing:
+                    raise ValueError(f"Variable '{missing[0]}' has no '{key}'")
+            present = [i for i, value in enumerate(values) if value is not None]
+            if not present:
+                continue
+            if kind == NESTED:
+                for i in present:
+                    nested_values[i][key] = values[i]
+            elif kind == NUMBER:
+                column = np.full(n, np.nan)
+                column[present] = [float(values[i]) for i in present]
+                arrays[field] = column
+            elif kind == BOOLEAN:
+                column = np.full(n, MISSING_CODE, dtype=np.int8)
+                column[present] = [bool(values[i]) for i in present]
+                arrays[field] = column
+            elif kind == STRING:
+                column = np.full(n, MISSING_CODE, dtype=np.int32)
+                column[present] = [strings.code(str(values[i])) for i in present]
+                arrays[field] = column
+            else:
+                numbers, codes = np.full(n, np.nan), np.full(n, MISSING_CODE, dtype=np.int32)
+                for i in present:
+                    value = values[i]
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        numbers[i] = value
+                    else:
+                        codes[i] = strings.code(str(value))
+                arrays[field], arrays[f"{field}_text"] = numbers, codes
+
+        for i, value in enumerate(nested_values):
+            if value:
+                nested_blobs[i] = json.dumps(value, separators=(",", ":"), default=str).encode()
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in nested_blobs], out=offsets[1:])
+        nested = np.frombuffer(b"".join(nested_blobs), dtype=np.uint8)
+        table = strings.table()
+        arrays.update({"strings": table.buffer, "string_offsets": table.offsets,
+                       "nested": nested, "nested_offsets": offsets})
+
+        header = {
+            "format_version": FORMAT_VERSION,
+            "n_variables": n,
+            "analysis": profile["analysis"],
+            "time_index_analysis": profile.get("time_index_analysis"),
+            "table": profile["table"],
+            "alerts": profile.get("alerts", []),
+            "correlations": profile.get("correlations"),
+            "transformations": profile.get("transformations", []),
+        }
+        return cls(header, arrays)
+
+    @classmethod
+    def from_profile(cls, profile: DatasetProfile) -> "CompactProfile":
+        return cls.from_dict(profile.model_dump(by_alias=True))
+
+    @classmethod
+    def from_file(cls, profile_path: str) -> "CompactProfile":
+        """From a profile JSON file as written by base_eda"""
+        with open(profile_path) as f:
+            return cls.from_dict(json.load(f))
+
+    def _nested(self, index: int) -> Dict[str, Any]:
+        offsets = self.arrays["nested_offsets"]
+        start, end = offsets[index], offsets[index + 1]
+        if start == end:
+            return {}
+        return json.loads(self.arrays["nested"][start:end].tobytes())
+
+    def _value(self, field: str, index: int) -> Any:
+        kind, key, is_int = FIELDS[field]
+        if kind == NESTED:
+            return self._nested(index).get(key)
+        column = self.arrays.get(field)
+        if column is None:
+            return None
+        value = column[index]
+        if kind == NUMBER:
+            if np.isnan(value):
+                return None
+            return int(value) if is_int else float(value)
+        if kind == BOOLEAN:
+            return None if value == MISSING_CODE else bool(value)
+        if kind == STRING:
+            return None if value == MISSING_CODE else self.strings[value]
+        if not np.isnan(value):
+            return float(value)
+        code = self.arrays[f"{field}_text"][index]
+        return None if code == MISSING_CODE else self.strings[code]
+
+    def model_dump(self, by_alias: bool = False) -> Dict[str, Any]:
+        """Same dict as ``DatasetProfile.model_dump``, without building ``Variable`` objects"""
+        correlations = self.correlations
+        return {
+            "analysis": self.analysis.model_dump(),
+            "time_index_analysis": self.time_index_analysis,
+            "table": self.table.model_dump(),
+            "variables": {name: view.model_dump(by_alias=by_alias) for name, view in self.variables.items()},
+            "alerts": list(self.alerts),
+            "correlations": correlations.model_dump() if correlations else None,
+            "transformations": [t.model_dump() for t in self.transformations],
+        }
+
+    def to_profile(self) -> DatasetProfile:
+        """The equivalent validated ``DatasetProfile`` (builds every ``Variable``)"""
+        header = self.header
+        return DatasetProfile(
+            analysis=header["analysis"],
+            time_index_analysis=header.get("time_index_analysis"),
+            table=header["table"],
+            variables={name: view.model_dump(by_alias=True) for name, view in self.variables.items()},
+            alerts=header.get("alerts", []),
+            correlations=header.get("correlations"),
+            transformations=header.get("transformations", []),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the variable arrays"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """One ``.npy`` per array plus a JSON header; arrays are written from their buffers as they are"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, array in self.arrays.items():
+            np.save(directory / f"{name}.npy", array, allow_pickle=False)
+        return self.save_header(directory)
+
+    def save_header(self, directory: Union[str, Path]) -> Path:
+        """Rewrite only the JSON header, e.g. after a transformation is recorded"""
+        directory = Path(directory)
+        with open(directory / HEADER_FILE, "w") as f:
+            json.dump({**self.header, "arrays": sorted(self.arrays)}, f, default=str)
+        return directory
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap_mode: Optional[str] = "r") -> "CompactProfile":
+        """Load a saved profile; arrays are memory-mapped (read-only) unless ``mmap_mode`` is None"""
+        directory = Path(directory)
+        with open(directory / HEADER_FILE) as f:
+            header = json.load(f)
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact profile format: {header.get('format_version')}")
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+                  for name in header.pop("arrays")}
+        return cls(header, arrays)
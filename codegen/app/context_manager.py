@@ -1,9 +1,12 @@
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 import json
 import os
+import shutil
+import uuid
 from datetime import datetime
 from pydantic import BaseModel
-from app.models import DatasetProfile
+from app.compact_profile import CompactProfile
+from app.models import DatasetProfile, Transformation
 
 class UserInput(BaseModel):
     timestamp: datetime
@@ -16,20 +19,33 @@ class SessionInfo(BaseModel):
 
 class Context(BaseModel):
     session_info: SessionInfo
+    # Only read from older session files; the profile now lives in profile_dir
     dataset_profile: DatasetProfile | None = None
+    # Directory of the session's saved CompactProfile
+    profile_dir: str | None = None
     user_inputs: list[UserInput] = []
 
 class ContextManager:
     def __init__(self, context_file_path: str = "session_context.json"):
         self.context_file_path = context_file_path
+        self.profile: CompactProfile | None = None
         self.context = self._initialize_context()
+        self._transformation_listeners: list[Callable[[str, Transformation], None]] = []
 
     def _initialize_context(self) -> Dict[str, Any]:
         """Initialize or load existing context"""
         if os.path.exists(self.context_file_path):
             with open(self.context_file_path, 'r') as f:
                 context_data = json.load(f)
-                return Context(**context_data).dict()
+            # Kept column-wise rather than as one validated Variable per column
+            profile = context_data.pop("dataset_profile", None)
+            context = Context(**context_data).dict()
+            if profile:
+                self.profile = CompactProfile.from_dict(profile)
+                self._save_profile(context)
+            elif context["profile_dir"] and os.path.isdir(context["profile_dir"]):
+                self.profile = CompactProfile.load(context["profile_dir"])
+            return context
         
         return Context(
             session_info=SessionInfo(
@@ -40,12 +56,21 @@ class ContextManager:
             user_inputs=[]
         ).dict()
 
+    def _save_profile(self, context: Dict[str, Any]) -> None:
+        """Save the profile to a new directory next to the context file, then drop the old one"""
+        stale = context["profile_dir"]
+        # A fresh directory each time, so profiles still memory-mapping the old files stay valid
+        directory = f"{os.path.splitext(self.context_file_path)[0]}_profiles/{uuid.uuid4().hex[:12]}"
+        context["profile_dir"] = str(self.profile.save(directory))
+        if stale and stale != context["profile_dir"]:
+            shutil.rmtree(stale, ignore_errors=True)
+
     def update_dataset_profile(self, profile: Dict[str, Any]) -> None:
         """Update dataset profile in context"""
-        validated_profile = DatasetProfile(**profile)
-        self.context["dataset_profile"] = validated_profile.dict()
+        self.profile = CompactProfile.from_dict(profile)
+        self._save_profile(self.context)
         self.context["session_info"]["last_updated"] = datetime.now().isoformat()
-        self.context["session_info"]["dataset_name"] = validated_profile.analysis.title
+        self.context["session_info"]["dataset_name"] = self.profile.analysis.title
         self._save_context()
 
     def add_user_input(self, user_input: str) -> None:
@@ -57,15 +82,38 @@ class ContextManager:
         self.context["user_inputs"].append(input_entry.dict())
         self._save_context()
 
+    def add_transformation(self, description: str, version: str | None = None) -> Transformation:
+        """Record a transformation of the current dataset and notify listeners"""
+        if self.profile is None:
+            raise ValueError("No dataset profile to record a transformation for")
+
+        transformations = self.profile.header.setdefault("transformations", [])
+        transformation = Transformation(
+            description=description,
+            timestamp=datetime.now().isoformat(),
+            version=version or f"v{len(transformations) + 1}.0"
+        )
+        transformations.append(transformation.dict())
+        self.profile.save_header(self.context["profile_dir"])
+        self.context["session_info"]["last_updated"] = datetime.now().isoformat()
+        self._save_context()
+
+        dataset_name = self.context["session_info"]["dataset_name"]
+        for listener in self._transformation_listeners:
+            listener(dataset_name, transformation)
+        return transformation
+
+    def on_transformation(self, listener: Callable[[str, Transformation], None]) -> None:
+        """Call ``listener(dataset_name, transformation)`` after each recorded transformation"""
+        self._transformation_listeners.append(listener)
+
     def get_context(self) -> Dict[str, Any]:
         """Get current context"""
         return self.context
 
-    def get_dataset_profile(self) -> DatasetProfile | None:
-        """Get current dataset profile"""
-        if self.context["dataset_profile"]:
-            return DatasetProfile(**self.context["dataset_profile"])
-        return None
+    def get_dataset_profile(self) -> CompactProfile | None:
+        """Get current dataset profile (reads like a ``DatasetProfile``; ``to_profile()`` validates one)"""
+        return self.profile
 
     def _save_context(self) -> None:
         """Save context to file with validation"""
@@ -0,0 +1,130 @@
+"""Cache of generated dashboards keyed by profile content and requirements.
+
+A dashboard artifact is the parsed chart config plus the pre-aggregated data for
+each chart. Artifacts are keyed on a hash of the dataset profile and the
+normalized requirements text, so asking again for the same dashboard skips
+prompt construction, the LLM call and chart-data aggregation. Memory is bounded
+by total serialized size with least-recently-used eviction, and every artifact
+for a dataset is dropped when ``ContextManager`` records a transformation.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.compact_profile import CompactProfile
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 128
+
+
+def normalize_requirements(requirements: str) -> str:
+    """Case, whitespace and trailing punctuation don't change what the user asked for"""
+    text = re.sub(r"\s+", " ", requirements.lower()).strip()
+    return text.strip(".!?,; ")
+
+
+def profile_hash(profile: Any) -> str:
+    """Content hash of a profile (model, compact profile or dict), stable across key order"""
+    if hasattr(profile, "model_dump"):
+        profile = profile.model_dump()
+    canonical = json.dumps(profile, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def dashboard_key(profile: Any, requirements: str) -> str:
+    requirements_hash = hashlib.sha256(normalize_requirements(requirements).encode()).hexdigest()
+    return f"{profile_hash(profile)[:16]}-{requirements_hash[:16]}"
+
+
+@dataclass
+class DashboardArtifact:
+    """A generated dashboard: chart config plus each chart's data, by chart id"""
+    key: str
+    dataset: str
+    config: Dict[str, Any]
+    chart_data: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    size_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"key": self.key, "dataset": self.dataset, "config": self.config,
+                "chart_data": self.chart_data, "created_at": self.created_at}
+
+
+class DashboardCache:
+    """Size-bounded LRU of dashboard artifacts"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, DashboardArtifact]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[DashboardArtifact]:
+        with self._lock:
+            artifact = self._entries.get(key)
+            if artifact is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return artifact
+
+    def put(self, artifact: DashboardArtifact) -> None:
+        artifact.size_bytes = len(json.dumps(artifact.to_dict(), default=str))
+        with self._lock:
+            if artifact.size_bytes > self.max_bytes:
+                return
+            self._remove(artifact.key)
+            self._entries[artifact.key] = artifact
+            self.total_bytes += artifact.size_bytes
+            while self.total_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        artifact = self._entries.pop(key, None)
+        if artifact is not None:
+            self.total_bytes -= artifact.size_bytes
+
+    def invalidate_dataset(self, dataset: str) -> int:
+        """Drop every artifact built for a dataset; returns how many were dropped"""
+        with self._lock:
+            keys = [key for key, artifact in self._entries.items() if artifact.dataset == dataset]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def get_or_build(self, profile: Any, requirements: str,
+                     build: Callable[[], Tuple[Dict[str, Any], Dict[str, Any]]]) -> Tuple[DashboardArtifact, bool]:
+        """Cached artifact for (profile, requirements), or build and store one. Returns (artifact, hit).
+
+        ``build`` returns ``(config, chart_data)``.
+        """
+        if isinstance(profile, dict):
+            profile = CompactProfile.from_dict(profile)
+        key = dashboard_key(profile, requirements)
+        artifact = self.get(key)
+        if artifact is not None:
+            return artifact, True
+
+        config, chart_data = build()
+        artifact = DashboardArtifact(key=key, dataset=profile.analysis.title, config=config, chart_data=chart_data)
+        self.put(artifact)
+        return artifact, False
+
+    def attach(self, context_manager) -> None:
+        """Invalidate a dataset's dashboards whenever the context records a transformation of it"""
+        context_manager.on_transformation(lambda dataset, transformation: self.invalidate_dataset(dataset))
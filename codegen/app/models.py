@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Optional, Any, Union
 
 class Analysis(BaseModel):
     title: str
@@ -20,6 +20,8 @@ class Table(BaseModel):
     p_duplicates: float
 
 class Variable(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
     type: str
     n_distinct: int
     p_distinct: float
@@ -60,23 +62,55 @@ class Variable(BaseModel):
     category_alias_char_counts: Optional[Dict[str, Dict[str, int]]] = None
     word_counts: Optional[Dict[str, int]] = None
     cast_type: Optional[str] = None
-    min: Optional[str] = None
-    max: Optional[str] = None
-    range: Optional[str] = None
+    # Numbers for Numeric variables, ISO strings for DateTime ones
+    min: Optional[Union[float, str]] = None
+    max: Optional[Union[float, str]] = None
+    range: Optional[Union[float, str]] = None
     histogram: Optional[Dict[str, List[float]]] = None
     invalid_dates: Optional[int] = None
     n_invalid_dates: Optional[int] = None
     p_invalid_dates: Optional[float] = None
+    n_distinct_estimated: Optional[bool] = None
+    top_k: Optional[List[Dict[str, Any]]] = None
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    # Quantiles, named "5%" ... "95%" in ydata's output
+    p5: Optional[float] = Field(default=None, alias="5%")
+    p25: Optional[float] = Field(default=None, alias="25%")
+    p50: Optional[float] = Field(default=None, alias="50%")
+    p75: Optional[float] = Field(default=None, alias="75%")
+    p95: Optional[float] = Field(default=None, alias="95%")
 
 class Transformation(BaseModel):
     description: str
     timestamp: str
     version: str
 
+class CorrelationPair(BaseModel):
+    a: str
+    b: str
+    value: float
+
+class CorrelationPartner(BaseModel):
+    column: str
+    value: float
+
+class CorrelationResult(BaseModel):
+    top_pairs: List[CorrelationPair]
+    per_column: Dict[str, List[CorrelationPartner]]
+
+class Correlations(BaseModel):
+    n_rows_used: int = 0
+    sampled: bool = False
+    pearson: Optional[CorrelationResult] = None
+    spearman: Optional[CorrelationResult] = None
+    cramers: Optional[CorrelationResult] = None
+
 class DatasetProfile(BaseModel):
     analysis: Analysis
     time_index_analysis: Optional[str] = None
     table: Table
     variables: Dict[str, Variable]
     alerts: List[str]
+    correlations: Optional[Correlations] = None
     transformations: List[Transformation] = []
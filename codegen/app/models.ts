@@ -68,21 +68,44 @@ interface Variable {
 
     // Optional fields for DateTime variables
     cast_type?: string;        // Type cast applied (if any)
-    min?: string;              // Minimum value (ISO format)
-    max?: string;              // Maximum value (ISO format)
-    range?: string;            // Range of values
+    min?: number | string;     // Minimum value (number, or ISO format for dates)
+    max?: number | string;     // Maximum value (number, or ISO format for dates)
+    range?: number | string;   // Range of values
     histogram?: { counts: number[]; bin_edges: number[] };  // Histogram bins
     invalid_dates?: number;    // Number of invalid dates
     n_invalid_dates?: number;  // Duplicate field for invalid dates
     p_invalid_dates?: number;  // Proportion of invalid dates (0 to 1)
 
+    // Optional fields for Numeric variables
+    mean?: number;             // Mean
+    std?: number;              // Standard deviation
+    "5%"?: number;             // Quantiles
+    "25%"?: number;
+    "50%"?: number;
+    "75%"?: number;
+    "95%"?: number;
+
+    // Optional fields for sketched high-cardinality variables
+    n_distinct_estimated?: boolean;  // n_distinct is a HyperLogLog estimate
+    top_k?: Array<{ value: string; count: number; error: number }>;  // Heavy hitters (counts are upper bounds)
+
     // General optional field for sample values
     first_rows?: { [key: string]: string };  // Sample of initial values
 }
 
-// Interface for the Correlation section
+// Interface for one method's strongest relationships
+interface CorrelationResult {
+    top_pairs: Array<{ a: string; b: string; value: number }>;                    // Strongest pairs overall
+    per_column: { [key: string]: Array<{ column: string; value: number }> };      // Strongest partners per column
+}
+
+// Interface for the Correlation section (top-k pairs, not full matrices)
 interface Correlation {
-    auto: Array<{ [key: string]: number }>;  // List of correlation dictionaries (e.g., variable pairs)
+    n_rows_used: number;                  // Rows the correlations were computed on
+    sampled: boolean;                     // Whether rows were sampled
+    pearson?: CorrelationResult | null;   // Numeric, linear
+    spearman?: CorrelationResult | null;  // Numeric, rank-based
+    cramers?: CorrelationResult | null;   // Categorical (Cramér's V)
 }
 
 // Interface for bar chart data
@@ -153,7 +176,7 @@ export interface DatasetProfile {
     table: Table;                              // Table statistics
     variables: { [key: string]: Variable };    // Dictionary of variables by name
     scatter: ScatterPlotData;                  // Scatter plot data
-    correlations: Correlation;                 // Correlation data
+    correlations?: Correlation | null;         // Correlation data
     missing: Missing;                          // Missing value visualizations
     alerts: string[];                          // List of warnings or alerts
     package: Package;                          // Package metadata
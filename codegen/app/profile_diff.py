@@ -0,0 +1,214 @@
+"""Drift between two stored profiles of the same dataset.
+
+Everything is computed from the profiles alone, without reading either
+dataset again: schema changes, per-variable missingness and cardinality
+deltas, and distribution distances. Numeric distances come from each
+profile's min/5%/25%/50%/75%/95%/max. These are treated as a piecewise-linear
+CDF and evaluated for all variables at once with NumPy, giving an approximate
+PSI over the old version's quantile bins and a KS statistic. Categorical
+distances compare the stored ``top_k`` levels.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+QUANTILE_KEYS = ("5%", "25%", "50%", "75%", "95%")
+# Cumulative share of values at min, each quantile and max
+QUANTILE_LEVELS = np.array([0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0])
+# Common PSI rule of thumb: below 0.1 stable, 0.1-0.25 moderate shift, above 0.25 major shift
+PSI_MODERATE = 0.1
+PSI_MAJOR = 0.25
+PSI_EPSILON = 1e-4
+# Smaller changes aren't reported per variable
+MIN_MISSING_DELTA = 0.01
+MIN_CARDINALITY_CHANGE = 0.1
+NUMERIC_TYPES = ("Numeric",)
+CATEGORICAL_TYPES = ("Categorical", "Boolean", "Text")
+
+
+def _as_dict(profile: Any) -> Dict[str, Any]:
+    if hasattr(profile, "model_dump"):
+        # by_alias restores ydata's "5%"-style quantile names
+        return profile.model_dump(by_alias=True)
+    return profile
+
+
+def _knots(variable: Dict[str, Any]) -> Optional[List[float]]:
+    values = [variable.get("min"), *(variable.get(k) for k in QUANTILE_KEYS), variable.get("max")]
+    if any(not isinstance(v, (int, float)) or isinstance(v, bool) for v in values):
+        return None
+    return [float(v) for v in values]
+
+
+def batched_cdf(knots: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Piecewise-linear CDFs (one row of quantile knots per variable) evaluated at x (same rows)"""
+    n_knots = knots.shape[1]
+    # Index of the last knot <= x; repeated knots (discrete data) jump straight to their top level
+    idx = (knots[:, None, :] <= x[:, :, None]).sum(axis=2) - 1
+    inner = np.clip(idx, 0, n_knots - 2)
+    x0 = np.take_along_axis(knots, inner, axis=1)
+    x1 = np.take_along_axis(knots, inner + 1, axis=1)
+    width = np.where(x1 > x0, x1 - x0, 1.0)
+    levels = QUANTILE_LEVELS[inner] + (x - x0) / width * (QUANTILE_LEVELS[inner + 1] - QUANTILE_LEVELS[inner])
+    return np.where(idx < 0, 0.0, np.where(idx >= n_knots - 1, 1.0, levels))
+
+
+def _psi(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    p, q = np.clip(p, PSI_EPSILON, None), np.clip(q, PSI_EPSILON, None)
+    return ((p - q) * np.log(p / q)).sum(axis=-1)
+
+
+def numeric_drift(before: np.ndarray, after: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(PSI, KS) per row of quantile knots (min, 5%, ..., 95%, max) for two versions"""
+    before, after = np.sort(before, axis=1), np.sort(after, axis=1)
+    # PSI over the old version's quantile bins; tails are open-ended
+    edges = before[:, 1:-1]
+    p = np.diff(np.concatenate([np.zeros((len(edges), 1)), batched_cdf(before, edges),
+                                np.ones((len(edges), 1))], axis=1), axis=1)
+    q = np.diff(np.concatenate([np.zeros((len(edges), 1)), batched_cdf(after, edges),
+                                np.ones((len(edges), 1))], axis=1), axis=1)
+    # Both CDFs are piecewise linear, so the largest gap is at one of the knots
+    points = np.concatenate([before, after], axis=1)
+    ks = np.abs(batched_cdf(before, points) - batched_cdf(after, points)).max(axis=1)
+    return _psi(p, q), ks
+
+
+def categorical_drift(before: Dict[str, Any], after: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """PSI and changed levels from two ``top_k`` lists; untracked levels are pooled as "other\""""
+    top_before, top_after = before.get("top_k"), after.get("top_k")
+    if not top_before or not top_after or not before.get("count") or not after.get("count"):
+        return None
+    counts_before = {item["value"]: item["count"] for item in top_before}
+    counts_after = {item["value"]: item["count"] for item in top_after}
+    levels = list(dict.fromkeys([*counts_before, *counts_after]))
+    p = np.array([counts_before.get(v, 0) for v in levels], dtype=float) / before["count"]
+    q = np.array([counts_after.get(v, 0) for v in levels], dtype=float) / after["count"]
+    p, q = np.append(p, max(0.0, 1 - p.sum())), np.append(q, max(0.0, 1 - q.sum()))
+    # A level missing from one top-k list may just be below its cut-off, so only
+    # levels that are frequent in one version and absent in the other are reported
+    return {
+        "psi": float(_psi(p, q)),
+        "new_levels": [v for v in counts_after if v not in counts_before][:5],
+        "dropped_levels": [v for v in counts_before if v not in counts_after][:5],
+    }
+
+
+def _severity(psi: Optional[float]) -> str:
+    if psi is None or psi < PSI_MODERATE:
+        return "stable"
+    return "major" if psi >= PSI_MAJOR else "moderate"
+
+
+def diff_profiles(before: Any, after: Any) -> Dict[str, Any]:
+    """Compact drift section between two profiles (models or dicts) of the same dataset"""
+    before, after = _as_dict(before), _as_dict(after)
+    vars_before, vars_after = before["variables"], after["variables"]
+    common = [name for name in vars_after if name in vars_before]
+
+    schema = {
+        "added": [name for name in vars_after if name not in vars_before],
+        "removed": [name for name in vars_before if name not in vars_after],
+        "type_changed": [{"column": name, "before": vars_before[name]["type"], "after": vars_after[name]["type"]}
+                         for name in common if vars_before[name]["type"] != vars_after[name]["type"]],
+    }
+
+    changes: Dict[str, Dict[str, Any]] = {}
+    for name in common:
+        a, b = vars_before[name], vars_after[name]
+        change: Dict[str, Any] = {}
+        missing_delta = (b.get("p_missing") or 0.0) - (a.get("p_missing") or 0.0)
+        if abs(missing_delta) >= MIN_MISSING_DELTA:
+            change["p_missing"] = [round(a.get("p_missing") or 0.0, 4), round(b.get("p_missing") or 0.0, 4)]
+        # Either side may not have been computed (null), which says nothing about drift
+        if (a.get("n_distinct") and b.get("n_distinct") is not None
+                and abs(b["n_distinct"] / a["n_distinct"] - 1) >= MIN_CARDINALITY_CHANGE):
+            change["n_distinct"] = [a["n_distinct"], b["n_distinct"]]
+        changes[name] = change
+
+    # Numeric distances for all numeric variables in one batch
+    numeric = [(name, _knots(vars_before[name]), _knots(vars_after[name])) for name in common
+               if vars_before[name]["type"] in NUMERIC_TYPES and vars_after[name]["type"] in NUMERIC_TYPES]
+    numeric = [item for item in numeric if item[1] and item[2]]
+    if numeric:
+        psi, ks = numeric_drift(np.array([k for _, k, _ in numeric]), np.array([k for _, _, k in numeric]))
+        for (name, _, _), psi_value, ks_value in zip(numeric, psi, ks):
+            a, b = vars_before[name], vars_after[name]
+            change = changes[name]
+            change.update({"psi": round(float(psi_value), 4), "ks": round(float(ks_value), 4)})
+            if a.get("std") and a.get("mean") is not None and b.get("mean") is not None:
+                change["mean_shift_std"] = round((b["mean"] - a["mean"]) / a["std"], 3)
+
+    for name in common:
+        a, b = vars_before[name], vars_after[name]
+        if a["type"] in CATEGORICAL_TYPES and b["type"] in CATEGORICAL_TYPES:
+            drift = categorical_drift(a, b)
+            if drift:
+                changes[name]["psi"] = round(drift["psi"], 4)
+                changes[name].update({k: v for k, v in drift.items() if k != "psi" and v})
+
+    variables = {}
+    for name, change in changes.items():
+        change["severity"] = _severity(change.get("psi"))
+        if change["severity"] != "stable" or "p_missing" in change or "n_distinct" in change:
+            variables[name] = change
+
+    rows_before, rows_after = before["table"]["n"], after["table"]["n"]
+    return {
+        "rows": [rows_before, rows_after],
+        "duplicates": [before["table"].get("n_duplicates", 0), after["table"].get("n_duplicates", 0)],
+        "schema": schema,
+        "variables": variables,
+        "drifted": sorted((name for name, c in variables.items() if c["severity"] != "stable"),
+                          key=lambda name: -variables[name]["psi"]),
+    }
+
+
+def format_drift(diff: Dict[str, Any]) -> str:
+    """Short plain-text drift summary for prompts"""
+    lines = [f"Rows: {diff['rows'][0]:,} -> {diff['rows'][1]:,}"]
+    schema = diff["schema"]
+    if schema["added"]:
+        lines.append(f"Added columns: {', '.join(schema['added'])}")
+    if schema["removed"]:
+        lines.append(f"Removed columns: {', '.join(schema['removed'])}")
+    for change in schema["type_changed"]:
+        lines.append(f"Type changed: {change['column']} {change['before']} -> {change['after']}")
+    for name, change in diff["variables"].items():
+        parts = []
+        if "psi" in change and change["severity"] != "stable":
+            parts.append(f"{change['severity']} distribution shift (PSI {change['psi']:.2f})")
+        if "p_missing" in change:
+            parts.append(f"missing {change['p_missing'][0]:.1%} -> {change['p_missing'][1]:.1%}")
+        if "n_distinct" in change:
+            parts.append(f"distinct {change['n_distinct'][0]:,} -> {change['n_distinct'][1]:,}")
+        if change.get("new_levels"):
+            parts.append(f"new levels {', '.join(change['new_levels'])}")
+        if parts:
+            lines.append(f"- {name}: {'; '.join(parts)}")
+    return "\n".join(lines)
+
+
+def previous_profile_path(profile_path: str) -> Optional[str]:
+    """The latest older profile of the same dataset (``<dataset>_<timestamp>_profile.json``), if any"""
+    path = Path(profile_path)
+    match = re.fullmatch(r"(.+)_(\d{8}_\d{6})_profile\.json", path.name)
+    if not match:
+        return None
+    dataset, timestamp = match.groups()
+    older = []
+    for candidate in path.parent.glob(f"{dataset}_*_profile.json"):
+        other = re.fullmatch(rf"{re.escape(dataset)}_(\d{{8}}_\d{{6}})_profile\.json", candidate.name)
+        if other and other.group(1) < timestamp:
+            older.append((other.group(1), candidate))
+    return str(max(older)[1]) if older else None
+
+
+def diff_profile_files(before_path: str, after_path: str) -> Dict[str, Any]:
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    return diff_profiles(before, after)
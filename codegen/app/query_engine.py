@@ -0,0 +1,303 @@
+"""Embedded DuckDB query layer for dashboard filters.
+
+Each uploaded dataset is loaded once into an in-memory DuckDB table, and
+dashboard interactions are answered with a small structured query API
+(filters, group-by, time buckets, aggregates, top-N) instead of reloading the
+file into pandas. Results are cached under a normalized form of the query, and
+the database runs with a memory limit (spilling to disk beyond it), one query at
+a time, so each query's memory is bounded.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+DEFAULT_MEMORY_LIMIT = "512MB"
+DEFAULT_CACHE_SIZE = 256
+# Hard cap on rows returned to the browser, whatever the query's limit
+MAX_RESULT_ROWS = 10_000
+DEFAULT_TIMEOUT_SECONDS = 10.0
+READERS = {".csv": "read_csv_auto", ".tsv": "read_csv_auto", ".txt": "read_csv_auto", ".parquet": "read_parquet"}
+# DuckDB has no Excel reader here, so these go through pandas
+EXCEL_EXTENSIONS = (".xls", ".xlsx")
+
+FilterOp = Literal["=", "!=", "<", "<=", ">", ">=", "in", "not in", "between", "is null", "is not null"]
+Aggregate = Literal["sum", "avg", "min", "max", "count", "count_distinct"]
+Grain = Literal["minute", "hour", "day", "week", "month", "quarter", "year"]
+
+
+class Filter(BaseModel):
+    column: str
+    op: FilterOp = "="
+    value: Any = None
+
+
+class Measure(BaseModel):
+    agg: Aggregate = "count"
+    column: Optional[str] = None
+    alias: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.alias or (f"{self.agg}_{self.column}" if self.column else self.agg)
+
+
+class TimeBucket(BaseModel):
+    column: str
+    grain: Grain = "day"
+    alias: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.alias or f"{self.column}_{self.grain}"
+
+
+class Query(BaseModel):
+    group_by: List[str] = []
+    time_bucket: Optional[TimeBucket] = None
+    measures: List[Measure] = Field(default_factory=lambda: [Measure()])
+    filters: List[Filter] = []
+    # Column or measure name to order by; defaults to the time bucket, else the first measure
+    order_by: Optional[str] = None
+    descending: bool = True
+    limit: int = Field(default=1000, ge=1, le=MAX_RESULT_ROWS)
+
+    def cache_key(self) -> str:
+        """Canonical JSON: filter order and IN-list order don't change the result"""
+        data = self.model_dump()
+        for f in data["filters"]:
+            if f["op"] in ("in", "not in") and isinstance(f["value"], list):
+                f["value"] = sorted(f["value"], key=repr)
+        data["filters"] = sorted(data["filters"], key=lambda f: json.dumps(f, sort_keys=True, default=str))
+        return json.dumps(data, sort_keys=True, default=str)
+
+
+class QueryError(ValueError):
+    """Raised for queries that reference unknown columns or are otherwise invalid"""
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _table_name(dataset: str) -> str:
+    # Hashed: sanitizing the name would map e.g. "sales-2024.csv" and "sales_2024.csv" to one table
+    return "ds_" + hashlib.sha256(dataset.encode()).hexdigest()[:16]
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def build_sql(table: str, columns: Dict[str, str], query: Query) -> Tuple[str, List[Any]]:
+    """SQL and parameters for a query; every identifier is checked against ``columns`` (name -> type)"""
+    known = set(columns)
+
+    def column(name: str) -> str:
+        if name not in known:
+            raise QueryError(f"Unknown column: {name}")
+        return quote_identifier(name)
+
+    select, group = [], []
+    if query.time_bucket:
+        bucket = query.time_bucket
+        expr = column(bucket.column)
+        if not columns[bucket.column].startswith(("TIMESTAMP", "DATE")):
+            expr = f"TRY_CAST({expr} AS TIMESTAMP)"
+        expr = f"date_trunc('{bucket.grain}', {expr})"
+        select.append(f"{expr} AS {quote_identifier(bucket.name)}")
+        group.append(expr)
+    for name in query.group_by:
+        select.append(column(name))
+        group.append(column(name))
+    for measure in query.measures:
+        if measure.agg == "count" and measure.column is None:
+            expr = "count(*)"
+        elif measure.column is None:
+            raise QueryError(f"{measure.agg} needs a column")
+        elif measure.agg == "count_distinct":
+            expr = f"count(DISTINCT {column(measure.column)})"
+        else:
+            expr = f"{measure.agg}({column(measure.column)})"
+        select.append(f"{expr} AS {quote_identifier(measure.name)}")
+
+    where, params = [], []
+    for f in query.filters:
+        target = column(f.column)
+        if f.op in ("is null", "is not null"):
+            where.append(f"{target} {f.op.upper()}")
+        elif f.op in ("in", "not in"):
+            values = f.value if isinstance(f.value, list) else [f.value]
+            if not values:
+                where.append("FALSE" if f.op == "in" else "TRUE")
+                continue
+            where.append(f"{target} {f.op.upper()} ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        elif f.op == "between":
+            if not isinstance(f.value, list) or len(f.value) != 2:
+                raise QueryError("between needs a [low, high] value")
+            where.append(f"{target} BETWEEN ? AND ?")
+            params.extend(f.value)
+        else:
+            where.append(f"{target} {f.op} ?")
+            params.append(f.value)
+
+    outputs = [m.name for m in query.measures]
+    if query.time_bucket:
+        outputs.append(query.time_bucket.name)
+    order_by = query.order_by
+    if order_by is None:
+        order_by = query.time_bucket.name if query.time_bucket else query.measures[0].name
+    if order_by not in outputs and order_by not in query.group_by:
+        raise QueryError(f"Cannot order by {order_by}")
+    # Time series read oldest first unless asked otherwise
+    descending = query.descending and not (query.order_by is None and query.time_bucket)
+
+    sql = f"SELECT {', '.join(select)} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if group:
+        sql += " GROUP BY " + ", ".join(group)
+    sql += f" ORDER BY {quote_identifier(order_by)} {'DESC' if descending else 'ASC'} NULLS LAST"
+    sql += f" LIMIT {query.limit + 1}"  # one extra row tells us the result was truncated
+    return sql, params
+
+
+class QueryEngine:
+    """In-memory DuckDB database holding one table per registered dataset"""
+
+    def __init__(self, memory_limit: str = DEFAULT_MEMORY_LIMIT, threads: Optional[int] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                 temp_directory: Optional[str] = None):
+        import duckdb
+
+        self.con = duckdb.connect(":memory:")
+        self.con.execute(f"SET memory_limit = '{memory_limit}'")
+        self.con.execute(f"SET temp_directory = '{temp_directory or os.path.join(tempfile.gettempdir(), 'yudai-duckdb')}'")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._datasets: Dict[str, Dict[str, Any]] = {}
+        # One query at a time, so the memory limit bounds each query
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _file_version(file_path: str) -> str:
+        stat = os.stat(file_path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _load_table(self, table: str, file_path: str) -> None:
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in EXCEL_EXTENSIONS:
+            import pandas as pd
+
+            try:
+                df = pd.read_excel(file_path)
+            except ImportError as e:
+                raise QueryError(f"Excel files need an Excel reader for pandas: {e}") from e
+            self.con.register("excel_upload", df)
+            try:
+                self.con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM excel_upload")
+            finally:
+                self.con.unregister("excel_upload")
+        elif extension in READERS:
+            self.con.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM {READERS[extension]}(?)",
+                             [file_path])
+        else:
+            raise QueryError(f"Unsupported file format: {extension or file_path}")
+
+    def register(self, dataset: str, file_path: str) -> Dict[str, str]:
+        """Load (or reload, if the file changed) a CSV/Parquet/Excel file as a table; returns its column types"""
+        version = self._file_version(file_path)
+        with self._lock:
+            current = self._datasets.get(dataset)
+            if current and current["version"] == version and current["path"] == file_path:
+                return current["columns"]
+
+            table = _table_name(dataset)
+            self._load_table(table, file_path)
+            columns = {row[0]: row[1] for row in self.con.execute(f"DESCRIBE {table}").fetchall()}
+            self._datasets[dataset] = {"table": table, "path": file_path, "version": version, "columns": columns}
+            self._invalidate(dataset)
+            return columns
+
+    def _invalidate(self, dataset: str) -> None:
+        for key in [k for k in self._cache if k[0] == dataset]:
+            del self._cache[key]
+
+    def query(self, dataset: str, query: Query) -> Dict[str, Any]:
+        """Run a structured query against a registered dataset, using the result cache"""
+        with self._lock:
+            if dataset not in self._datasets:
+                raise QueryError(f"Unknown dataset: {dataset}")
+            info = self._datasets[dataset]
+            key = (dataset, info["version"], query.cache_key())
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return {**cached, "cached": True}
+
+            self.misses += 1
+            sql, params = build_sql(info["table"], info["columns"], query)
+            start = time.perf_counter()
+            # DuckDB has no per-query timeout; interrupt from a timer thread instead
+            timer = threading.Timer(self.timeout, self.con.interrupt)
+            timer.start()
+            try:
+                cursor = self.con.execute(sql, params)
+                rows = cursor.fetchall()
+                columns = [d[0] for d in cursor.description]
+            finally:
+                timer.cancel()
+
+            truncated = len(rows) > query.limit
+            result = {
+                "columns": columns,
+                "rows": [[_jsonable(v) for v in row] for row in rows[:query.limit]],
+                "truncated": truncated,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return {**result, "cached": False}
+
+    def query_file(self, file_path: str, query: Query) -> Dict[str, Any]:
+        """Query a dataset file directly, registering it under its path on first use"""
+        dataset = os.path.abspath(file_path)
+        self.register(dataset, file_path)
+        return self.query(dataset, query)
+
+    def close(self) -> None:
+        with self._lock:
+            self.con.close()
+
+
+_engine: Optional[QueryEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> QueryEngine:
+    """Process-wide engine, created on first use (YUDAI_QUERY_MEMORY_LIMIT sets its memory limit)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = QueryEngine(memory_limit=os.getenv("YUDAI_QUERY_MEMORY_LIMIT", DEFAULT_MEMORY_LIMIT))
+        return _engine
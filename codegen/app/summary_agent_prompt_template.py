@@ -1,7 +1,15 @@
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterable, Optional
 import json
+import logging
+from app.compact_profile import CompactProfile
 from app.models import DatasetProfile
 from .context_manager import Context
+from .chart_recommender import recommend_charts
+
+logger = logging.getLogger(__name__)
+
+# Below this rule-engine confidence the dashboard is generated by the LLM
+MIN_RULES_CONFIDENCE = 0.7
 
 def create_base_template() -> str:
     """Returns the enhanced summary agent template for ECharts configuration"""
@@ -17,6 +25,13 @@ def create_base_template() -> str:
     {user_requirements}
 
     Generate exactly 4 complementary charts that address the user's requirements and highlight key insights from the dataset.
+
+    Respond with a single JSON object of this shape and nothing else:
+    {{"charts": [{{"id": "chart_1", "title": "<title>", "type": "<line|bar|pie|histogram|scatter>",
+                 "spec": {{"type": "<line|bar|pie|histogram|scatter>", "x": "<column>", "y": "<numeric column, optional>",
+                          "agg": "<sum|mean|count|min|max, optional>"}},
+                 "option": {{<ECharts option without series data>}}}}]}}
+    Every "x" and "y" must be a column from the dataset profile; the series data is filled in from "spec".
     '''
 
 # User requirements is the output from the prompt template orchestrator.
@@ -32,7 +47,7 @@ def format_dataset_profile(profile: DatasetProfile) -> str:
         return "No dataset profile available"
         
     if isinstance(profile, dict):
-        profile = DatasetProfile(**profile)
+        profile = CompactProfile.from_dict(profile)
         
     summary = [
         f"Dataset: {profile.analysis.title}",
@@ -44,6 +59,13 @@ def format_dataset_profile(profile: DatasetProfile) -> str:
     
     for var_name, var_info in profile.variables.items():
         summary.append(f"- {var_name} ({var_info.type})")
+
+    if profile.correlations:
+        summary.append("\nStrongest Relationships:")
+        for method in ("pearson", "spearman", "cramers"):
+            result = getattr(profile.correlations, method)
+            for pair in (result.top_pairs[:5] if result else []):
+                summary.append(f"- {pair.a} ↔ {pair.b} ({method}: {pair.value:.2f})")
     
     return "\n".join(summary)
 
@@ -55,7 +77,7 @@ def generate_chart_prompt_template(profile: DatasetProfile, user_requirements: s
         raise ValueError("Profile is required to generate the prompt template")
     
     if isinstance(profile, dict):
-        profile = DatasetProfile(**profile)
+        profile = CompactProfile.from_dict(profile)
     
     return template.format(
         dataset_profile=format_dataset_profile(profile),
@@ -76,6 +98,50 @@ def parse_llm_response(response: str) -> Dict:
                 pass
         return {}
 
+def is_valid_dashboard_config(config: Any, columns: Optional[Iterable[str]] = None) -> bool:
+    """True for ``{"charts": [{"id": ..., "spec": {...}}, ...]}`` whose specs ``/chart-data`` accepts.
+
+    With ``columns``, every spec must also only use those columns.
+    """
+    # Deferred so the prompt helpers don't pull in pandas
+    from pydantic import ValidationError
+    from .chart_data import ChartSpec
+
+    if not isinstance(config, dict) or not isinstance(config.get("charts"), list) or not config["charts"]:
+        return False
+    for chart in config["charts"]:
+        if not isinstance(chart, dict) or not isinstance(chart.get("id"), str) or not isinstance(chart.get("spec"), dict):
+            return False
+        try:
+            spec = ChartSpec(**chart["spec"])
+        except (ValidationError, TypeError):
+            return False
+        if columns is not None and not set(spec.columns()) <= set(columns):
+            return False
+    return True
+
+def generate_dashboard_config(profile: DatasetProfile, user_requirements: str,
+                              llm: Optional[Callable[[str], str]] = None,
+                              min_confidence: float = MIN_RULES_CONFIDENCE) -> Dict:
+    """Dashboard chart configs, from the rule engine when it is confident and the LLM otherwise.
+
+    ``llm`` takes the prompt and returns the raw completion. Without it, or when
+    its response isn't a valid config (see ``is_valid_dashboard_config``), the
+    rule-based configs are returned anyway.
+    """
+    if isinstance(profile, dict):
+        profile = CompactProfile.from_dict(profile)
+
+    recommended = recommend_charts(profile, user_requirements)
+    if recommended["confidence"] >= min_confidence or llm is None:
+        return recommended
+
+    config = parse_llm_response(llm(generate_chart_prompt_template(profile, user_requirements)))
+    if not is_valid_dashboard_config(config, profile.variables):
+        logger.warning("LLM dashboard config is missing charts with an id and a valid spec; using the rules")
+        return recommended
+    return {"source": "llm", "confidence": recommended["confidence"], **config}
+
 if __name__ == "__main__":
     # Example usage
     from context_manager import ContextManager
@@ -0,0 +1,134 @@
+"""Synthetic datasets and profiles for the benchmark suite.
+
+Datasets vary in row count, column count and dtype mix so the profiling and
+prompt-building hot paths can be measured on shapes that resemble real uploads.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Share of columns per kind for each dtype mix
+DTYPE_MIXES: Dict[str, Dict[str, float]] = {
+    "numeric": {"float": 0.7, "int": 0.3},
+    "categorical": {"category": 0.6, "text": 0.2, "int": 0.2},
+    "mixed": {"float": 0.35, "int": 0.2, "category": 0.25, "datetime": 0.1, "text": 0.1},
+    "wide_text": {"text": 0.5, "category": 0.3, "float": 0.2},
+}
+
+_CATEGORY_LEVELS = ["north", "south", "east", "west", "central", "online", "retail", "wholesale"]
+
+# ydata-style variable types used in synthetic profiles
+_PROFILE_TYPES = {"float": "Numeric", "int": "Numeric", "category": "Categorical",
+                  "datetime": "DateTime", "text": "Text"}
+
+
+def column_kinds(cols: int, dtype_mix: str = "mixed") -> list[str]:
+    """Assign a column kind to each of ``cols`` columns according to the mix"""
+    if dtype_mix not in DTYPE_MIXES:
+        raise ValueError(f"Unknown dtype mix: {dtype_mix}")
+    shares = DTYPE_MIXES[dtype_mix]
+    remaining = {kind: max(1, round(cols * share)) for kind, share in shares.items()}
+
+    # Round-robin over the kinds so every prefix of the columns keeps the mix
+    kinds = []
+    while len(kinds) < cols:
+        for kind in shares:
+            if remaining[kind] > 0 or all(v <= 0 for v in remaining.values()):
+                kinds.append(kind)
+                remaining[kind] -= 1
+    return kinds[:cols]
+
+
+def make_dataset(rows: int, cols: int, dtype_mix: str = "mixed", seed: int = 0,
+                 missing_rate: float = 0.02) -> pd.DataFrame:
+    """Build a DataFrame of ``rows`` x ``cols`` with the requested dtype mix"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i, kind in enumerate(column_kinds(cols, dtype_mix)):
+        name = f"{kind}_{i}"
+        if kind == "float":
+            values = rng.normal(loc=100, scale=25, size=rows)
+            if missing_rate:
+                values[rng.random(rows) < missing_rate] = np.nan
+            data[name] = values
+        elif kind == "int":
+            data[name] = rng.integers(0, 1_000, size=rows)
+        elif kind == "category":
+            levels = np.array(_CATEGORY_LEVELS[: 2 + i % (len(_CATEGORY_LEVELS) - 1)])
+            data[name] = levels[rng.integers(0, len(levels), size=rows)]
+        elif kind == "datetime":
+            start = np.datetime64("2020-01-01")
+            data[name] = start + rng.integers(0, 1_500, size=rows).astype("timedelta64[D]")
+        else:
+            # High-cardinality free text / ID-like values
+            data[name] = pd.Series(rng.integers(0, rows * 10, size=rows)).map("id-{:x}".format).to_numpy()
+    return pd.DataFrame(data)
+
+
+def write_dataset(path: Path, rows: int, cols: int, dtype_mix: str = "mixed", seed: int = 0) -> Path:
+    """Write a synthetic dataset to CSV and return its path"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    make_dataset(rows, cols, dtype_mix, seed).to_csv(path, index=False)
+    return path
+
+
+def make_profile_dict(rows: int, cols: int, dtype_mix: str = "mixed", title: str = "synthetic") -> Dict[str, Any]:
+    """Build a cleaned-profile dict shaped like base_eda output without running ydata"""
+    kinds = column_kinds(cols, dtype_mix)
+    variables = {}
+    types: Dict[str, int] = {}
+    for i, kind in enumerate(kinds):
+        var_type = _PROFILE_TYPES[kind]
+        types[var_type] = types.get(var_type, 0) + 1
+        n_distinct = rows if kind == "text" else min(rows, 8 if kind == "category" else rows // 2 or 1)
+        n_missing = rows // 50 if kind == "float" else 0
+        variables[f"{kind}_{i}"] = {
+            "type": var_type,
+            "n_distinct": n_distinct,
+            "p_distinct": n_distinct / rows,
+            "is_unique": n_distinct == rows,
+            "n_unique": n_distinct,
+            "p_unique": n_distinct / rows,
+            "hashable": True,
+            "n_missing": n_missing,
+            "n": rows,
+            "p_missing": n_missing / rows,
+            "count": rows - n_missing,
+            "memory_size": rows * 8,
+            "first_rows": {str(r): f"value_{r}" for r in range(5)},
+            "chi_squared": {"statistic": 0.0, "pvalue": 1.0},
+        }
+    return {
+        "analysis": {"title": title, "date_start": "2024-01-01 00:00:00", "date_end": "2024-01-01 00:00:05"},
+        "time_index_analysis": None,
+        "table": {
+            "n": rows, "n_var": cols, "memory_size": rows * cols * 8, "record_size": cols * 8.0,
+            "n_cells_missing": 0, "n_vars_with_missing": 0, "n_vars_all_missing": 0,
+            "p_cells_missing": 0.0, "types": types, "n_duplicates": 0, "p_duplicates": 0.0,
+        },
+        "variables": variables,
+        "alerts": [],
+    }
+
+
+def make_raw_profile_dict(rows: int, cols: int, dtype_mix: str = "mixed",
+                          value_counts_size: int = 1_000) -> Dict[str, Any]:
+    """Like ``make_profile_dict`` but with the bulky keys ``clean_profile_data`` strips"""
+    profile = make_profile_dict(rows, cols, dtype_mix)
+    for var_data in profile["variables"].values():
+        counts = {f"value_{i}": value_counts_size - i for i in range(value_counts_size)}
+        var_data["value_counts_without_nan"] = counts
+        var_data["value_counts_index_sorted"] = dict(sorted(counts.items()))
+        var_data["histogram"] = {"counts": list(range(50)), "bin_edges": [float(i) for i in range(51)]}
+        var_data["word_counts"] = dict(counts)
+    profile.update({"missing": {}, "package": {"ydata_profiling_version": "synthetic"},
+                    "sample": [], "duplicates": []})
+    return profile
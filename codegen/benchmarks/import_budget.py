@@ -0,0 +1,125 @@
+"""Cold-start budget check for the CLI entry points and the FastAPI app.
+
+Each target is imported in a fresh interpreter with ``python -X importtime`` and
+its cumulative import time is compared against a budget. Modules that must stay
+deferred until first use are checked as well.
+
+Run from the repository root:
+
+    python -m codegen.benchmarks.import_budget
+    python -m codegen.benchmarks.import_budget --json --scale 2
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import budget in milliseconds per entry point
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "codegen.agents.base_eda": 100,
+    "codegen.agents.dataset_profiler_agent": 50,
+    "codegen.agents.insight_gen_agent": 50,
+    "codegen.agents.manager": 50,
+    "codegen.agents.profiling_worker": 150,
+    "codegen.api.chat": 1500,
+}
+
+# Heavy modules that an entry point must not pull in at import time
+DEFERRED_MODULES = ["pandas", "ydata_profiling", "openai", "dotenv"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+@dataclass
+class ImportMeasurement:
+    """Import-time measurement for a single entry point"""
+    module: str
+    cumulative_ms: float
+    budget_ms: float
+    eager_heavy_modules: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.eager_heavy_modules and self.cumulative_ms <= self.budget_ms
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Parse ``-X importtime`` output into {module: (self_us, cumulative_us)}"""
+    timings = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, module = match.groups()
+            timings[module] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_import(module: str, budget_ms: float) -> ImportMeasurement:
+    """Import a module in a fresh interpreter and record its cumulative import time"""
+    probe = (
+        f"import sys, json, {module}\n"
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+        return ImportMeasurement(module=module, cumulative_ms=0.0, budget_ms=budget_ms, error=last_line)
+
+    timings = parse_importtime(result.stderr)
+    _, cumulative_us = timings.get(module, (0, 0))
+    return ImportMeasurement(
+        module=module,
+        cumulative_ms=cumulative_us / 1000,
+        budget_ms=budget_ms,
+        eager_heavy_modules=json.loads(result.stdout.strip().splitlines()[-1]),
+    )
+
+
+def check_budgets(budgets: Dict[str, float], scale: float = 1.0, repeat: int = 3) -> List[ImportMeasurement]:
+    """Measure every entry point, keeping the fastest of ``repeat`` runs to reduce noise"""
+    measurements = []
+    for module, budget_ms in budgets.items():
+        runs = [measure_import(module, budget_ms * scale) for _ in range(repeat)]
+        measurements.append(min(runs, key=lambda m: m.cumulative_ms if m.error is None else float("inf")))
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforce the import-time budget for entry points.")
+    parser.add_argument("modules", nargs="*", help="Only check these modules (default: all budgeted)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI machines)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is kept")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+    budgets = {m: IMPORT_BUDGETS_MS.get(m, 100) for m in args.modules} if args.modules else IMPORT_BUDGETS_MS
+
+    measurements = check_budgets(budgets, scale=args.scale, repeat=args.repeat)
+
+    if args.json:
+        print(json.dumps([dict(asdict(m), ok=m.ok) for m in measurements], indent=2))
+    else:
+        for m in measurements:
+            status = "ok" if m.ok else "OVER"
+            detail = m.error or f"{m.cumulative_ms:8.1f} ms / {m.budget_ms:.0f} ms"
+            if m.eager_heavy_modules:
+                detail += f"  eager: {', '.join(m.eager_heavy_modules)}"
+            print(f"[{status:>4}] {m.module:<45} {detail}")
+
+    sys.exit(0 if all(m.ok for m in measurements) else 1)
+
+
+if __name__ == "__main__":
+    main()
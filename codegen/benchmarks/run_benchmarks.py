@@ -0,0 +1,245 @@
+"""Benchmark suite for the profiling and prompt-building hot paths.
+
+Each case is timed (best of ``--repeat`` runs) and its peak traced memory is
+measured in a separate run, so tracemalloc overhead does not skew the timings.
+Results are written as JSON and compared against a stored baseline; the command
+exits non-zero when a case regresses beyond the tolerance.
+
+Run from the repository root:
+
+    python -m codegen.benchmarks.run_benchmarks --tier smoke
+    python -m codegen.benchmarks.run_benchmarks --tier default --save-baseline
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .datasets import make_profile_dict, make_raw_profile_dict, write_dataset
+
+CODEGEN_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (rows, cols, dtype mix) per tier; larger tiers include the smaller ones
+TIERS: Dict[str, List[Tuple[int, int, str]]] = {
+    "smoke": [
+        (1_000, 5, "mixed"),
+        (10_000, 20, "mixed"),
+    ],
+    "default": [
+        (100_000, 50, "mixed"),
+        (1_000_000, 10, "numeric"),
+        (50_000, 200, "categorical"),
+        (10_000, 1_000, "mixed"),
+    ],
+    "full": [
+        (10_000_000, 20, "mixed"),
+        (50_000_000, 5, "numeric"),
+        (100_000, 5_000, "wide_text"),
+    ],
+}
+TIER_ORDER = ["smoke", "default", "full"]
+
+# ydata profiling is far slower than everything else; keep it to moderate shapes
+PROFILE_MAX_CELLS = 2_000_000
+PROFILE_MAX_COLS = 200
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory for one case on one dataset shape"""
+    case: str
+    dataset: str
+    seconds: float
+    peak_mb: float
+    repeats: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}[{self.dataset}]"
+
+
+@dataclass
+class Regression:
+    """A case that got slower or heavier than its baseline"""
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def dataset_id(rows: int, cols: int, dtype_mix: str) -> str:
+    return f"{rows}x{cols}-{dtype_mix}"
+
+
+def specs_for_tier(tier: str) -> List[Tuple[int, int, str]]:
+    """Dataset shapes for a tier, including every smaller tier"""
+    specs = []
+    for name in TIER_ORDER[: TIER_ORDER.index(tier) + 1]:
+        specs.extend(TIERS[name])
+    return specs
+
+
+def _ensure_app_importable() -> None:
+    # The app modules import each other as ``app.*`` with codegen/ on the path
+    if str(CODEGEN_DIR) not in sys.path:
+        sys.path.insert(0, str(CODEGEN_DIR))
+
+
+def build_cases(workdir: Path, rows: int, cols: int, dtype_mix: str) -> Dict[str, Callable[[], Any]]:
+    """Create the zero-argument callables to benchmark for one dataset shape"""
+    from codegen.agents.base_eda import DataProfiler, clean_profile_data
+    from codegen.agents.data_exploration_agent import DataExplorationAgent
+
+    _ensure_app_importable()
+    from app.context_manager import ContextManager
+    from app.summary_agent_prompt_template import format_dataset_profile
+
+    csv_path = write_dataset(workdir / f"{dataset_id(rows, cols, dtype_mix)}.csv", rows, cols, dtype_mix)
+    profiler = DataProfiler(upload_dir=str(workdir / "profiles"))
+    explorer = DataExplorationAgent()
+    profile = make_profile_dict(rows, cols, dtype_mix)
+    context_path = workdir / "session_context.json"
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "load_data": lambda: profiler.load_data(str(csv_path)),
+        "clean_profile_data": lambda: clean_profile_data(make_raw_profile_dict(rows, cols, dtype_mix)),
+        "explore": lambda: explorer.explore(str(csv_path)),
+        "format_dataset_profile": lambda: format_dataset_profile(profile),
+        "context_manager.save": lambda: ContextManager(str(context_path)).update_dataset_profile(profile),
+        "context_manager.load": lambda: ContextManager(str(context_path)).get_dataset_profile(),
+    }
+
+    if rows * cols <= PROFILE_MAX_CELLS and cols <= PROFILE_MAX_COLS:
+        df = profiler.load_data(str(csv_path))
+        cases["generate_profile"] = lambda: profiler.generate_profile(df, csv_path.stem)
+
+    return cases
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    """Return (best wall time in seconds, peak traced memory in MB)"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak / (1024 * 1024)
+
+
+def run_suite(tier: str = "smoke", repeat: int = 3, only: Optional[List[str]] = None) -> List[BenchmarkResult]:
+    """Run every case for every dataset shape in the tier"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="yudai-bench-") as tmp:
+        for rows, cols, dtype_mix in specs_for_tier(tier):
+            name = dataset_id(rows, cols, dtype_mix)
+            cases = build_cases(Path(tmp), rows, cols, dtype_mix)
+            # The context file must exist before it can be loaded
+            cases["context_manager.save"]()
+            for case, func in cases.items():
+                if only and case not in only:
+                    continue
+                # Each ydata run takes seconds; a single timed run is enough
+                runs = 1 if case == "generate_profile" else repeat
+                seconds, peak_mb = measure(func, runs)
+                result = BenchmarkResult(case=case, dataset=name, seconds=seconds, peak_mb=peak_mb, repeats=runs)
+                print(f"{result.key:<60} {seconds * 1000:10.1f} ms {peak_mb:10.1f} MB")
+                results.append(result)
+    return results
+
+
+def compare(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+            time_tolerance: float = 0.25, memory_tolerance: float = 0.25,
+            min_seconds: float = 0.01, min_mb: float = 1.0) -> List[Regression]:
+    """Flag cases whose time or memory grew beyond the tolerance over the baseline.
+
+    Differences below ``min_seconds``/``min_mb`` are treated as noise.
+    """
+    base = {f"{r['case']}[{r['dataset']}]": r for r in baseline}
+    regressions = []
+    for result in current:
+        key = f"{result['case']}[{result['dataset']}]"
+        previous = base.get(key)
+        if previous is None:
+            continue
+        for metric, tolerance, floor in (("seconds", time_tolerance, min_seconds),
+                                         ("peak_mb", memory_tolerance, min_mb)):
+            before, after = previous[metric], result[metric]
+            if after - before > floor and after > before * (1 + tolerance):
+                regressions.append(Regression(key=key, metric=metric, baseline=before, current=after))
+    return regressions
+
+
+def write_results(path: Path, tier: str, results: List[BenchmarkResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "tier": tier,
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": [asdict(r) for r in results],
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the profiling and prompt-building hot paths.")
+    parser.add_argument("--tier", choices=TIER_ORDER, default="smoke", help="Dataset sizes to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the fastest is kept")
+    parser.add_argument("--case", action="append", help="Only run this case (repeatable)")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "latest.json"), help="Where to write results")
+    parser.add_argument("--baseline", default=str(RESULTS_DIR / "baseline.json"), help="Baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store these results as the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed relative memory growth")
+
+    args = parser.parse_args()
+
+    results = run_suite(tier=args.tier, repeat=args.repeat, only=args.case)
+    write_results(Path(args.output), args.tier, results)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        write_results(baseline_path, args.tier, results)
+        print(f"Baseline saved to: {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare([asdict(r) for r in results], baseline,
+                          time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r.key} {r.metric}: {r.baseline:.4f} -> {r.current:.4f} ({r.ratio:.2f}x)")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
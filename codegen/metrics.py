@@ -0,0 +1,382 @@
+"""Pipeline instrumentation with Prometheus text exposition.
+
+Stages (load, profile, clean, write, LLM calls, dbt steps) are timed with the
+``stage`` context manager, which records a latency histogram, the stage's peak
+RSS and a failure counter:
+
+    from codegen.metrics import stage
+
+    with stage("load"):
+        df = pd.read_csv(path)
+
+The peak is sampled from /proc by a background thread that only runs while some
+stage is active, so memory freed before the stage ends still counts.
+
+Set ``YUDAI_METRICS=0`` to switch to a no-op mode where ``stage`` returns a
+shared null context and every ``observe``/``inc`` call returns immediately.
+"""
+import glob
+import itertools
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers sub-millisecond prompt formatting up to multi-minute dbt runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# For converting /proc/self/statm pages to bytes
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+_MAXRSS_SCALE = 1 if sys.platform == "darwin" else 1024
+# Seconds between RSS samples while a stage is running
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def merge(self, values: Dict[LabelKey, float]) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; ``set_max`` keeps the high-water mark"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def set_max(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = max(self._values.get(key, value), value)
+
+    def value(self, **labels: str) -> Optional[float]:
+        return self._values.get(_label_key(labels))
+
+    def merge(self, values: Dict[LabelKey, float]) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = max(self._values.get(key, value), value)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram in the Prometheus style"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [per-bucket counts..., sum, count]
+        self._values: Dict[LabelKey, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(_label_key(labels))
+        return state[-1] if state else 0
+
+    def sum(self, **labels: str) -> float:
+        state = self._values.get(_label_key(labels))
+        return state[-2] if state else 0.0
+
+    def merge(self, values: Dict[LabelKey, List[float]]) -> None:
+        with self._lock:
+            for key, incoming in values.items():
+                state = self._values.get(key)
+                if state is None:
+                    self._values[key] = list(incoming)
+                else:
+                    self._values[key] = [a + b for a, b in zip(state, incoming)]
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, state in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {state[-1]}")
+        return lines
+
+
+def _statm_rss(pid: str) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def current_rss_bytes(include_children: bool = False) -> Optional[int]:
+    """Resident set size of this process right now (plus its running child processes),
+    or None where /proc isn't available"""
+    rss = _statm_rss("self")
+    if rss is None or not include_children:
+        return rss
+    for path in glob.glob("/proc/self/task/*/children"):
+        try:
+            with open(path) as f:
+                pids = f.read().split()
+        except OSError:
+            continue
+        rss += sum(_statm_rss(pid) or 0 for pid in pids)
+    return rss
+
+
+class _RssSampler:
+    """Tracks the peak RSS of every running stage, sampling on a thread while any is active"""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._tokens = itertools.count()
+        # token -> [include_children, peak so far]
+        self._active: Dict[int, List] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, include_children: bool) -> Optional[int]:
+        rss = current_rss_bytes(include_children)
+        if rss is None:
+            return None
+        with self._lock:
+            token = next(self._tokens)
+            self._active[token] = [include_children, rss]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+        return token
+
+    def stop(self, token: Optional[int]) -> Optional[int]:
+        """The stage's peak RSS"""
+        if token is None:
+            return None
+        with self._lock:
+            include_children, peak = self._active.pop(token)
+        return max(peak, current_rss_bytes(include_children) or 0)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    # Cleared under the lock, so the next start() spawns a new thread
+                    self._thread = None
+                    return
+                wants_children = any(include for include, _ in self._active.values())
+            own = current_rss_bytes() or 0
+            with_children = (current_rss_bytes(include_children=True) or 0) if wants_children else own
+            with self._lock:
+                for entry in self._active.values():
+                    entry[1] = max(entry[1], with_children if entry[0] else own)
+
+
+def peak_rss_bytes(include_children: bool = False) -> int:
+    """Peak resident set size of this process (and optionally its waited-for children)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if include_children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * _MAXRSS_SCALE
+
+
+class MetricsRegistry:
+    """Holds every metric and the pipeline-level helpers built on top of them"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+        self.stage_duration = self.histogram(
+            "yudai_stage_duration_seconds", "Wall-clock time spent in a pipeline stage")
+        self.stage_peak_rss = self.gauge(
+            "yudai_stage_peak_rss_bytes", "Highest RSS sampled while a pipeline stage ran (children included for dbt)")
+        self._rss_sampler = _RssSampler()
+        self.stage_failures = self.counter(
+            "yudai_stage_failures_total", "Pipeline stages that raised an exception")
+        self.llm_duration = self.histogram(
+            "yudai_llm_request_duration_seconds", "Total latency of an LLM chat completion")
+        self.llm_ttft = self.histogram(
+            "yudai_llm_time_to_first_token_seconds", "Time until the first streamed LLM token arrived")
+        self.llm_tokens = self.counter(
+            "yudai_llm_tokens_total", "Tokens consumed by LLM calls")
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._metrics.get(name) or self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._metrics.get(name) or self._register(Gauge(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.get(name) or self._register(Histogram(name, help_text, buckets))
+
+    def stage(self, name: str, include_children: bool = False):
+        """Context manager timing a pipeline stage; a shared null context when disabled"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed_stage(name, include_children)
+
+    @contextmanager
+    def _timed_stage(self, name: str, include_children: bool) -> Iterator[None]:
+        sampling = self._rss_sampler.start(include_children)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.stage_failures.inc(stage=name)
+            raise
+        finally:
+            self.stage_duration.observe(time.perf_counter() - start, stage=name)
+            peak = self._rss_sampler.stop(sampling)
+            if peak is not None:
+                self.stage_peak_rss.set_max(peak, stage=name)
+
+    def observe_llm_call(self, agent: str, model: str, duration: float, ttft: Optional[float],
+                         prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        """Record latency, time to first token and token usage of one LLM call"""
+        if not self.enabled:
+            return
+        self.llm_duration.observe(duration, agent=agent, model=model)
+        if ttft is not None:
+            self.llm_ttft.observe(ttft, agent=agent, model=model)
+        if prompt_tokens:
+            self.llm_tokens.inc(prompt_tokens, agent=agent, model=model, kind="prompt")
+        if completion_tokens:
+            self.llm_tokens.inc(completion_tokens, agent=agent, model=model, kind="completion")
+
+    def export_state(self) -> Dict[str, Dict[LabelKey, object]]:
+        """Picklable copy of every metric's values, e.g. to ship from a worker process"""
+        return {name: dict(metric._values) for name, metric in self._metrics.items() if metric._values}
+
+    def merge_state(self, state: Dict[str, Dict[LabelKey, object]]) -> None:
+        """Fold values exported by another registry into this one"""
+        if not self.enabled:
+            return
+        for name, values in state.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_NULL_STAGE = nullcontext()
+
+
+def _enabled_from_env() -> bool:
+    return os.getenv("YUDAI_METRICS", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+# Process-wide registry used by the pipeline and the /metrics endpoint
+registry = MetricsRegistry(enabled=_enabled_from_env())
+
+
+def stage(name: str, include_children: bool = False):
+    """Time a pipeline stage on the process-wide registry"""
+    return registry.stage(name, include_children=include_children)
+
+
+def observe_llm_call(agent: str, model: str, duration: float, ttft: Optional[float],
+                     prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Record one LLM call on the process-wide registry"""
+    registry.observe_llm_call(agent, model, duration, ttft, prompt_tokens, completion_tokens)
+
+
+def render_prometheus() -> str:
+    """Render the process-wide registry for a /metrics endpoint"""
+    return registry.render_prometheus()
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The app modules import each other as ``app.*`` with codegen/ on the path
+CODEGEN_DIR = Path(__file__).resolve().parents[1]
+if str(CODEGEN_DIR) not in sys.path:
+    sys.path.insert(0, str(CODEGEN_DIR))
@@ -0,0 +1,25 @@
+from codegen.benchmarks.datasets import column_kinds, make_dataset
+from codegen.benchmarks.run_benchmarks import compare
+
+
+def test_make_dataset_follows_dtype_mix():
+    df = make_dataset(200, 10, 'mixed', seed=1)
+    assert df.shape == (200, 10)
+    assert column_kinds(5, 'mixed') == ['float', 'int', 'category', 'datetime', 'text']
+    assert str(df['datetime_3'].dtype).startswith('datetime64')
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = [
+        {'case': 'explore', 'dataset': 'd', 'seconds': 1.0, 'peak_mb': 100.0},
+        {'case': 'format_dataset_profile', 'dataset': 'd', 'seconds': 0.001, 'peak_mb': 0.1},
+    ]
+    current = [
+        {'case': 'explore', 'dataset': 'd', 'seconds': 1.5, 'peak_mb': 101.0},
+        # 3x slower but below the noise floor
+        {'case': 'format_dataset_profile', 'dataset': 'd', 'seconds': 0.003, 'peak_mb': 0.1},
+    ]
+
+    regressions = compare(current, baseline)
+
+    assert [(r.key, r.metric) for r in regressions] == [('explore[d]', 'seconds')]
@@ -0,0 +1,102 @@
+import json
+import numpy as np
+import pandas as pd
+
+from app.chart_data import OTHER_LABEL, ChartSpec, build_chart_data, lttb
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(10_000)
+    y = np.sin(x / 500.0)
+    y[4321] = 50.0
+
+    keep = lttb(x, y, 200)
+
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4321 in keep
+
+
+def test_line_chart_is_aggregated_and_bounded():
+    df = pd.DataFrame({
+        'day': np.repeat(pd.date_range('2020-01-01', periods=5_000), 3),
+        'sales': np.ones(15_000),
+    })
+
+    option = build_chart_data(df, ChartSpec(type='line', x='day', y='sales', max_points=500))
+
+    assert option['xAxis']['type'] == 'time'
+    data = option['series'][0]['data']
+    assert len(data) == 500
+    assert data[0] == ['2020-01-01T00:00:00', 3.0]
+
+
+def test_bar_chart_folds_tail_into_other():
+    df = pd.DataFrame({'city': [f'c{i}' for i in range(50) for _ in range(i + 1)]})
+    df['sales'] = 1.0
+
+    option = build_chart_data(df, ChartSpec(type='bar', x='city', y='sales', top_n=5))
+
+    assert option['xAxis']['data'] == ['c49', 'c48', 'c47', 'c46', 'c45', OTHER_LABEL]
+    values = option['series'][0]['data']
+    assert sum(values) == len(df)
+
+
+def test_histogram_is_binned_server_side():
+    df = pd.DataFrame({'amount': np.random.default_rng(0).normal(size=100_000)})
+
+    option = build_chart_data(df, ChartSpec(type='histogram', x='amount', bins=20))
+
+    assert len(option['xAxis']['data']) == 20
+    assert sum(option['series'][0]['data']) == len(df)
+
+
+def test_line_chart_drops_missing_values_and_stays_json():
+    df = pd.DataFrame({'x': range(10), 'y': [1.0, np.nan] * 5, 'g': ['a'] * 5 + ['b'] * 5})
+    df.loc[df['g'] == 'b', 'y'] = np.nan
+
+    raw = build_chart_data(df, ChartSpec(type='line', x='x', y='y'))
+    grouped = build_chart_data(df, ChartSpec(type='line', x='x', y='y', group='g', agg='mean'))
+
+    json.dumps(raw, allow_nan=False)
+    json.dumps(grouped, allow_nan=False)
+    assert [p[0] for p in raw['series'][0]['data']] == [0, 2, 4]
+    assert [s['name'] for s in grouped['series']] == ['a']
+
+
+def test_line_chart_with_text_x_uses_a_category_axis():
+    df = pd.DataFrame({'x': [f'item {i:05d}' for i in range(5_000)], 'y': np.arange(5_000.0)})
+
+    result = build_chart_data(df, ChartSpec(type='line', x='x', y='y', max_points=100))
+
+    assert result['xAxis']['type'] == 'category'
+    assert len(result['series'][0]['data']) == 100
+
+
+def test_bar_and_pie_drop_categories_without_values():
+    df = pd.DataFrame({'city': ['a', 'a', 'b', 'c', 'c'], 'sales': [1.0, 3.0, 2.0, np.nan, np.nan]})
+
+    bar_mean = build_chart_data(df, ChartSpec(type='bar', x='city', y='sales', agg='mean'))
+    pie_mean = build_chart_data(df, ChartSpec(type='pie', x='city', y='sales', agg='mean'))
+    bar_max = build_chart_data(df, ChartSpec(type='bar', x='city', y='sales', agg='max', top_n=1))
+    grouped = build_chart_data(df.assign(g=['x', 'y'] * 2 + ['x']),
+                               ChartSpec(type='bar', x='city', y='sales', group='g', agg='mean'))
+
+    for option in (bar_mean, pie_mean, bar_max, grouped):
+        json.dumps(option, allow_nan=False)
+    assert bar_mean['xAxis']['data'] == ['a', 'b']
+    assert [p['name'] for p in pie_mean['series'][0]['data']] == ['a', 'b']
+    # c has no values, so "Other" is just b
+    assert bar_max['xAxis']['data'] == ['a', OTHER_LABEL]
+    assert bar_max['series'][0]['data'] == [3.0, 2.0]
+
+
+def test_scatter_with_datetime_x_uses_a_time_axis():
+    df = pd.DataFrame({'day': pd.date_range('2024-01-01', periods=3), 'sales': [1.0, np.inf, 3.0]})
+
+    option = build_chart_data(df, ChartSpec(type='scatter', x='day', y='sales'))
+
+    json.dumps(option, allow_nan=False)
+    assert option['xAxis']['type'] == 'time'
+    assert option['series'][0]['data'] == [['2024-01-01T00:00:00', 1.0], ['2024-01-03T00:00:00', 3.0]]
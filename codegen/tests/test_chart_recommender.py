@@ -0,0 +1,66 @@
+from app.chart_recommender import classify_variables, recommend_charts, requirements_need_llm
+from app.models import DatasetProfile
+from app.summary_agent_prompt_template import generate_dashboard_config
+from codegen.benchmarks.datasets import make_profile_dict
+
+
+def _profile():
+    profile = make_profile_dict(1_000, 6, 'mixed')
+    profile['variables']['category_2']['n_distinct'] = 4
+    return profile
+
+
+def test_simple_profile_gets_four_complementary_charts():
+    result = recommend_charts(_profile(), 'Show me sales trends')
+
+    assert result['source'] == 'rules'
+    assert result['confidence'] >= 0.7
+    charts = result['charts']
+    assert len(charts) == 4
+    assert len({c['type'] for c in charts}) == 4
+    assert charts[0]['spec'] == {'type': 'line', 'x': 'datetime_3', 'y': 'float_0', 'agg': 'sum'}
+    # Unique text columns are never used as chart axes
+    assert all('text_4' not in c['spec'].values() for c in charts)
+
+
+def test_llm_runs_only_when_rules_are_not_confident():
+    prompts = []
+
+    def llm(prompt):
+        prompts.append(prompt)
+        return '```json\n{"charts": [{"id": "forecast", "spec": {"type": "line", "x": "datetime_3"}}]}\n```'
+
+    assert generate_dashboard_config(_profile(), 'Show totals by category', llm=llm)['source'] == 'rules'
+    assert prompts == []
+
+    result = generate_dashboard_config(_profile(), 'Forecast next quarter', llm=llm)
+    assert result['source'] == 'llm'
+    assert result['charts'] == [{'id': 'forecast', 'spec': {'type': 'line', 'x': 'datetime_3'}}]
+    assert len(prompts) == 1
+
+
+def test_malformed_llm_configs_fall_back_to_the_rules():
+    responses = ['[{"id": "chart_1"}]', '{"charts": [{"id": "chart_1"}]}',
+                 '{"charts": [{"id": "chart_1", "spec": {"type": "bar", "x": "no_such_column"}}]}',
+                 '{"charts": [{"id": "chart_1", "spec": {"type": "radar", "x": "a"}}]}', 'not json']
+    for response in responses:
+        result = generate_dashboard_config(_profile(), 'Forecast next quarter', llm=lambda prompt: response)
+        assert result['source'] == 'rules', response
+
+
+def test_all_distinct_measures_are_not_ids():
+    profile = make_profile_dict(1_000, 2, 'numeric')
+    price, order_no = list(profile['variables'].values())
+    price.update({'is_unique': True, 'n_distinct': 1_000, 'min': 0.5, 'max': 99.75})
+    order_no.update({'is_unique': True, 'n_distinct': 1_000, 'min': 1, 'max': 1_000})
+    profile['variables'] = {'price': price, 'order_no': order_no}
+
+    measures = [name for name, _ in classify_variables(DatasetProfile(**profile))['measure']]
+
+    assert measures == ['price']
+
+
+def test_llm_keywords_match_whole_words():
+    assert requirements_need_llm('Forecasting next quarter') and requirements_need_llm('Flag anomalies')
+    assert not requirements_need_llm('Show the mapping of products to regions')
+    assert not requirements_need_llm('Sales by geography')
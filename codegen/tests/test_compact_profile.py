@@ -0,0 +1,113 @@
+import json
+import tracemalloc
+
+import numpy as np
+
+from app.chart_recommender import recommend_charts
+from app.compact_profile import CompactProfile
+from app.context_manager import ContextManager
+from app.dashboard_cache import profile_hash
+from app.models import DatasetProfile
+from codegen.benchmarks.datasets import make_profile_dict
+
+
+def _profile(cols=6):
+    profile = make_profile_dict(1_000, cols, 'mixed')
+    numeric = next(name for name, v in profile['variables'].items() if v['type'] == 'Numeric')
+    profile['variables'][numeric].update({'min': 3, 'max': 7.5, 'mean': 5.1, '5%': 3.2, '95%': 7.1})
+    dates = next(name for name, v in profile['variables'].items() if v['type'] == 'DateTime')
+    profile['variables'][dates].update({'min': '2024-01-01 00:00:00', 'max': '2024-03-01 00:00:00'})
+    return profile, numeric, dates
+
+
+def test_views_read_like_variables():
+    data, numeric, dates = _profile()
+    profile, compact = DatasetProfile(**data), CompactProfile.from_dict(data)
+
+    assert list(compact.variables) == list(profile.variables)
+    for name, variable in profile.variables.items():
+        view = compact.variables[name]
+        for field in type(variable).model_fields:
+            assert getattr(view, field) == getattr(variable, field), (name, field)
+    assert compact.variables[numeric].p5 == 3.2 and compact.variables[numeric].n_distinct == 500
+    assert compact.variables[dates].max == '2024-03-01 00:00:00'
+    assert compact.model_dump(by_alias=True) == profile.model_dump(by_alias=True)
+    assert compact.to_profile() == profile
+
+
+def test_compact_profile_works_where_models_do():
+    data, _, _ = _profile()
+    compact = CompactProfile.from_dict(data)
+
+    assert profile_hash(compact) == profile_hash(DatasetProfile(**data))
+    assert recommend_charts(compact, 'Show me sales trends') == recommend_charts(data, 'Show me sales trends')
+
+
+def test_saved_profile_loads_memory_mapped(tmp_path):
+    data, numeric, _ = _profile()
+    compact = CompactProfile.from_dict(data)
+
+    loaded = CompactProfile.load(compact.save(tmp_path / 'profile'))
+
+    assert isinstance(loaded.arrays['n_distinct'], np.memmap)
+    assert loaded.variables[numeric].max == 7.5
+    assert loaded.model_dump() == compact.model_dump()
+
+
+def test_wide_profile_is_an_order_of_magnitude_smaller():
+    data, _, _ = _profile(2_000)
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        profile = DatasetProfile(**data)
+        validated = tracemalloc.get_traced_memory()[0] - start
+        compact = CompactProfile.from_dict(data)
+        columnar = tracemalloc.get_traced_memory()[0] - start - validated
+    finally:
+        tracemalloc.stop()
+
+    assert len(profile.variables) == len(compact.variables) == 2_000
+    assert validated / columnar >= 8
+
+
+def test_session_keeps_the_profile_compact(tmp_path):
+    data, numeric, _ = _profile()
+    path = tmp_path / 'session_context.json'
+    ContextManager(str(path)).update_dataset_profile(data)
+
+    with open(path) as f:
+        assert json.load(f)['dataset_profile'] is None
+    profile = ContextManager(str(path)).get_dataset_profile()
+    assert isinstance(profile, CompactProfile)
+    assert profile.variables[numeric].max == 7.5
+
+
+def test_older_sessions_are_converted_on_load(tmp_path):
+    data, numeric, _ = _profile()
+    path = tmp_path / 'session_context.json'
+    now = '2024-01-01T00:00:00'
+    path.write_text(json.dumps({'session_info': {'created_at': now, 'last_updated': now},
+                                'dataset_profile': data, 'user_inputs': []}))
+
+    context = ContextManager(str(path))
+    context.add_transformation('Dropped duplicates')
+
+    profile = ContextManager(str(path)).get_dataset_profile()
+    assert profile.model_dump() == CompactProfile.from_dict(data).model_dump() | {
+        'transformations': [t.model_dump() for t in profile.transformations]}
+    assert profile.transformations[0].description == 'Dropped duplicates'
+
+
+def test_dashboard_path_never_validates_a_full_profile(monkeypatch):
+    from app.dashboard_cache import DashboardCache
+
+    data, _, _ = _profile()
+
+    def no_validation(self, **kwargs):
+        raise AssertionError('built a DatasetProfile')
+
+    monkeypatch.setattr(DatasetProfile, '__init__', no_validation)
+    artifact, _ = DashboardCache().get_or_build(data, 'Show trends', lambda: (recommend_charts(data), {}))
+
+    assert artifact.config['source'] == 'rules'
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from codegen.agents.correlations import compute_correlations
+
+
+def _frame(n=2_000):
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=n)
+    df = pd.DataFrame({
+        'a': a,
+        'b': 2 * a + rng.normal(scale=0.5, size=n),
+        'c': rng.normal(size=n),
+        'd': np.exp(a),
+        'constant': 1.0,
+    })
+    df.loc[::7, 'b'] = np.nan
+    df['city'] = rng.choice(['x', 'y', 'z'], n)
+    df['region'] = np.where(rng.random(n) < 0.8, df['city'], 'w')
+    return df
+
+
+def test_blocked_correlations_match_pandas():
+    df = _frame()
+    # Block size 2 forces several block pairs, including off-diagonal ones
+    section = compute_correlations(df, block_size=2, workers=1)
+
+    expected = df[['a', 'b', 'c', 'd']].corr()
+    pairs = {(p['a'], p['b']): p['value'] for p in section['pearson']['top_pairs']}
+    assert np.isclose(pairs[('a', 'b')], expected.loc['a', 'b'], atol=1e-3)
+    assert np.isclose(pairs[('a', 'd')], expected.loc['a', 'd'], atol=1e-3)
+
+    # exp() is monotonic, so the rank correlation is perfect
+    assert section['spearman']['top_pairs'][0] == {'a': 'a', 'b': 'd', 'value': 1.0}
+    assert 'constant' not in section['pearson']['per_column']
+
+    cramers = section['cramers']['top_pairs']
+    assert [(p['a'], p['b']) for p in cramers] == [('city', 'region')]
+    assert 0.85 < cramers[0]['value'] < 0.95
+
+
+def test_top_k_and_sampling_bound_the_output():
+    rng = np.random.default_rng(1)
+    base = rng.normal(size=(500, 1))
+    df = pd.DataFrame(base + rng.normal(scale=0.3, size=(500, 30)), columns=[f'c{i}' for i in range(30)])
+
+    section = compute_correlations(df, top_k=3, global_top_k=10, sample_rows=200, block_size=8, workers=1)
+
+    assert section['sampled'] and section['n_rows_used'] == 200
+    assert len(section['pearson']['top_pairs']) == 10
+    assert all(len(partners) == 3 for partners in section['pearson']['per_column'].values())
+    assert section['cramers'] is None
+
+
+def test_small_frames_are_correlated_inline(monkeypatch):
+    import codegen.agents.correlations as correlations
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError('a process pool was started')
+
+    monkeypatch.setattr(correlations, 'ProcessPoolExecutor', no_pool)
+
+    section = compute_correlations(_frame(), workers=8)
+
+    assert section['pearson']['top_pairs']
@@ -0,0 +1,47 @@
+from app.context_manager import ContextManager
+from app.dashboard_cache import DashboardArtifact, DashboardCache, dashboard_key
+from codegen.benchmarks.datasets import make_profile_dict
+
+
+def test_same_profile_and_requirements_are_built_once():
+    cache = DashboardCache()
+    profile = make_profile_dict(100, 4, 'mixed')
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {'charts': [{'id': 'chart_1'}]}, {'chart_1': {'series': []}}
+
+    first, hit = cache.get_or_build(profile, 'Show sales trends', build)
+    assert not hit
+    second, hit = cache.get_or_build(profile, '  show SALES   trends. ', build)
+    assert hit and second is first
+    assert len(builds) == 1
+
+    profile['table']['n'] += 1
+    assert dashboard_key(profile, 'Show sales trends') != first.key
+
+
+def test_eviction_is_bounded_by_size():
+    cache = DashboardCache(max_bytes=2_000)
+    for i in range(5):
+        cache.put(DashboardArtifact(key=f'k{i}', dataset='d', config={'pad': 'x' * 500}))
+
+    assert cache.total_bytes <= 2_000
+    assert cache.get('k0') is None
+    assert cache.get('k4') is not None
+
+
+def test_transformations_invalidate_the_dataset(tmp_path):
+    profile = make_profile_dict(100, 4, 'mixed')
+    context = ContextManager(str(tmp_path / 'session_context.json'))
+    context.update_dataset_profile(profile)
+    cache = DashboardCache()
+    cache.attach(context)
+    artifact, _ = cache.get_or_build(profile, 'anything', lambda: ({}, {}))
+
+    transformation = context.add_transformation('Dropped rows with missing prices')
+
+    assert transformation.version == 'v1.0'
+    assert cache.get(artifact.key) is None
+    assert context.get_dataset_profile().transformations[0].description == 'Dropped rows with missing prices'
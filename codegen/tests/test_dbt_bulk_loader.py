@@ -0,0 +1,45 @@
+import duckdb
+import pandas as pd
+import yaml
+
+from dbt_bulk_loader import SOURCES_FILE, load_uploads, warehouse_path
+
+
+def test_loads_uploads_and_skips_unchanged_files(tmp_path):
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    pd.DataFrame({"id": range(1000), "amount": [1.5] * 1000}).to_csv(uploads / "Sales 2024.csv", index=False)
+    (uploads / "Sales 2024_profile.json").write_text("{}")
+    database = str(tmp_path / "warehouse.duckdb")
+
+    first = load_uploads(str(uploads), project_dir=str(tmp_path), database=database)
+    second = load_uploads(str(uploads), project_dir=str(tmp_path), database=database)
+
+    assert [(r.table, r.rows, r.skipped) for r in first] == [("sales_2024", 1000, False)]
+    assert [r.skipped for r in second] == [True]
+    with duckdb.connect(database) as con:
+        assert con.execute("SELECT sum(amount) FROM uploads.sales_2024").fetchone()[0] == 1500
+
+    sources = yaml.safe_load((tmp_path / SOURCES_FILE).read_text())["sources"][0]
+    assert sources["name"] == "uploads"
+    assert [t["name"] for t in sources["tables"]] == ["sales_2024"]
+
+    # Changed content is reloaded
+    pd.DataFrame({"id": [1], "amount": [2.0]}).to_csv(uploads / "Sales 2024.csv", index=False)
+    third = load_uploads(str(uploads), project_dir=str(tmp_path), database=database)
+    assert [(r.rows, r.skipped) for r in third] == [(1, False)]
+
+
+def test_warehouse_path_follows_the_dbt_profile(tmp_path, monkeypatch):
+    (tmp_path / "dbt_project.yml").write_text("name: p\nprofile: p\n")
+    profiles = tmp_path / "profiles"
+    profiles.mkdir()
+    (profiles / "profiles.yml").write_text(
+        "p:\n  target: dev\n  outputs:\n    dev:\n      type: duckdb\n"
+        "      path: '{{ env_var(\"DBT_DUCKDB_PATH\", \"data/warehouse.duckdb\") }}'\n")
+    monkeypatch.delenv("DBT_DUCKDB_PATH", raising=False)
+
+    assert warehouse_path(tmp_path, profiles) == tmp_path / "data" / "warehouse.duckdb"
+
+    monkeypatch.setenv("DBT_DUCKDB_PATH", str(tmp_path / "other.duckdb"))
+    assert warehouse_path(tmp_path, profiles) == tmp_path / "other.duckdb"
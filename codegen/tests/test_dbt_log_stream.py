@@ -0,0 +1,76 @@
+import json
+import threading
+
+from dbt_log_stream import CommandOutput, EventStream, OutputBuffer, sse_format
+
+
+def _log(name, msg, level="info", **data):
+    return json.dumps({"info": {"name": name, "msg": msg, "level": level}, "data": data})
+
+
+def test_output_buffer_spills_old_lines_to_file(tmp_path):
+    buffer = OutputBuffer(max_lines=3, spill_dir=str(tmp_path))
+    for i in range(10):
+        buffer.append(f"line {i}")
+    buffer.close()
+
+    assert list(buffer.lines) == ["line 7", "line 8", "line 9"]
+    with open(buffer.spill_path) as f:
+        assert f.read().splitlines() == [f"line {i}" for i in range(7)]
+    assert buffer.text().startswith("[7 earlier lines")
+
+
+def test_old_spill_files_are_pruned(tmp_path):
+    for i in range(4):
+        buffer = OutputBuffer(max_lines=1, spill_dir=str(tmp_path / "spill"), keep_spills=2)
+        buffer.append("first")
+        buffer.append("second")
+        buffer.close()
+
+    assert len(list((tmp_path / "spill").iterdir())) == 2
+    assert (tmp_path / "spill" / buffer.spill_path.rsplit("/", 1)[1]).exists()
+
+
+def test_ls_results_are_kept_beyond_the_output_buffer(tmp_path):
+    output = CommandOutput("ls", max_lines=10, spill_dir=str(tmp_path))
+    for i in range(50):
+        output.line(_log("ListCmdOut", json.dumps({"unique_id": f"model.p.m{i}"})))
+    stdout, _ = output.close()
+
+    assert len(output.listed) == 50
+    assert json.loads(output.listed[0])["unique_id"] == "model.p.m0"
+    assert "model.p.m0" not in stdout
+
+
+def test_json_logs_become_progress_events():
+    events = EventStream()
+    output = CommandOutput("run", events)
+    node = {"unique_id": "model.p.orders", "node_name": "orders", "node_status": "started"}
+    output.line(_log("NodeStart", "Began running node model.p.orders", node_info=node))
+    output.line("plain text line\n")
+    output.line(_log("NodeFinished", "Finished running node model.p.orders", node_info=node,
+                     run_result={"status": "success", "execution_time": 1.25}))
+    output.line(_log("RunResultError", "Database Error in model users", level="error"))
+    stdout, stderr = output.close()
+
+    types = [event["type"] for _, event in events.read()]
+    assert types == ["node_started", "node_finished", "error"]
+    finished = events.read()[1][1]
+    assert finished["status"] == "success" and finished["execution_time"] == 1.25
+    assert "plain text line" in stdout and "Began running node" in stdout
+    assert stderr == "Database Error in model users"
+
+
+def test_followers_receive_events_until_close():
+    events = EventStream()
+    received = []
+    follower = threading.Thread(target=lambda: received.extend(
+        item for item in events.follow(timeout=1) if item is not None))
+    follower.start()
+    events.publish({"type": "command_started", "command": "seed"})
+    events.publish({"type": "command_finished", "command": "seed", "success": True})
+    events.close()
+    follower.join(timeout=5)
+
+    assert [event["type"] for _, event in received] == ["command_started", "command_finished"]
+    assert sse_format(*received[0]).startswith("id: 0\nevent: command_started\ndata: ")
@@ -0,0 +1,50 @@
+from dbt_model_generator import generate_models, read_fingerprint
+from orchestrate_dbt import modified_selection
+
+
+def _profile(n_duplicates=0):
+    return {
+        "analysis": {"title": "Sales 2024"},
+        "table": {"n": 4, "n_duplicates": n_duplicates},
+        "variables": {
+            "Order ID": {"type": "Numeric", "n": 4, "n_missing": 0, "is_unique": True},
+            "region": {"type": "Categorical", "n": 4, "n_missing": 1, "is_unique": False},
+            "day": {"type": "DateTime", "n": 4, "n_missing": 0, "is_unique": False},
+            "empty": {"type": "Unsupported", "n": 4, "n_missing": 4, "is_unique": False},
+        },
+    }
+
+
+def test_generates_typed_staging_and_mart_models(tmp_path):
+    changed = generate_models(_profile(n_duplicates=2), str(tmp_path))
+
+    assert len(changed) == 3
+    staging = (tmp_path / "models" / "staging" / "stg_sales_2024.sql").read_text()
+    assert 'try_cast("Order ID" as double) as "order_id"' in staging
+    assert "nullif(trim(cast(\"region\" as varchar)), '') as \"region\"" in staging
+    assert '"empty"' not in staging
+    assert "source('uploads', 'sales_2024')" in staging
+    assert "select distinct *" in (tmp_path / "models" / "generated" / "sales_2024.sql").read_text()
+    tests = (tmp_path / "models" / "staging" / "stg_sales_2024.yml").read_text()
+    assert "- unique" in tests and "- not_null" in tests
+
+
+def test_unchanged_profiles_leave_files_untouched(tmp_path):
+    generate_models(_profile(), str(tmp_path))
+    mart = tmp_path / "models" / "generated" / "sales_2024.sql"
+    before = (read_fingerprint(mart), mart.stat().st_mtime_ns)
+
+    assert generate_models(_profile(), str(tmp_path)) == []
+    assert (read_fingerprint(mart), mart.stat().st_mtime_ns) == before
+
+    # Only the mart depends on the duplicate count
+    assert generate_models(_profile(n_duplicates=1), str(tmp_path)) == [str(mart)]
+
+
+def test_modified_selection_needs_saved_state(tmp_path):
+    assert modified_selection(str(tmp_path)) is None
+    assert modified_selection(str(tmp_path), "generated") == "generated"
+
+    (tmp_path / "manifest.json").write_text("{}")
+    assert modified_selection(str(tmp_path)) == "state:modified+"
+    assert modified_selection(str(tmp_path), "generated") == "state:modified+,generated"
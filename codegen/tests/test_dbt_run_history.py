@@ -0,0 +1,30 @@
+from dbt_run_history import RunHistory, node_rows
+
+
+def _run_results(invocation, day, timings):
+    return {
+        "metadata": {"invocation_id": invocation, "generated_at": f"2024-01-{day:02d}T00:00:00Z"},
+        "results": [{"unique_id": f"model.p.{name}", "status": "success", "execution_time": seconds,
+                     "adapter_response": {"rows_affected": 10}} for name, seconds in timings.items()],
+    }
+
+
+def test_ranks_slowest_models_and_flags_regressions(tmp_path):
+    history = RunHistory(str(tmp_path / "history.sqlite"))
+    manifest = {"nodes": {"model.p.orders": {"name": "orders", "resource_type": "model",
+                                             "config": {"materialized": "table"}}}}
+    for day in range(1, 6):
+        history.record(node_rows(_run_results(f"run{day}", day, {"orders": 2.0, "users": 1.0}), manifest))
+    rows = node_rows(_run_results("run6", 6, {"orders": 6.0, "users": 1.1}), manifest, command="run")
+    assert history.record(rows) == 2
+    # The same invocation isn't counted twice
+    assert history.record(rows) == 0
+
+    slowest = history.slowest()
+    assert [s["name"] for s in slowest] == ["orders", "users"]
+    assert slowest[0]["materialized"] == "table" and slowest[0]["runs"] == 6
+
+    regressions = history.regressions()
+    assert [r["name"] for r in regressions] == ["orders"]
+    assert regressions[0]["baseline_seconds"] == 2.0 and regressions[0]["slowdown"] == 3.0
+
@@ -0,0 +1,24 @@
+import pytest
+
+from codegen.benchmarks.import_budget import measure_import, parse_importtime
+
+
+@pytest.mark.parametrize('module', [
+    'codegen.agents.base_eda',
+    'codegen.agents.dataset_profiler_agent',
+    'codegen.agents.insight_gen_agent',
+    'codegen.agents.manager',
+])
+def test_heavy_dependencies_are_deferred(module):
+    measurement = measure_import(module, budget_ms=float('inf'))
+    assert measurement.error is None
+    assert measurement.eager_heavy_modules == []
+
+
+def test_parse_importtime():
+    stderr = (
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |   json.decoder\n'
+        'import time:       300 |        420 | json\n'
+    )
+    assert parse_importtime(stderr) == {'json.decoder': (120, 120), 'json': (300, 420)}
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from codegen.metrics import MetricsRegistry
+
+
+def test_stage_records_duration_rss_and_failures():
+    registry = MetricsRegistry(enabled=True)
+    with registry.stage('load'):
+        pass
+    with pytest.raises(ValueError):
+        with registry.stage('load'):
+            raise ValueError('boom')
+
+    assert registry.stage_duration.count(stage='load') == 2
+    assert registry.stage_failures.value(stage='load') == 1
+    assert registry.stage_peak_rss.value(stage='load') > 0
+
+
+def test_stage_peak_rss_includes_memory_freed_before_the_stage_ends():
+    registry = MetricsRegistry(enabled=True)
+    with registry.stage('clean'):
+        pass
+    with registry.stage('profile'):
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b'x' * len(block[::4096])
+        # Long enough for the sampler to see it
+        time.sleep(0.1)
+        del block
+
+    assert registry.stage_peak_rss.value(stage='profile') - registry.stage_peak_rss.value(stage='clean') \
+        >= 32 * 1024 * 1024
+
+
+def test_disabled_registry_is_a_no_op():
+    registry = MetricsRegistry(enabled=False)
+    with registry.stage('profile'):
+        pass
+    registry.observe_llm_call('agent', 'model', 1.0, 0.2, 10, 5)
+
+    assert registry.stage_duration.count(stage='profile') == 0
+    assert registry.llm_tokens.value(agent='agent', model='model', kind='prompt') == 0
+
+
+def test_render_prometheus_and_merge_state():
+    worker = MetricsRegistry(enabled=True)
+    worker.stage_duration.observe(0.3, stage='clean')
+    worker.observe_llm_call('insight_gen', 'm', 2.0, 0.5, 100, 20)
+
+    parent = MetricsRegistry(enabled=True)
+    parent.merge_state(worker.export_state())
+    text = parent.render_prometheus()
+
+    assert '# TYPE yudai_stage_duration_seconds histogram' in text
+    assert 'yudai_stage_duration_seconds_bucket{stage="clean",le="0.5"} 1' in text
+    assert 'yudai_stage_duration_seconds_count{stage="clean"} 1' in text
+    assert 'yudai_llm_tokens_total{agent="insight_gen",kind="prompt",model="m"} 100' in text
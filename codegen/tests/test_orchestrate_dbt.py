@@ -0,0 +1,191 @@
+import threading
+
+import pytest
+
+from orchestrate_dbt import DbtOrchestrator, DbtRunResult, InProcessDbt, independent_components, manifest_graph, project_fingerprint
+
+
+def _project(tmp_path):
+    (tmp_path / "dbt_project.yml").write_text("name: 'p'\nmodel-paths: ['models']\nseed-paths: ['seeds']\n")
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "a.sql").write_text("select 1")
+    (tmp_path / "target").mkdir()
+    return tmp_path
+
+
+def test_fingerprint_tracks_parsed_files_only(tmp_path):
+    project = _project(tmp_path)
+    before = project_fingerprint(project, tmp_path / "profiles")
+
+    # Build output isn't parsed, so it doesn't invalidate the manifest
+    (project / "target" / "run_results.json").write_text("{}")
+    assert project_fingerprint(project, tmp_path / "profiles") == before
+
+    (project / "models" / "a.sql").write_text("select 2 as changed")
+    assert project_fingerprint(project, tmp_path / "profiles") != before
+
+
+def test_subprocess_backend_and_unknown_backend(tmp_path):
+    project = _project(tmp_path)
+
+    assert DbtOrchestrator(str(project), backend="subprocess")._in_process is None
+    with pytest.raises(ValueError):
+        DbtOrchestrator(str(project), backend="threads")
+
+
+def _manifest(edges):
+    nodes = {}
+    for uid, parents in edges.items():
+        nodes[uid] = {"name": uid.split(".")[-1], "resource_type": uid.split(".")[0],
+                      "depends_on": {"nodes": parents}}
+    return {"nodes": nodes}
+
+
+def test_independent_components_split_unrelated_datasets():
+    graph = manifest_graph(_manifest({
+        "seed.p.orders": [], "model.p.stg_orders": ["seed.p.orders", "source.p.raw.x"],
+        "test.p.not_null_stg_orders_id": ["model.p.stg_orders"],
+        "seed.p.users": [], "model.p.stg_users": ["seed.p.users"],
+        "model.p.report": ["model.p.stg_users"],
+    }))
+
+    components = independent_components(graph)
+
+    assert components == [
+        ["model.p.report", "model.p.stg_users", "seed.p.users"],
+        ["model.p.stg_orders", "seed.p.orders", "test.p.not_null_stg_orders_id"],
+    ]
+
+
+def test_unselected_nodes_still_link_their_upstream_and_downstream():
+    graph = manifest_graph(_manifest({
+        "seed.p.a": [], "model.p.b": ["seed.p.a"], "model.p.c": ["model.p.b"], "seed.p.d": [],
+    }))
+
+    components = independent_components(graph, {"seed.p.a", "model.p.c", "seed.p.d"})
+
+    assert components == [["model.p.c", "seed.p.a"], ["seed.p.d"]]
+
+
+class _StubOrchestrator(DbtOrchestrator):
+    """Records the commands it's given instead of running dbt"""
+
+    def __init__(self, project_dir, profiles_dir, edges, failing):
+        super().__init__(str(project_dir), str(profiles_dir), backend="subprocess")
+        self._edges, self._failing = edges, failing
+        self.commands, self.threads = [], set()
+        self._started = threading.Barrier(2, timeout=5)
+
+    def manifest(self):
+        return _manifest(self._edges)
+
+    def _run_dbt_subprocess(self, command, timeout=300):
+        self.commands.append(command)
+        self.threads.add(threading.get_ident())
+        if command[0] == "seed" and self._started is not None:
+            # Both components only get past here if they run at the same time
+            self._started.wait()
+        failed = [name for name in command if name in self._failing]
+        nodes = [{"unique_id": f"{command[0] if command[0] != 'run' else 'model'}.p.{name}", "status": "error"}
+                 for name in failed]
+        return DbtRunResult(" ".join(command), not failed, "", "", int(bool(failed)), 0.0, nodes=nodes)
+
+
+def test_concurrent_components_skip_only_what_depends_on_a_failure(tmp_path):
+    project = _project(tmp_path)
+    (project / "dbt_project.yml").write_text("name: 'p'\nprofile: 'p'\n")
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "profiles" / "profiles.yml").write_text(
+        "p:\n  target: dev\n  outputs:\n    dev: {type: postgres, host: localhost}\n")
+    orchestrator = _StubOrchestrator(project, tmp_path / "profiles", {
+        "seed.p.orders": [], "model.p.stg_orders": ["seed.p.orders"],
+        "model.p.bad": ["seed.p.orders"], "model.p.after_bad": ["model.p.bad"],
+        "test.p.not_null_stg_orders_id": ["model.p.stg_orders"],
+        "test.p.not_null_bad_id": ["model.p.bad"],
+        "seed.p.users": [], "model.p.stg_users": ["seed.p.users"],
+    }, failing={"bad"})
+
+    assert not orchestrator.single_writer()
+    results = orchestrator.run_pipeline_concurrently(["seed", "run", "test"], concurrency=2)
+
+    assert len(orchestrator.threads) == 2
+    assert not results["run:after_bad"].success
+    assert results["run:stg_users"].success
+    # The failed model's test is dropped; its sibling's test still runs
+    assert results["test:after_bad"].command == "test --select not_null_stg_orders_id " \
+        f"--target-path {project / 'target' / 'components' / '0'}"
+
+
+class _FakeRunner:
+    """dbtRunner stand-in: parse succeeds, every other command errors out mid-run"""
+    parse_fails = False
+
+    def __init__(self, manifest=None, callbacks=None):
+        pass
+
+    def invoke(self, args):
+        failed = args[0] != "parse" or self.parse_fails
+        return type("Result", (), {"success": not failed, "result": {},
+                                   "exception": RuntimeError("adapter died") if failed else None})()
+
+
+def test_only_failures_before_execution_retry_in_a_subprocess(tmp_path):
+    project = _project(tmp_path)
+    orchestrator = DbtOrchestrator(str(project), backend="subprocess")
+    orchestrator.backend = "auto"
+    orchestrator._in_process = InProcessDbt.__new__(InProcessDbt)
+    orchestrator._in_process.__dict__.update(_runner_class=_FakeRunner, project_dir=project,
+                                             profiles_dir=tmp_path / "profiles", _manifest=None,
+                                             _fingerprint=None, _lock=threading.Lock())
+    retried = []
+    orchestrator._run_dbt_subprocess = lambda command, timeout=300: retried.append(command)
+
+    # A run that errors while executing may have built some models, so it isn't repeated
+    result = orchestrator._run_dbt_command(["run"])
+    assert not result.success and result.return_code == 2 and "adapter died" in result.stderr
+    assert retried == []
+
+    _FakeRunner.parse_fails = True
+    try:
+        orchestrator._run_dbt_command(["run"])
+    finally:
+        _FakeRunner.parse_fails = False
+    assert retried == [["run"]]
+
+
+def test_orchestrators_share_one_in_process_runner(tmp_path, monkeypatch):
+    import orchestrate_dbt
+
+    class Runner:
+        def __init__(self, project_dir, profiles_dir):
+            self.project_dir = project_dir
+
+    monkeypatch.setattr(orchestrate_dbt, "InProcessDbt", Runner)
+    monkeypatch.setattr(orchestrate_dbt, "_RUNNERS", {})
+    project = _project(tmp_path)
+
+    first = DbtOrchestrator(str(project), str(tmp_path / "profiles"))
+    second = DbtOrchestrator(str(project), str(tmp_path / "profiles"))
+
+    # The manifest parsed for one pipeline is reused by the next
+    assert first._in_process is second._in_process
+    assert DbtOrchestrator(str(project), str(tmp_path / "other"))._in_process is not first._in_process
+
+
+def test_single_writer_targets_run_each_step_once(tmp_path):
+    project = _project(tmp_path)
+    (project / "dbt_project.yml").write_text("name: 'p'\nprofile: 'p'\n")
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "profiles" / "profiles.yml").write_text(
+        "p:\n  target: dev\n  outputs:\n    dev: {type: duckdb, path: warehouse.duckdb}\n")
+    orchestrator = _StubOrchestrator(project, tmp_path / "profiles", {
+        "seed.p.orders": [], "model.p.stg_orders": ["seed.p.orders"],
+        "seed.p.users": [], "model.p.stg_users": ["seed.p.users"],
+    }, failing=set())
+    orchestrator._started = None
+
+    results = orchestrator.run_pipeline(["seed", "run", "test"], concurrency=4)
+
+    # One dbt invocation per step rather than one per component per step
+    assert list(results) == ["seed", "run", "test"]
+    assert [command[0] for command in orchestrator.commands] == ["seed", "run", "test"]
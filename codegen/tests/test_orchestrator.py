@@ -0,0 +1,111 @@
+import json
+import threading
+
+import pytest
+
+from app.context_manager import ContextManager
+from app.models import DatasetProfile
+from app.summary_agent_prompt_template import generate_dashboard_config
+from codegen.agents.orchestrator import Orchestrator
+from codegen.benchmarks.datasets import make_profile_dict
+
+
+class FakeInsightAgent:
+    def generate_insight_and_question(self, profile):
+        return [f'insight {i}' for i in range(3)], [f'question {i}?' for i in range(3)]
+
+
+def _orchestrator(tmp_path, llm=None):
+    orchestrator = Orchestrator(ContextManager(str(tmp_path / 'context.json')), llm=llm,
+                                insight_agent=FakeInsightAgent())
+    orchestrator.initialize_conversation(DatasetProfile(**make_profile_dict(1_000, 6, 'mixed')))
+    return orchestrator
+
+
+def test_dashboard_comes_from_the_last_background_build(tmp_path):
+    orchestrator = _orchestrator(tmp_path)
+    for answer in ('Track revenue', 'Sales data', 'Show trends'):
+        reply = orchestrator.process_response(answer)
+
+    assert 'generate a dashboard' in reply
+    speculation = orchestrator._speculation
+    speculation.future.result(timeout=5)
+
+    reply = orchestrator.process_response('Yes please')
+
+    config = json.loads(reply.split('\n', 1)[1])
+    assert config == generate_dashboard_config(orchestrator.profile, orchestrator.requirements())
+    assert orchestrator._speculation is speculation
+    orchestrator.close()
+
+
+def test_new_answers_cancel_stale_builds(tmp_path):
+    prompts, entered, release = [], threading.Semaphore(0), threading.Event()
+
+    def llm(prompt):
+        prompts.append(prompt)
+        entered.release()
+        release.wait(5)
+        return json.dumps({'charts': [{'id': 'chart_1', 'spec': {'type': 'bar', 'x': 'category_2'}}]})
+
+    orchestrator = _orchestrator(tmp_path, llm)
+    # Both workers end up busy with builds that newer answers supersede
+    orchestrator.process_response('I want to forecast revenue')
+    assert entered.acquire(timeout=5)
+    orchestrator.process_response('Sales data')
+    assert entered.acquire(timeout=5)
+    orchestrator.process_response('Monthly trends')
+    queued = orchestrator._speculation
+    orchestrator.process_response('Split by region')
+    release.set()
+
+    reply = orchestrator.process_response('yes')
+
+    assert queued.future.cancelled()
+    # The queued build never reached the LLM; the dashboard used all four answers
+    assert len(prompts) == 3 and 'Split by region' in prompts[-1]
+    assert json.loads(reply.split('\n', 1)[1])['source'] == 'llm'
+    orchestrator.close()
+
+
+def test_only_a_bare_confirmation_builds_the_dashboard(tmp_path):
+    orchestrator = _orchestrator(tmp_path)
+    for answer in ('Track revenue', 'Sales data', 'Show trends'):
+        orchestrator.process_response(answer)
+
+    reply = orchestrator.process_response('Please add a breakdown by region')
+
+    assert not reply.startswith("Here's your dashboard")
+    assert 'Please add a breakdown by region' in orchestrator.requirements()
+    assert orchestrator.process_response('OK, please!').startswith("Here's your dashboard")
+    orchestrator.close()
+
+
+def test_failed_background_build_falls_back_to_the_rules(tmp_path):
+    calls = []
+
+    def llm(prompt):
+        calls.append(prompt)
+        raise RuntimeError('LLM unavailable')
+
+    orchestrator = _orchestrator(tmp_path, llm)
+    for answer in ('I want to forecast revenue', 'Sales data', 'Show trends'):
+        orchestrator.process_response(answer)
+
+    with pytest.raises(RuntimeError):
+        orchestrator._speculation.future.result(timeout=5)
+    tried = len(calls)
+
+    config = orchestrator.generate_dashboard()
+
+    assert config['source'] == 'rules'
+    # The failing LLM call isn't repeated on the critical path
+    assert len(calls) == tried
+    orchestrator.close()
+
+
+def test_dashboard_needs_a_profile(tmp_path):
+    orchestrator = Orchestrator(ContextManager(str(tmp_path / 'context.json')), insight_agent=FakeInsightAgent())
+
+    with pytest.raises(ValueError, match='initialize_conversation'):
+        orchestrator.generate_dashboard()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from app.profile_diff import batched_cdf, diff_profiles, numeric_drift, previous_profile_path
+
+
+def _numeric(values, missing=0.0):
+    s = pd.Series(values)
+    q = s.quantile([0.05, 0.25, 0.5, 0.75, 0.95])
+    return {"type": "Numeric", "n_distinct": int(s.nunique()), "p_missing": missing, "count": len(s),
+            "mean": s.mean(), "std": s.std(), "min": s.min(), "max": s.max(),
+            "5%": q[0.05], "25%": q[0.25], "50%": q[0.5], "75%": q[0.75], "95%": q[0.95]}
+
+
+def _profile(variables, n=10_000):
+    return {"table": {"n": n, "n_duplicates": 0}, "variables": variables}
+
+
+def test_numeric_drift_matches_exact_ks_for_shifted_uniforms():
+    rng = np.random.default_rng(0)
+    before = _numeric(rng.random(100_000))
+    after = _numeric(rng.random(100_000) * 1.5)
+    knots = lambda v: [v[k] for k in ("min", "5%", "25%", "50%", "75%", "95%", "max")]
+
+    psi, ks = numeric_drift(np.array([knots(before), knots(before)]), np.array([knots(after), knots(before)]))
+
+    # Exact KS between U(0, 1) and U(0, 1.5) is 1/3; a version compared with itself has no drift
+    assert abs(ks[0] - 1 / 3) < 0.02 and ks[1] == 0
+    assert psi[0] > 0.25 and psi[1] < 1e-6
+
+
+def test_cdf_handles_repeated_quantiles():
+    knots = np.array([[0.0, 1.0, 1.0, 1.0, 2.0, 3.0, 4.0]])
+
+    cdf = batched_cdf(knots, np.array([[-1.0, 0.5, 1.0, 2.5, 5.0]]))
+
+    assert np.allclose(cdf, [[0.0, 0.025, 0.5, 0.85, 1.0]])
+
+
+def test_diff_reports_schema_missingness_and_category_changes():
+    rng = np.random.default_rng(1)
+    amount = rng.normal(size=10_000)
+    before = _profile({
+        "amount": _numeric(amount),
+        "region": {"type": "Categorical", "n_distinct": 2, "p_missing": 0.0, "count": 10_000,
+                   "top_k": [{"value": "n", "count": 5_000}, {"value": "s", "count": 5_000}]},
+        "legacy": {"type": "Text", "n_distinct": 10, "p_missing": 0.0},
+    })
+    after = _profile({
+        "amount": _numeric(amount, missing=0.2),
+        "region": {"type": "Categorical", "n_distinct": 3, "p_missing": 0.0, "count": 10_000,
+                   "top_k": [{"value": "n", "count": 3_000}, {"value": "s", "count": 3_000},
+                             {"value": "w", "count": 4_000}]},
+        "new": {"type": "Numeric", "n_distinct": 5, "p_missing": 0.0},
+    })
+
+    diff = diff_profiles(before, after)
+
+    assert diff["schema"] == {"added": ["new"], "removed": ["legacy"], "type_changed": []}
+    assert diff["variables"]["amount"]["p_missing"] == [0.0, 0.2]
+    assert diff["variables"]["amount"]["severity"] == "stable"
+    assert diff["variables"]["region"]["new_levels"] == ["w"]
+    assert diff["drifted"] == ["region"]
+
+
+def test_uncomputed_cardinality_is_skipped():
+    before = _profile({"note": {"type": "Text", "n_distinct": 10, "p_missing": 0.0}})
+    after = _profile({"note": {"type": "Text", "n_distinct": None, "p_missing": 0.0}})
+
+    diff = diff_profiles(before, after)
+
+    assert "n_distinct" not in diff["variables"].get("note", {})
+
+
+def test_previous_profile_path_picks_latest_older_version(tmp_path):
+    for stamp in ("20240101_000000", "20240102_000000", "20240103_000000"):
+        (tmp_path / f"sales_{stamp}_profile.json").write_text("{}")
+    (tmp_path / "sales_eu_20240102_120000_profile.json").write_text("{}")
+
+    latest = tmp_path / "sales_20240103_000000_profile.json"
+    assert previous_profile_path(str(latest)) == str(tmp_path / "sales_20240102_000000_profile.json")
+    assert previous_profile_path(str(tmp_path / "sales_20240101_000000_profile.json")) is None
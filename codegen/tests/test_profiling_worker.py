@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from codegen.agents.profiling_worker import ProfilingHTTPServer, ProfilingPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    # No heavy preloads: these tests only exercise the pool itself
+    pool = ProfilingPool(workers=1, upload_dir=str(tmp_path), job_timeout=30, warm_modules=[])
+    yield pool
+    pool.shutdown()
+
+
+def test_jobs_reuse_the_warm_worker(pool):
+    assert pool._submit(os.getpid) == pool._submit(os.getpid) != os.getpid()
+
+
+def test_pool_recovers_after_a_worker_crash(pool):
+    before = pool._submit(os.getpid)
+
+    with pytest.raises(BrokenProcessPool):
+        pool._submit(os._exit, 1)
+
+    assert pool.pools_replaced == 1
+    assert pool._submit(os.getpid) not in (before, os.getpid())
+
+
+def test_invalid_payloads_are_rejected(pool):
+    server = ProfilingHTTPServer(("127.0.0.1", 0), pool)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/profile"
+
+    def post(body):
+        request = urllib.request.Request(url, data=body.encode(), method="POST")
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    try:
+        assert post(json.dumps(["not", "an", "object"])) == 400
+        assert post(json.dumps({"file_path": 42})) == 400
+        assert post(json.dumps({"file_path": "/does/not/exist.csv"})) == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from app.query_engine import Filter, Measure, Query, QueryEngine, QueryError, TimeBucket
+
+
+@pytest.fixture
+def engine(tmp_path):
+    csv = tmp_path / 'orders.csv'
+    pd.DataFrame({
+        'order_date': pd.date_range('2024-01-01', periods=120).strftime('%Y-%m-%d'),
+        'region': ['north', 'south', 'east'] * 40,
+        'sales': [1.0, 2.0, 3.0] * 40,
+    }).to_csv(csv, index=False)
+    engine = QueryEngine(memory_limit='64MB', temp_directory=str(tmp_path / 'spill'))
+    engine.register('orders', str(csv))
+    yield engine
+    engine.close()
+
+
+def test_group_by_filter_and_top_n(engine):
+    query = Query(group_by=['region'], measures=[Measure(agg='sum', column='sales')],
+                  filters=[Filter(column='region', op='in', value=['south', 'east'])], limit=1)
+
+    result = engine.query('orders', query)
+
+    assert result['columns'] == ['region', 'sum_sales']
+    assert result['rows'] == [['east', 120.0]]
+    assert result['truncated'] is True
+
+
+def test_time_buckets_are_ordered_oldest_first(engine):
+    query = Query(time_bucket=TimeBucket(column='order_date', grain='month'))
+
+    rows = engine.query('orders', query)['rows']
+
+    assert rows[0] == ['2024-01-01T00:00:00', 31]
+    assert [row[0][:7] for row in rows] == ['2024-01', '2024-02', '2024-03', '2024-04']
+
+
+def test_equivalent_queries_share_a_cache_entry(engine):
+    first = Query(filters=[Filter(column='region', op='in', value=['north', 'east']),
+                           Filter(column='sales', op='>', value=1)])
+    second = Query(filters=[Filter(column='sales', op='>', value=1),
+                            Filter(column='region', op='in', value=['east', 'north'])])
+
+    assert engine.query('orders', first)['cached'] is False
+    assert engine.query('orders', second)['cached'] is True
+    assert engine.hits == 1
+
+
+def test_unknown_columns_are_rejected(engine):
+    with pytest.raises(QueryError):
+        engine.query('orders', Query(group_by=['region"; DROP TABLE ds_orders; --']))
+
+
+def test_similarly_named_files_get_their_own_tables(tmp_path):
+    engine = QueryEngine(memory_limit='64MB')
+    pd.DataFrame({'sales': [1.0]}).to_csv(tmp_path / 'sales-2024.csv', index=False)
+    pd.DataFrame({'sales': [2.0, 3.0]}).to_csv(tmp_path / 'sales_2024.csv', index=False)
+    query = Query(measures=[Measure(agg='sum', column='sales')])
+
+    first = engine.query_file(str(tmp_path / 'sales-2024.csv'), query)
+    second = engine.query_file(str(tmp_path / 'sales_2024.csv'), query)
+
+    assert first['rows'] == [[1.0]] and second['rows'] == [[5.0]]
+    assert engine.query_file(str(tmp_path / 'sales-2024.csv'), query)['rows'] == [[1.0]]
+    engine.close()
+
+
+def test_unsupported_files_are_rejected(tmp_path):
+    engine = QueryEngine(memory_limit='64MB')
+    (tmp_path / 'notes.json').write_text('{}')
+
+    with pytest.raises(QueryError, match='Unsupported file format'):
+        engine.register('notes', str(tmp_path / 'notes.json'))
+    engine.close()
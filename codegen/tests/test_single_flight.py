@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from codegen.agents.single_flight import AdmissionController, AdmissionRejected, SingleFlight
+
+
+def test_concurrent_duplicates_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'profile.json'
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do('key', compute))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {value for value, _ in results} == {'profile.json'}
+    assert flight.inflight() == 0
+
+
+def test_errors_propagate_to_waiters_and_are_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError('bad file')
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 'ok') == ('ok', False)
+
+
+def test_admission_rejects_when_queue_is_full():
+    admission = AdmissionController(max_concurrent=1, max_waiting=0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+
+    worker = threading.Thread(target=admission.run, args=(slow,))
+    worker.start()
+    started.wait(5)
+
+    with pytest.raises(AdmissionRejected):
+        admission.run(lambda: None)
+
+    release.set()
+    worker.join()
+    assert admission.run(lambda: 'done') == 'done'
+
+
+def test_admission_slot_is_held_until_the_job_finishes():
+    admission = AdmissionController(max_concurrent=1, max_waiting=0)
+    job = Future()
+
+    with pytest.raises(TimeoutError):
+        admission.submit(lambda: job).result(timeout=0.01)
+
+    # The caller gave up, but the job is still running and keeps its slot
+    assert admission.running == 1
+    with pytest.raises(AdmissionRejected):
+        admission.run(lambda: None)
+
+    job.set_result('profile.json')
+    assert admission.running == 0
+    assert admission.run(lambda: 'done') == 'done'
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from codegen.agents.sketches import (ColumnSketch, high_cardinality_columns, merge_sketched_variables,
+                                     sketch_columns)
+
+
+def test_sketch_estimates_distinct_values_and_heavy_hitters():
+    rng = np.random.default_rng(0)
+    n = 300_000
+    values = pd.Series(rng.integers(0, 50_000, n).astype(str), dtype=object)
+    values[:30_000] = 'hot'
+    values[30_000:31_000] = None
+
+    result = sketch_columns(pd.DataFrame({'user': values}), chunk_size=50_000, capacity=200)['user']
+
+    exact = values.nunique()
+    assert result['n'] == n and result['n_missing'] == 1_000
+    assert result['n_distinct_estimated'] and not result['is_unique']
+    assert abs(result['n_distinct'] - exact) / exact < 0.03
+    top = result['top_k'][0]
+    assert top['value'] == 'hot'
+    # Counts are upper bounds within the reported error
+    assert top['count'] - top['error'] <= 30_000 <= top['count']
+
+
+def test_merged_sketches_match_a_single_pass():
+    values = pd.Series([f'v{i % 5_000}' for i in range(20_000)])
+    left, right, whole = ColumnSketch(), ColumnSketch(), ColumnSketch()
+    left.update(values[:10_000])
+    right.update(values[10_000:])
+    whole.update(values)
+    left.merge(right)
+
+    assert left.result()['n_distinct'] == whole.result()['n_distinct']
+    assert left.n == whole.n
+
+
+def test_unique_columns_are_exact():
+    df = pd.DataFrame({'id': [f'u{i}' for i in range(20_000)], 'group': ['a', 'b'] * 10_000})
+
+    assert high_cardinality_columns(df) == ['id']
+    result = sketch_columns(df, ['id'])['id']
+    assert result['is_unique'] and not result['n_distinct_estimated']
+    assert result['n_distinct'] == 20_000
+
+
+def test_merge_sketched_variables_updates_table_and_order():
+    df = pd.DataFrame({'id': [f'u{i}' for i in range(100)], 'group': ['a', 'b'] * 50})
+    profile = {
+        'table': {'n': 100, 'n_var': 1, 'memory_size': 100, 'record_size': 1.0, 'n_cells_missing': 0,
+                  'n_vars_with_missing': 0, 'n_vars_all_missing': 0, 'p_cells_missing': 0.0,
+                  'types': {'Categorical': 1}},
+        'variables': {'group': {'type': 'Categorical'}},
+        'alerts': [],
+    }
+
+    merge_sketched_variables(profile, df, sketch_columns(df, ['id']))
+
+    assert list(profile['variables']) == ['id', 'group']
+    assert profile['variables']['id']['type'] == 'Text'
+    assert profile['variables']['id']['n_distinct'] == 100
+    assert profile['table']['n_var'] == 2 and profile['table']['types'] == {'Categorical': 1, 'Text': 1}
+    assert profile['alerts'] == ['[id] has unique values']
+
+
+def test_unique_column_stays_unique_across_many_chunks():
+    df = pd.DataFrame({'id': [f'u{i}' for i in range(50_000)]})
+
+    # Every chunk overflows the counters, so merged counts are inflated by the chunks' floors
+    result = sketch_columns(df, chunk_size=5_000, capacity=1_000)['id']
+
+    assert result['is_unique'] and result['n_distinct'] == 50_000
+    assert result['top_k'] == []
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from codegen.agents.summary_engine import summarize_frame, suggest_visuals
+
+
+def test_summarize_frame_is_columnar_and_matches_pandas():
+    df = pd.DataFrame({
+        'id': range(1, 101),
+        'sales': np.r_[np.arange(99, dtype=float), np.nan],
+        'region': ['north', 'south', 'east', 'west'] * 25,
+        'day': pd.date_range('2024-01-01', periods=100),
+    })
+
+    summary = summarize_frame(df)
+
+    numeric = summary['numeric']
+    assert numeric['columns'] == ['id', 'sales']
+    assert numeric['missing'] == [0, 1]
+    assert numeric['mean'][1] == df['sales'].mean()
+    assert np.isclose(numeric['std'][1], df['sales'].std())
+    assert numeric['p50'][1] == df['sales'].median()
+    assert numeric['id_like'] == [True, False]
+
+    categorical = summary['categorical']
+    assert categorical['columns'] == ['region']
+    assert categorical['n_unique'] == [4]
+    assert categorical['freq'] == [25]
+
+    assert summary['datetime']['min'] == ['2024-01-01T00:00:00']
+
+
+def test_high_cardinality_columns_are_estimated_from_a_sample():
+    df = pd.DataFrame({'user': [f'u{i}' for i in range(200_000)]})
+
+    categorical = summarize_frame(df)['categorical']
+
+    assert categorical['approximate'] == [True]
+    assert categorical['n_unique'][0] == 200_000
+
+
+def test_visuals_use_dtypes_and_cardinality():
+    df = pd.DataFrame({
+        'row': range(40),
+        'when': pd.date_range('2024-01-01', periods=40),
+        'segment': ['a', 'b'] * 20,
+        'revenue': np.linspace(1, 10, 40),
+    })
+
+    visuals = suggest_visuals(summarize_frame(df))
+
+    assert visuals[0] == {'type': 'line', 'x': 'when', 'y': 'revenue'}
+    assert {'type': 'bar', 'x': 'segment', 'y': 'revenue', 'agg': 'sum'} in visuals
@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from codegen.agents.time_index import (TimeIndexCache, compute_rollups, detect_datetime_columns,
+                                       parse_datetime_columns, write_rollups)
+from app.chart_data import ChartSpec, chart_data_for_file
+
+
+def test_detects_formats_and_ignores_numeric_text():
+    df = pd.DataFrame({
+        'iso': ['2024-01-02', '2024-01-03', None, '2024-02-01'],
+        'day_first': ['01/02/2024', '13/02/2024', '28/02/2024', '02/03/2024'],
+        'codes': ['2021', '2022', '2023', '2024'],
+        'name': ['a', 'b', 'c', 'd'],
+    })
+
+    formats = detect_datetime_columns(df)
+
+    assert formats == {'iso': '%Y-%m-%d', 'day_first': '%d/%m/%Y'}
+    parse_datetime_columns(df)
+    assert df['day_first'].tolist()[1] == pd.Timestamp('2024-02-13')
+    assert df['codes'].dtype == object
+
+
+def test_parsed_columns_are_cached_per_file(tmp_path):
+    csv = tmp_path / 'orders.csv'
+    pd.DataFrame({'day': pd.date_range('2024-01-01', periods=50).strftime('%d.%m.%Y')}).to_csv(csv, index=False)
+    cache = TimeIndexCache(str(tmp_path / 'cache'))
+
+    first = pd.read_csv(csv)
+    assert parse_datetime_columns(first, cache=cache, source=str(csv)) == {'day': '%d.%m.%Y'}
+    second = pd.read_csv(csv)
+    assert parse_datetime_columns(second, cache=cache, source=str(csv)) == {'day': 'cached'}
+    assert second['day'].equals(first['day'])
+
+
+def test_time_index_cache_evicts_least_recently_used(tmp_path):
+    values = pd.Series(pd.date_range('2024-01-01', periods=1_000))
+    sources = []
+    for i in range(3):
+        sources.append(tmp_path / f'upload_{i}.csv')
+        sources[-1].write_text(f'day\n{i}\n')
+    # Room for two columns
+    cache = TimeIndexCache(str(tmp_path / 'cache'), max_bytes=2 * 8_000 + 500)
+
+    cache.put(str(sources[0]), 'day', values)
+    cache.put(str(sources[1]), 'day', values)
+    time.sleep(0.01)
+    assert cache.get(str(sources[0]), 'day') is not None
+    cache.put(str(sources[2]), 'day', values)
+
+    assert cache.get(str(sources[1]), 'day') is None
+    assert cache.get(str(sources[0]), 'day') is not None and cache.get(str(sources[2]), 'day') is not None
+
+
+def test_rollups_serve_time_trend_charts(tmp_path):
+    days = pd.date_range('2024-01-01', periods=90)
+    df = pd.DataFrame({'day': np.repeat(days, 4), 'sales': 1.0, 'order_id': np.arange(360)})
+
+    rollups = compute_rollups(df, 'day')
+
+    assert rollups['measures'] == ['sales']
+    week = rollups['grains']['week']
+    assert week['period'][0] == '2024-01-01T00:00:00'  # a Monday
+    assert week['sum']['sales'][0] == 28.0
+    assert sum(rollups['grains']['month']['count']) == 360
+
+    profile_path = tmp_path / 'orders_profile.json'
+    write_rollups(str(profile_path), rollups)
+    spec = ChartSpec(type='line', x='day', y='sales', max_points=30)
+    # The dataset file is never read when the rollups can answer
+    option = chart_data_for_file(str(tmp_path / 'missing.csv'), spec, profile_path=str(profile_path))
+    assert len(option['series'][0]['data']) == 13
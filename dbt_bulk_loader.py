@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Yudai V2 bulk loader
+
+Loads uploaded CSV/Parquet files straight into the DuckDB warehouse with
+DuckDB's native readers (``read_csv_auto``/``read_parquet``), instead of
+inserting rows through the dbt adapter like ``dbt seed`` does. Each table is
+recorded with its file's content hash, and unchanged files are skipped on
+later loads. The loaded tables are declared as the ``uploads`` dbt source.
+"""
+
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from codegen.agents.single_flight import file_content_hash
+from dbt_model_generator import SOURCE_NAME, model_name, quote, with_fingerprint, write_if_changed
+
+logger = logging.getLogger(__name__)
+
+# Overrides the warehouse file; the repo's dbt profile reads the same variable
+DATABASE_ENV = "DBT_DUCKDB_PATH"
+# The profile's own default, used when it can't be read
+DEFAULT_DATABASE = "~/yudai/data/yudai_v2.duckdb"
+# Where the app saves uploaded files, relative to the project
+UPLOAD_DIR = Path("codegen") / "app" / "uploads"
+ENV_VAR = re.compile(r"""\{\{\s*env_var\(\s*['"]([^'"]+)['"]\s*(?:,\s*['"]([^'"]*)['"]\s*)?\)\s*\}\}""")
+READERS = {".csv": "read_csv_auto", ".tsv": "read_csv_auto", ".txt": "read_csv_auto", ".parquet": "read_parquet"}
+# Which file and content each table was loaded from
+LEDGER_TABLE = "_yudai_loads"
+SOURCES_FILE = Path("models") / "staging" / "_uploads_sources.yml"
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading one file"""
+    table: str
+    path: str
+    content_hash: str
+    rows: int
+    skipped: bool
+    duration: float
+
+
+def profile_output(project_dir: Path, profiles_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """The active target's output from profiles.yml for the project's profile, if it can be read"""
+    profiles_dir = profiles_dir or Path(os.getenv("DBT_PROFILES_DIR", Path.home() / ".dbt"))
+    try:
+        with open(project_dir / "dbt_project.yml") as f:
+            profile_name = yaml.safe_load(f).get("profile")
+        with open(profiles_dir / "profiles.yml") as f:
+            profile = yaml.safe_load(f)[profile_name]
+        return profile["outputs"][os.getenv("DBT_TARGET") or profile.get("target", "dev")]
+    except (OSError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def render_env_vars(value: str) -> str:
+    """Resolve ``{{ env_var('NAME', 'default') }}`` the way dbt renders it in profiles.yml"""
+    return ENV_VAR.sub(lambda m: os.getenv(m.group(1), m.group(2) or ""), value)
+
+
+def warehouse_path(project_dir: Path, profiles_dir: Optional[Path] = None) -> Path:
+    """The DuckDB file dbt will read: the env override, else the active profile's path"""
+    path = os.getenv(DATABASE_ENV)
+    if not path:
+        output = profile_output(project_dir, profiles_dir) or {}
+        path = render_env_vars(str(output.get("path", DEFAULT_DATABASE)))
+    path = Path(path).expanduser()
+    # dbt runs from the project directory, so relative paths resolve there
+    return path if path.is_absolute() else project_dir / path
+
+
+def loadable_files(upload_dir: Path) -> List[Path]:
+    return sorted(p for p in upload_dir.iterdir() if p.is_file() and p.suffix.lower() in READERS)
+
+
+class BulkLoader:
+    """Loads upload files into one schema of a DuckDB database.
+
+    DuckDB allows a single writer, so the connection is opened per ``load`` and
+    closed before dbt runs against the same file.
+    """
+
+    def __init__(self, database: str, schema: str = SOURCE_NAME):
+        self.database = str(database)
+        self.schema = schema
+
+    def _connect(self):
+        import duckdb
+
+        Path(self.database).parent.mkdir(parents=True, exist_ok=True)
+        con = duckdb.connect(self.database)
+        con.execute(f"CREATE SCHEMA IF NOT EXISTS {quote(self.schema)}")
+        con.execute(f"CREATE TABLE IF NOT EXISTS {quote(self.schema)}.{LEDGER_TABLE} "
+                    "(table_name VARCHAR PRIMARY KEY, source_path VARCHAR, content_hash VARCHAR, "
+                    "row_count BIGINT, loaded_at TIMESTAMP)")
+        return con
+
+    def _load_file(self, con, path: Path) -> LoadResult:
+        start = time.perf_counter()
+        table = model_name(path.stem)
+        content_hash = file_content_hash(str(path))
+        previous = con.execute(f"SELECT content_hash, row_count FROM {quote(self.schema)}.{LEDGER_TABLE} "
+                               "WHERE table_name = ?", [table]).fetchone()
+        exists = con.execute("SELECT count(*) FROM information_schema.tables WHERE table_schema = ? "
+                             "AND table_name = ?", [self.schema, table]).fetchone()[0]
+        if previous and previous[0] == content_hash and exists:
+            return LoadResult(table, str(path), content_hash, previous[1], True, time.perf_counter() - start)
+
+        reader = READERS[path.suffix.lower()]
+        target = f"{quote(self.schema)}.{quote(table)}"
+        # Table and ledger change together, so a failed load doesn't look up to date
+        con.execute("BEGIN TRANSACTION")
+        try:
+            con.execute(f"CREATE OR REPLACE TABLE {target} AS SELECT * FROM {reader}(?)", [str(path)])
+            rows = con.execute(f"SELECT count(*) FROM {target}").fetchone()[0]
+            con.execute(f"INSERT OR REPLACE INTO {quote(self.schema)}.{LEDGER_TABLE} "
+                        "VALUES (?, ?, ?, ?, current_timestamp)", [table, str(path), content_hash, rows])
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return LoadResult(table, str(path), content_hash, rows, False, time.perf_counter() - start)
+
+    def load(self, files: List[Path]) -> List[LoadResult]:
+        """Load each file into a table named after it, skipping files whose content hasn't changed"""
+        con = self._connect()
+        try:
+            results = []
+            for path in files:
+                result = self._load_file(con, path)
+                action = "Skipped unchanged" if result.skipped else "Loaded"
+                logger.info(f"{action} {result.path} -> {self.schema}.{result.table} "
+                            f"({result.rows:,} rows, {result.duration:.2f}s)")
+                results.append(result)
+            return results
+        finally:
+            con.close()
+
+    def loaded_tables(self) -> Dict[str, str]:
+        """table -> content hash for everything loaded so far"""
+        con = self._connect()
+        try:
+            rows = con.execute(f"SELECT table_name, content_hash FROM {quote(self.schema)}.{LEDGER_TABLE} "
+                               "ORDER BY table_name").fetchall()
+            return dict(rows)
+        finally:
+            con.close()
+
+
+def sources_yml(tables: Dict[str, str], schema: str = SOURCE_NAME) -> str:
+    """The uploads source; each table's content hash is in its meta, so new data shows up as state:modified"""
+    document: Dict[str, Any] = {
+        "version": 2,
+        "sources": [{
+            "name": SOURCE_NAME,
+            "schema": schema,
+            "description": "Uploaded datasets, bulk-loaded by dbt_bulk_loader.py",
+            "tables": [{"name": table, "meta": {"content_hash": content_hash}}
+                       for table, content_hash in tables.items()],
+        }],
+    }
+    return yaml.safe_dump(document, sort_keys=False)
+
+
+def load_uploads(upload_dir: str, project_dir: str = ".", database: Optional[str] = None,
+                 files: Optional[List[str]] = None, profiles_dir: Optional[str] = None) -> List[LoadResult]:
+    """Bulk-load an upload directory (or the given files) and write the uploads source declaration"""
+    project = Path(project_dir)
+    loader = BulkLoader(database or warehouse_path(project, Path(profiles_dir) if profiles_dir else None))
+    paths = [Path(f) for f in files] if files else loadable_files(Path(upload_dir))
+    results = loader.load(paths)
+    write_if_changed(project / SOURCES_FILE, with_fingerprint(sources_yml(loader.loaded_tables()), "#"))
+    return results
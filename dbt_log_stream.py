@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Yudai V2 dbt log streaming
+
+dbt's output is read line by line as it is produced (``--log-format json``) and
+turned into progress events: node started/finished with status and timing.
+Output is kept in a bounded ring buffer whose older lines spill to a file, so
+long verbose runs don't grow memory, and events are published to an
+``EventStream`` that the API serves as server-sent events.
+"""
+
+import json
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Lines of dbt output kept in memory per command; older lines go to the spill file
+DEFAULT_BUFFER_LINES = 2_000
+# Spill files kept per spill directory; older ones are removed when a new one is created
+DEFAULT_SPILL_FILES = 20
+SPILL_PREFIX = "dbt-output-"
+# Events kept per stream for late subscribers
+DEFAULT_MAX_EVENTS = 10_000
+ERROR_LEVELS = ("error",)
+# Result lines printed by ``dbt ls``; kept in full, apart from the bounded output
+LIST_EVENTS = ("ListCmdOut",)
+
+
+class OutputBuffer:
+    """Last ``max_lines`` lines in memory; lines pushed out are appended to a spill file"""
+
+    def __init__(self, max_lines: int = DEFAULT_BUFFER_LINES, spill_dir: Optional[str] = None,
+                 keep_spills: int = DEFAULT_SPILL_FILES):
+        self.max_lines = max_lines
+        self.spill_dir = spill_dir
+        self.keep_spills = keep_spills
+        self.lines: deque = deque()
+        self.spill_path: Optional[str] = None
+        self.spilled = 0
+        self._spill_file = None
+
+    def append(self, line: str) -> None:
+        self.lines.append(line)
+        if len(self.lines) > self.max_lines:
+            if self._spill_file is None:
+                if self.spill_dir:
+                    # Pruned before creating this one, so a file in use is never removed
+                    Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+                    prune_spill_files(self.spill_dir, self.keep_spills - 1)
+                self._spill_file = tempfile.NamedTemporaryFile(
+                    "w", prefix=SPILL_PREFIX, suffix=".log", dir=self.spill_dir, delete=False)
+                self.spill_path = self._spill_file.name
+            self._spill_file.write(self.lines.popleft() + "\n")
+            self.spilled += 1
+
+    def text(self) -> str:
+        """The in-memory tail, noting where the earlier lines went"""
+        tail = "\n".join(self.lines)
+        if self.spilled:
+            return f"[{self.spilled} earlier lines in {self.spill_path}]\n{tail}"
+        return tail
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+
+def prune_spill_files(spill_dir: str, keep: int = DEFAULT_SPILL_FILES) -> int:
+    """Remove all but the ``keep`` newest spill files in a directory; returns how many were removed"""
+    spills = sorted(Path(spill_dir).glob(f"{SPILL_PREFIX}*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in spills[keep:]:
+        path.unlink(missing_ok=True)
+    return len(spills[keep:])
+
+
+def parse_log_line(line: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """(human-readable message, structured record or None) for one line of dbt output"""
+    line = line.rstrip("\n")
+    if not line.startswith("{"):
+        return line, None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return line, None
+    return record.get("info", {}).get("msg", line), record
+
+
+def event_record(event: Any) -> Dict[str, Any]:
+    """JSON-log-shaped record for an in-process dbt event, so both backends share one parser"""
+    info = event.info
+    record: Dict[str, Any] = {"info": {"name": info.name, "msg": info.msg, "level": info.level}, "data": {}}
+    data = getattr(event, "data", None)
+    node_info = getattr(data, "node_info", None)
+    if node_info is not None and getattr(node_info, "unique_id", ""):
+        record["data"]["node_info"] = {"unique_id": node_info.unique_id, "node_name": node_info.node_name,
+                                       "node_status": node_info.node_status}
+    run_result = getattr(data, "run_result", None)
+    if run_result is not None and getattr(run_result, "status", ""):
+        record["data"]["run_result"] = {"status": run_result.status,
+                                        "execution_time": run_result.execution_time}
+    for key in ("index", "total"):
+        if getattr(data, key, None):
+            record["data"][key] = getattr(data, key)
+    return record
+
+
+def progress_event(record: Dict[str, Any], command: str) -> Optional[Dict[str, Any]]:
+    """node_started / node_finished / error event for a structured log record, if it is one"""
+    info, data = record.get("info", {}), record.get("data", {})
+    name = info.get("name")
+    node = data.get("node_info") or {}
+    if name == "NodeStart" and node:
+        return {"type": "node_started", "command": command, "unique_id": node.get("unique_id"),
+                "name": node.get("node_name")}
+    if name == "NodeFinished" and node:
+        run_result = data.get("run_result") or {}
+        return {"type": "node_finished", "command": command, "unique_id": node.get("unique_id"),
+                "name": node.get("node_name"), "status": run_result.get("status") or node.get("node_status"),
+                "execution_time": run_result.get("execution_time")}
+    if name == "LogStartLine" and data.get("total"):
+        return {"type": "progress", "command": command, "index": data.get("index"), "total": data.get("total")}
+    if info.get("level") in ERROR_LEVELS:
+        return {"type": "error", "command": command, "message": info.get("msg")}
+    return None
+
+
+class EventStream:
+    """Append-only progress events with blocking reads, for one or more concurrent subscribers"""
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        self._events: deque = deque(maxlen=max_events)
+        self._next_seq = 0
+        self._condition = threading.Condition()
+        self.closed = False
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        with self._condition:
+            self._events.append((self._next_seq, {**event, "ts": time.time()}))
+            self._next_seq += 1
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def read(self, after: int = -1, timeout: float = 15.0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Events with sequence numbers above ``after``, waiting up to ``timeout`` for new ones"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.closed or self._next_seq - 1 > after, timeout=timeout)
+            return [(seq, event) for seq, event in self._events if seq > after]
+
+    def follow(self, after: int = -1, timeout: float = 15.0) -> Iterator[Optional[Tuple[int, Dict[str, Any]]]]:
+        """Yield events as they arrive until the stream closes; None marks an idle ``timeout``"""
+        while True:
+            events = self.read(after, timeout)
+            for seq, event in events:
+                after = seq
+                yield seq, event
+            if not events:
+                if self.closed:
+                    return
+                yield None
+
+
+def sse_format(seq: int, event: Dict[str, Any]) -> str:
+    return f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class CommandOutput:
+    """Collects one command's output: bounded text, error lines, ``dbt ls`` results and progress events"""
+
+    def __init__(self, command: str, events: Optional[EventStream] = None,
+                 max_lines: int = DEFAULT_BUFFER_LINES, spill_dir: Optional[str] = None):
+        self.command = command
+        self.events = events
+        self.output = OutputBuffer(max_lines, spill_dir)
+        self.errors: deque = deque(maxlen=200)
+        self.listed: List[str] = []
+
+    def line(self, line: str) -> None:
+        message, record = parse_log_line(line)
+        self.record(message, record)
+
+    def record(self, message: str, record: Optional[Dict[str, Any]]) -> None:
+        self.output.append(str(message))
+        if record is None:
+            return
+        if record.get("info", {}).get("name") in LIST_EVENTS:
+            self.listed.append(str(message))
+        event = progress_event(record, self.command)
+        if event is None:
+            return
+        if event["type"] == "error":
+            self.errors.append(str(message))
+        if self.events is not None:
+            self.events.publish(event)
+
+    def close(self) -> Tuple[str, str]:
+        """(output text, error text)"""
+        self.output.close()
+        return self.output.text(), "\n".join(self.errors)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Yudai V2 dbt Model Generator
+
+Generates a staging view and a mart table for each dataset profile:
+models/staging/stg_<dataset>.sql (+ .yml with column tests) and
+models/generated/<dataset>.sql. Each file carries a fingerprint of its content
+and is only rewritten when that changes, so dbt's state comparison
+(``state:modified+``) picks up new and changed datasets and nothing else.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# dbt source the raw uploads are loaded into
+SOURCE_NAME = "uploads"
+# ydata-profiling variable type -> DuckDB column type
+TYPE_CASTS = {
+    "Numeric": "double",
+    "DateTime": "timestamp",
+    "Boolean": "boolean",
+    "Categorical": "varchar",
+    "Text": "varchar",
+}
+TEXT_TYPES = ("Categorical", "Text")
+FINGERPRINT_PREFIX = "fingerprint: "
+
+
+def identifier(name: str, prefix: str = "d") -> str:
+    """Lowercase snake_case identifier, safe as a dbt model or column name"""
+    name = re.sub(r"\W+", "_", name.lower()).strip("_")
+    return f"{prefix}_{name}" if not name or name[0].isdigit() else name
+
+
+def model_name(dataset: str) -> str:
+    return identifier(dataset)
+
+
+def quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+def kept_columns(profile: Dict[str, Any]) -> Dict[str, str]:
+    """Source column -> output column name, without entirely empty columns (they carry no information)"""
+    aliases: Dict[str, str] = {}
+    for column, variable in profile["variables"].items():
+        if variable.get("n") and variable.get("n_missing") == variable.get("n"):
+            continue
+        alias, suffix = identifier(column, "c"), 2
+        while alias in aliases.values():
+            alias, suffix = f"{identifier(column, 'c')}_{suffix}", suffix + 1
+        aliases[column] = alias
+    return aliases
+
+
+def column_expression(column: str, alias: str, variable: Dict[str, Any]) -> str:
+    """Cast from the profiled type; blank strings in text columns with missing values become NULL"""
+    cast = TYPE_CASTS.get(variable.get("type"))
+    expr = quote(column)
+    if variable.get("type") in TEXT_TYPES and variable.get("n_missing", 0) > 0:
+        expr = f"nullif(trim(cast({expr} as varchar)), '')"
+    elif cast:
+        expr = f"try_cast({expr} as {cast})"
+    return f"{expr} as {quote(alias)}"
+
+
+def staging_sql(dataset: str, profile: Dict[str, Any]) -> str:
+    columns = [column_expression(column, alias, profile["variables"][column])
+               for column, alias in kept_columns(profile).items()]
+    select = ",\n    ".join(columns) or "*"
+    return (f"select\n    {select}\nfrom {{{{ source('{SOURCE_NAME}', '{dataset}') }}}}\n")
+
+
+def mart_sql(dataset: str, profile: Dict[str, Any]) -> str:
+    ref = f"{{{{ ref('stg_{dataset}') }}}}"
+    if profile.get("table", {}).get("n_duplicates", 0) > 0:
+        return f"-- The profile found duplicate rows\nselect distinct *\nfrom {ref}\n"
+    return f"select *\nfrom {ref}\n"
+
+
+def staging_yml(dataset: str, profile: Dict[str, Any]) -> str:
+    """Model docs with not_null/unique tests where the profile shows they hold.
+
+    The ``uploads`` source itself is declared by the bulk loader, from what it loaded.
+    """
+    columns = []
+    for column, alias in kept_columns(profile).items():
+        variable = profile["variables"][column]
+        tests = []
+        if variable.get("n_missing") == 0:
+            tests.append("not_null")
+        if variable.get("is_unique"):
+            tests.append("unique")
+        entry: Dict[str, Any] = {"name": alias}
+        if tests:
+            entry["tests"] = tests
+        columns.append(entry)
+    document = {
+        "version": 2,
+        "models": [{"name": f"stg_{dataset}",
+                    "description": f"Typed and cleaned {profile['analysis']['title']} upload",
+                    "columns": columns}],
+    }
+    return yaml.safe_dump(document, sort_keys=False)
+
+
+def with_fingerprint(body: str, comment: str) -> str:
+    fingerprint = hashlib.sha256(body.encode()).hexdigest()[:16]
+    header = f"{comment} Generated by dbt_model_generator.py; edits will be overwritten\n"
+    return f"{header}{comment} {FINGERPRINT_PREFIX}{fingerprint}\n{body}"
+
+
+def read_fingerprint(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        for line in f.readlines()[:2]:
+            if FINGERPRINT_PREFIX in line:
+                return line.split(FINGERPRINT_PREFIX, 1)[1].strip()
+    return None
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write only when the fingerprint differs, leaving unchanged files (and their mtimes) alone"""
+    fingerprint = content.splitlines()[1].split(FINGERPRINT_PREFIX, 1)[1]
+    if read_fingerprint(path) == fingerprint:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(content)
+    tmp.replace(path)
+    return True
+
+
+def generate_models(profile: Dict[str, Any], project_dir: str = ".") -> List[str]:
+    """Write the dataset's staging and mart models; returns the paths that changed"""
+    dataset = model_name(profile["analysis"]["title"])
+    models_dir = Path(project_dir) / "models"
+    files = {
+        models_dir / "staging" / f"stg_{dataset}.sql": with_fingerprint(staging_sql(dataset, profile), "--"),
+        models_dir / "staging" / f"stg_{dataset}.yml": with_fingerprint(staging_yml(dataset, profile), "#"),
+        models_dir / "generated" / f"{dataset}.sql": with_fingerprint(mart_sql(dataset, profile), "--"),
+    }
+    changed = [str(path) for path, content in files.items() if write_if_changed(path, content)]
+    if changed:
+        logger.info(f"Generated models for {dataset}: {changed}")
+    else:
+        logger.info(f"Models for {dataset} are up to date")
+    return changed
+
+
+def generate_models_from_file(profile_path: str, project_dir: str = ".") -> List[str]:
+    with open(profile_path) as f:
+        return generate_models(json.load(f), project_dir)
+
+
+def main():
+    """CLI interface for the model generator"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate dbt models from dataset profiles")
+    parser.add_argument("profiles", nargs="+", help="profile JSON files")
+    parser.add_argument("--project-dir", default=".", help="dbt project directory")
+    args = parser.parse_args()
+
+    try:
+        changed = [path for profile in args.profiles
+                   for path in generate_models_from_file(profile, args.project_dir)]
+        print(json.dumps({"changed": changed}, indent=2))
+    except Exception as e:
+        logger.error(f"❌ Model generation failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
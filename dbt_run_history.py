@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Yudai V2 dbt run history
+
+Per-node timings from dbt's ``run_results.json`` (joined with ``manifest.json``
+for names and materializations), kept in a local SQLite database so slow and
+regressing models can be found across runs.
+"""
+
+import json
+import logging
+import sqlite3
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE = "run_history.sqlite"
+# Under the project dir; not target/, which ``dbt clean`` deletes
+HISTORY_DIR = ".yudai"
+# Runs of a node that make up its rolling baseline
+DEFAULT_BASELINE_RUNS = 10
+# A node regressed when its latest run is this many times its baseline...
+DEFAULT_REGRESSION_RATIO = 1.5
+# ...and at least this many seconds slower (sub-second noise isn't worth chasing)
+DEFAULT_MIN_REGRESSION_SECONDS = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS node_runs (
+    invocation_id TEXT NOT NULL,
+    unique_id TEXT NOT NULL,
+    name TEXT,
+    resource_type TEXT,
+    materialized TEXT,
+    command TEXT,
+    status TEXT,
+    execution_time REAL,
+    rows_affected INTEGER,
+    generated_at TEXT,
+    PRIMARY KEY (invocation_id, unique_id)
+);
+CREATE INDEX IF NOT EXISTS node_runs_by_node ON node_runs (unique_id, generated_at);
+"""
+
+
+def load_artifact(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def node_rows(run_results: Dict[str, Any], manifest: Optional[Dict[str, Any]] = None,
+              command: str = "") -> List[Dict[str, Any]]:
+    """One row per node in run_results, named and typed from the manifest when available"""
+    metadata = run_results.get("metadata", {})
+    nodes = (manifest or {}).get("nodes", {})
+    rows = []
+    for result in run_results.get("results", []):
+        unique_id = result["unique_id"]
+        node = nodes.get(unique_id, {})
+        rows.append({
+            "invocation_id": metadata.get("invocation_id", ""),
+            "unique_id": unique_id,
+            "name": node.get("name", unique_id.split(".")[-1]),
+            "resource_type": node.get("resource_type", unique_id.split(".")[0]),
+            "materialized": node.get("config", {}).get("materialized"),
+            "command": command,
+            "status": result.get("status"),
+            "execution_time": result.get("execution_time") or 0.0,
+            "rows_affected": (result.get("adapter_response") or {}).get("rows_affected"),
+            "generated_at": metadata.get("generated_at", ""),
+        })
+    return rows
+
+
+def history_path(project_dir: Path) -> Path:
+    """Where a project's run history lives"""
+    return project_dir / HISTORY_DIR / HISTORY_FILE
+
+
+class RunHistory:
+    """SQLite store of per-node dbt timings"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as con:
+            con.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call: steps may finish on different threads
+        con = sqlite3.connect(self.path, timeout=30)
+        con.row_factory = sqlite3.Row
+        return con
+
+    def record(self, rows: List[Dict[str, Any]]) -> int:
+        """Store node rows; re-recording the same invocation is a no-op. Returns rows added."""
+        if not rows:
+            return 0
+        columns = list(rows[0])
+        with self._connect() as con:
+            before = con.total_changes
+            con.executemany(
+                f"INSERT OR IGNORE INTO node_runs ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [tuple(row[c] for c in columns) for row in rows])
+            return con.total_changes - before
+
+    def record_artifacts(self, target_dir: Path, command: str = "") -> int:
+        run_results = load_artifact(target_dir / "run_results.json")
+        if run_results is None:
+            return 0
+        return self.record(node_rows(run_results, load_artifact(target_dir / "manifest.json"), command))
+
+    def _timings(self, resource_types: Optional[List[str]]) -> Dict[str, List[sqlite3.Row]]:
+        """Successful runs per node, newest first"""
+        query = "SELECT * FROM node_runs WHERE status IN ('success', 'pass')"
+        params: List[Any] = []
+        if resource_types:
+            query += f" AND resource_type IN ({', '.join('?' for _ in resource_types)})"
+            params.extend(resource_types)
+        query += " ORDER BY unique_id, generated_at DESC"
+        by_node: Dict[str, List[sqlite3.Row]] = {}
+        with self._connect() as con:
+            for row in con.execute(query, params):
+                by_node.setdefault(row["unique_id"], []).append(row)
+        return by_node
+
+    def slowest(self, limit: int = 10, window: int = DEFAULT_BASELINE_RUNS,
+                resource_types: Optional[List[str]] = ("model",)) -> List[Dict[str, Any]]:
+        """Nodes ranked by mean execution time over their last ``window`` successful runs"""
+        ranked = []
+        for unique_id, runs in self._timings(resource_types).items():
+            recent = [r["execution_time"] for r in runs[:window]]
+            ranked.append({
+                "unique_id": unique_id,
+                "name": runs[0]["name"],
+                "materialized": runs[0]["materialized"],
+                "runs": len(recent),
+                "mean_seconds": round(statistics.fmean(recent), 3),
+                "last_seconds": round(recent[0], 3),
+                "last_rows_affected": runs[0]["rows_affected"],
+            })
+        ranked.sort(key=lambda item: item["mean_seconds"], reverse=True)
+        return ranked[:limit]
+
+    def regressions(self, window: int = DEFAULT_BASELINE_RUNS, ratio: float = DEFAULT_REGRESSION_RATIO,
+                    min_seconds: float = DEFAULT_MIN_REGRESSION_SECONDS,
+                    resource_types: Optional[List[str]] = ("model",)) -> List[Dict[str, Any]]:
+        """Nodes whose latest run is much slower than the median of their previous ``window`` runs"""
+        flagged = []
+        for unique_id, runs in self._timings(resource_types).items():
+            if len(runs) < 2:
+                continue
+            latest = runs[0]["execution_time"]
+            baseline = statistics.median(r["execution_time"] for r in runs[1:window + 1])
+            if latest >= baseline * ratio and latest - baseline >= min_seconds:
+                flagged.append({
+                    "unique_id": unique_id,
+                    "name": runs[0]["name"],
+                    "last_seconds": round(latest, 3),
+                    "baseline_seconds": round(baseline, 3),
+                    "slowdown": round(latest / baseline, 2) if baseline else None,
+                    "baseline_runs": len(runs[1:window + 1]),
+                })
+        flagged.sort(key=lambda item: item["last_seconds"] - item["baseline_seconds"], reverse=True)
+        return flagged
+
+    def report(self, limit: int = 10, window: int = DEFAULT_BASELINE_RUNS) -> Dict[str, Any]:
+        return {"slowest": self.slowest(limit=limit, window=window),
+                "regressions": self.regressions(window=window)}
@@ -2,8 +2,10 @@
 """
 Yudai V2 dbt Orchestrator
 
-This script orchestrates dbt commands (seed, run, test) using subprocesses
-as specified in the README requirements.
+This script orchestrates dbt commands (seed, run, test). By default they run
+in-process through dbt's programmatic runner, which parses the project once and
+reuses the manifest for every later command; each command falls back to a
+``dbt`` CLI subprocess when dbt can't be imported or the runner errors out.
 """
 
 import subprocess
@@ -11,11 +13,20 @@ import sys
 import os
 import logging
 import json
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
+import yaml
+
+from codegen.metrics import stage
+from dbt_log_stream import CommandOutput, EventStream, event_record
+from dbt_run_history import RunHistory, history_path, load_artifact, node_rows
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,11 +43,219 @@ class DbtRunResult:
     stderr: str
     return_code: int
     duration: float
+    # Per-node status, timing and rows affected from run_results.json
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    # Every result line of ``dbt ls`` (stdout only keeps the tail of long output)
+    listed: List[str] = field(default_factory=list)
+
+BACKENDS = ("auto", "inprocess", "subprocess")
+# Commands that write per-node results to run_results.json
+NODE_COMMANDS = ("seed", "run", "test", "snapshot", "build")
+# Project files whose changes invalidate the cached manifest, besides the *-paths directories
+PROJECT_FILES = ("dbt_project.yml", "packages.yml", "dependencies.yml", "selectors.yml")
+
+
+# Steps the scheduler can restrict to one component, and the resource types each one runs
+COMPONENT_STEPS = {"seed": ("seed",), "run": ("model",), "test": ("test",), "snapshot": ("snapshot",)}
+# run_results.json statuses of nodes whose dependents shouldn't run
+FAILED_STATUSES = ("error", "fail")
+
+
+def manifest_graph(manifest: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """unique_id -> {name, resource_type, depends_on} for every node in a manifest.json dict"""
+    graph = {}
+    for unique_id, node in manifest.get("nodes", {}).items():
+        graph[unique_id] = {
+            "name": node["name"],
+            "resource_type": node["resource_type"],
+            "depends_on": [d for d in node.get("depends_on", {}).get("nodes", []) if d in manifest["nodes"]],
+        }
+    return graph
+
+
+def independent_components(graph: Dict[str, Dict[str, Any]], selected: Optional[Set[str]] = None) -> List[List[str]]:
+    """Split the selected nodes into groups with no dependency path between groups.
+
+    Unselected nodes on a path between two selected ones still connect them, so
+    a group never has to wait for another. Largest groups come first.
+    """
+    selected = set(graph) if selected is None else selected & set(graph)
+    children: Dict[str, List[str]] = {uid: [] for uid in graph}
+    for uid, node in graph.items():
+        for parent in node["depends_on"]:
+            children[parent].append(uid)
+
+    def reachable(start: Set[str], edges) -> Set[str]:
+        seen, stack = set(start), list(start)
+        while stack:
+            for nxt in edges(stack.pop()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    between = reachable(selected, lambda uid: children[uid]) & reachable(selected, lambda uid: graph[uid]["depends_on"])
+    members = selected | between
+    parent_of = {uid: uid for uid in members}
+
+    def find(uid: str) -> str:
+        while parent_of[uid] != uid:
+            parent_of[uid] = parent_of[parent_of[uid]]
+            uid = parent_of[uid]
+        return uid
+
+    for uid in members:
+        for parent in graph[uid]["depends_on"]:
+            if parent in members:
+                parent_of[find(uid)] = find(parent)
+
+    groups: Dict[str, List[str]] = {}
+    for uid in sorted(selected):
+        groups.setdefault(find(uid), []).append(uid)
+    return sorted(groups.values(), key=lambda group: (-len(group), group[0]))
+
+
+def downstream(graph: Dict[str, Dict[str, Any]], uids: Set[str]) -> Set[str]:
+    """``uids`` and everything that depends on them (dbt's ``<node>+``)"""
+    children: Dict[str, List[str]] = {}
+    for uid, node in graph.items():
+        for parent in node["depends_on"]:
+            children.setdefault(parent, []).append(uid)
+    seen, stack = set(uids), list(uids)
+    while stack:
+        for child in children.get(stack.pop(), []):
+            if child not in seen:
+                seen.add(child)
+                stack.append(child)
+    return seen
+
+
+def modified_selection(state: str, select: Optional[str] = None) -> Optional[str]:
+    """Selector for nodes changed since the manifest saved in ``state`` (``select`` as-is without one)"""
+    if not (Path(state) / "manifest.json").exists():
+        return select
+    # Comma is dbt's intersection operator
+    return f"state:modified+,{select}" if select else "state:modified+"
+
+
+def project_fingerprint(project_dir: Path, profiles_dir: Path) -> Tuple:
+    """(path, size, mtime) of every file dbt parses; cheap enough to check before each command"""
+    with open(project_dir / "dbt_project.yml") as f:
+        config = yaml.safe_load(f) or {}
+    dirs = [d for key, value in config.items() if key.endswith("-paths") for d in (value or [])]
+    paths = [project_dir / name for name in PROJECT_FILES] + [profiles_dir / "profiles.yml"]
+    entries = []
+    for path in paths + [project_dir / d for d in dirs]:
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            if file.exists():
+                stat = file.stat()
+                entries.append((str(file), stat.st_size, stat.st_mtime_ns))
+    return tuple(entries)
+
+
+# dbt's flags, adapters and event manager are process-global, so every in-process
+# invocation (across all orchestrators) takes this one lock
+_DBT_LOCK = threading.Lock()
+# One runner per (project_dir, profiles_dir), so its parsed manifest outlives each orchestrator
+_RUNNERS: Dict[Tuple[str, str], "InProcessDbt"] = {}
+_RUNNERS_LOCK = threading.Lock()
+
+
+class DbtSetupError(RuntimeError):
+    """In-process dbt failed before the command started (parsing, manifest), so nothing ran"""
+
+
+class InProcessDbt:
+    """Long-lived dbt programmatic runner that parses the project once.
+
+    The parsed manifest is kept and handed to every later invocation, so seed,
+    run and test (and later pipelines) skip project parsing. It is re-parsed
+    when project files or profiles.yml change. dbt isn't thread-safe, so
+    invocations are serialized process-wide. Unlike the subprocess backend, a
+    running command can't be killed, so the timeout doesn't apply.
+
+    Use ``in_process_runner`` to get the process's shared runner for a project.
+    """
+
+    def __init__(self, project_dir: Path, profiles_dir: Path):
+        from dbt.cli.main import dbtRunner
+
+        self._runner_class = dbtRunner
+        self.project_dir = project_dir
+        self.profiles_dir = profiles_dir
+        self._manifest = None
+        self._fingerprint: Optional[Tuple] = None
+        self._lock = _DBT_LOCK
+
+    def _args(self, command: List[str]) -> List[str]:
+        return command + ["--project-dir", str(self.project_dir), "--profiles-dir", str(self.profiles_dir)]
+
+    def _ensure_manifest(self) -> None:
+        fingerprint = project_fingerprint(self.project_dir, self.profiles_dir)
+        if self._manifest is not None and fingerprint == self._fingerprint:
+            return
+        result = self._runner_class().invoke(self._args(["parse"]))
+        if not result.success:
+            raise RuntimeError(f"dbt parse failed: {result.exception}")
+        self._manifest, self._fingerprint = result.result, fingerprint
+        logger.info("Parsed dbt project; manifest cached for later commands")
+
+    def invalidate(self) -> None:
+        self._manifest = None
+
+    def manifest(self) -> Dict[str, Any]:
+        """The cached manifest as a manifest.json-style dict"""
+        with self._lock:
+            self._ensure_manifest()
+            return self._manifest.writable_manifest().to_dict(omit_none=True)
+
+    def invoke(self, command: List[str], output: Optional[CommandOutput] = None) -> Tuple[bool, int, str, str]:
+        """Run one command; returns (success, return_code, log output, error text).
+
+        Events are fed to ``output`` as dbt emits them.
+
+        Raises ``DbtSetupError`` when the project can't be parsed, before anything
+        runs, so the caller can safely retry in a subprocess. An error raised while
+        the command executes is returned as a failure (return code 2, as the CLI
+        does), since a retry could repeat a partly applied run, seed or snapshot.
+        """
+        with self._lock:
+            # deps changes installed packages, so the manifest is rebuilt afterwards;
+            # debug checks the connection and shouldn't depend on the project parsing
+            try:
+                if command[0] in ("deps", "debug"):
+                    self.invalidate()
+                else:
+                    self._ensure_manifest()
+            except Exception as e:
+                raise DbtSetupError(str(e)) from e
+            output = output or CommandOutput(' '.join(command))
+            runner = self._runner_class(manifest=self._manifest,
+                                        callbacks=[lambda event: output.record(event.info.msg, event_record(event))])
+            result = runner.invoke(self._args(command))
+            stdout, stderr = output.close()
+            if result.exception is not None:
+                self.invalidate()
+                return False, 2, stdout, str(result.exception)
+            return result.success, 0 if result.success else 1, stdout, "" if result.success else (stderr or stdout)
+
+
+def in_process_runner(project_dir: Path, profiles_dir: Path) -> InProcessDbt:
+    """The shared in-process runner for a project, created on first use"""
+    key = (str(project_dir.resolve()), str(profiles_dir.resolve()))
+    with _RUNNERS_LOCK:
+        runner = _RUNNERS.get(key)
+        if runner is None:
+            runner = _RUNNERS[key] = InProcessDbt(project_dir, profiles_dir)
+        return runner
+
 
 class DbtOrchestrator:
     """Orchestrates dbt commands for Yudai V2"""
     
-    def __init__(self, project_dir: Optional[str] = None, profiles_dir: Optional[str] = None):
+    def __init__(self, project_dir: Optional[str] = None, profiles_dir: Optional[str] = None,
+                 backend: str = "auto", events: Optional[EventStream] = None):
         self.project_dir = Path(project_dir) if project_dir else Path.cwd()
         self.profiles_dir = Path(profiles_dir) if profiles_dir else Path.home() / ".dbt"
         self.dbt_project_path = self.project_dir / "dbt_project.yml"
@@ -44,64 +263,168 @@ class DbtOrchestrator:
         # Ensure dbt project exists
         if not self.dbt_project_path.exists():
             raise FileNotFoundError(f"dbt_project.yml not found at {self.dbt_project_path}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}; expected one of {BACKENDS}")
+
+        self.backend = backend
+        # Progress events (node started/finished) for live consumers such as the API
+        self.events = events
+        self.history = RunHistory(str(history_path(self.project_dir)))
+        self._in_process: Optional[InProcessDbt] = None
+        if backend != "subprocess":
+            try:
+                self._in_process = in_process_runner(self.project_dir, self.profiles_dir)
+            except ImportError as e:
+                if backend == "inprocess":
+                    raise
+                logger.warning(f"dbt is not importable ({e}); using the dbt CLI in subprocesses")
         
-        logger.info(f"Initialized dbt orchestrator for project: {self.project_dir}")
-    
+        logger.info(f"Initialized dbt orchestrator for project: {self.project_dir} "
+                    f"({'in-process' if self._in_process else 'subprocess'})")
+
     def _run_dbt_command(self, command: List[str], timeout: int = 300) -> DbtRunResult:
-        """Execute a dbt command and return the result"""
+        """Execute a dbt command in-process, falling back to a subprocess if the project fails to parse"""
+        if self._in_process is None:
+            return self._run_dbt_subprocess(command, timeout)
+
+        start_time = datetime.now()
+        logger.info(f"Executing in-process: dbt {' '.join(command)}")
+        self._publish({"type": "command_started", "command": ' '.join(command)})
+        output = self._command_output(command)
+        try:
+            with stage(f"dbt_{command[0]}"):
+                success, return_code, stdout, stderr = self._in_process.invoke(command, output)
+        except Exception as e:
+            # Only a failure before dbt started is safe to retry; otherwise nodes may have run
+            if isinstance(e, DbtSetupError) and self.backend != "inprocess":
+                logger.warning(f"In-process dbt failed before running ({e}); retrying in a subprocess")
+                return self._run_dbt_subprocess(command, timeout)
+            logger.error(f"❌ Command failed with exception: {e}")
+            result = DbtRunResult(command=' '.join(command), success=False, stdout="", stderr=str(e),
+                                  return_code=-1, duration=(datetime.now() - start_time).total_seconds())
+            self._publish_finished(result)
+            return result
+
+        duration = (datetime.now() - start_time).total_seconds()
+        if success:
+            logger.info(f"✅ Command succeeded: {' '.join(command)} (took {duration:.2f}s)")
+        else:
+            logger.error(f"❌ Command failed: {' '.join(command)} (return code: {return_code})")
+        result = DbtRunResult(command=' '.join(command), success=success, stdout=stdout, stderr=stderr,
+                              return_code=return_code, duration=duration, listed=output.listed)
+        self._collect_node_results(command, result, start_time)
+        self._publish_finished(result)
+        return result
+
+    def _command_output(self, command: List[str]) -> CommandOutput:
+        # Long output spills under target/, where only the newest few spill files are kept
+        return CommandOutput(' '.join(command), self.events, spill_dir=str(self.project_dir / "target" / "spill"))
+
+    def _collect_node_results(self, command: List[str], result: DbtRunResult, start_time: datetime) -> None:
+        """Attach this command's per-node results and add them to the timing history"""
+        if command[0] not in NODE_COMMANDS:
+            return
+        target_dir = self.project_dir / "target"
+        if "--target-path" in command:
+            target_dir = self.project_dir / command[command.index("--target-path") + 1]
+        run_results_path = target_dir / "run_results.json"
+        # A run that failed before executing anything leaves the previous command's file behind
+        if not run_results_path.exists() or run_results_path.stat().st_mtime < start_time.timestamp():
+            return
+        try:
+            result.nodes = node_rows(load_artifact(run_results_path), load_artifact(target_dir / "manifest.json"),
+                                     command=command[0])
+            self.history.record(result.nodes)
+        except Exception as e:
+            logger.warning(f"Could not record run results for {result.command}: {e}")
+
+    def _run_dbt_subprocess(self, command: List[str], timeout: int = 300) -> DbtRunResult:
+        """Execute a dbt command with the CLI, streaming its JSON logs into progress events"""
         start_time = datetime.now()
         
         # Prepare the full command
         full_command = ["dbt"] + command + [
             "--project-dir", str(self.project_dir),
-            "--profiles-dir", str(self.profiles_dir)
+            "--profiles-dir", str(self.profiles_dir),
+            "--log-format", "json"
         ]
         
         logger.info(f"Executing: {' '.join(full_command)}")
+        output = self._command_output(command)
+        self._publish({"type": "command_started", "command": ' '.join(command)})
+        timed_out = threading.Event()
         
         try:
-            result = subprocess.run(
-                full_command,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=self.project_dir
-            )
+            # Children are included so the peak RSS reflects the dbt process itself
+            with stage(f"dbt_{command[0]}", include_children=True):
+                process = subprocess.Popen(
+                    full_command,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    bufsize=1,
+                    cwd=self.project_dir
+                )
+
+                def kill():
+                    timed_out.set()
+                    process.kill()
+
+                timer = threading.Timer(timeout, kill)
+                timer.start()
+                try:
+                    # Lines are handled as dbt writes them instead of being held until exit
+                    for line in process.stdout:
+                        output.line(line)
+                    return_code = process.wait()
+                finally:
+                    timer.cancel()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(full_command, timeout)
             
             duration = (datetime.now() - start_time).total_seconds()
+            stdout, stderr = output.close()
+            if return_code != 0 and not stderr:
+                stderr = "\n".join(list(output.output.lines)[-20:])
             
             dbt_result = DbtRunResult(
                 command=' '.join(command),
-                success=result.returncode == 0,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                return_code=result.returncode,
-                duration=duration
+                success=return_code == 0,
+                stdout=stdout,
+                stderr=stderr,
+                return_code=return_code,
+                duration=duration,
+                listed=output.listed
             )
             
             if dbt_result.success:
                 logger.info(f"✅ Command succeeded: {dbt_result.command} (took {duration:.2f}s)")
             else:
-                logger.error(f"❌ Command failed: {dbt_result.command} (return code: {result.returncode})")
-                logger.error(f"STDERR: {result.stderr}")
+                logger.error(f"❌ Command failed: {dbt_result.command} (return code: {return_code})")
+                logger.error(f"STDERR: {stderr}")
             
+            self._collect_node_results(command, dbt_result, start_time)
+            self._publish_finished(dbt_result)
             return dbt_result
             
         except subprocess.TimeoutExpired:
             duration = (datetime.now() - start_time).total_seconds()
             logger.error(f"❌ Command timed out after {timeout}s: {' '.join(command)}")
-            return DbtRunResult(
+            dbt_result = DbtRunResult(
                 command=' '.join(command),
                 success=False,
-                stdout="",
+                stdout=output.close()[0],
                 stderr=f"Command timed out after {timeout} seconds",
                 return_code=-1,
                 duration=duration
             )
+            self._publish_finished(dbt_result)
+            return dbt_result
         except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
             logger.error(f"❌ Command failed with exception: {e}")
-            return DbtRunResult(
+            output.close()
+            dbt_result = DbtRunResult(
                 command=' '.join(command),
                 success=False,
                 stdout="",
@@ -109,6 +432,17 @@ class DbtOrchestrator:
                 return_code=-1,
                 duration=duration
             )
+            self._publish_finished(dbt_result)
+            return dbt_result
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        if self.events is not None:
+            self.events.publish(event)
+
+    def _publish_finished(self, result: DbtRunResult) -> None:
+        self._publish({"type": "command_finished", "command": result.command, "success": result.success,
+                       "return_code": result.return_code, "duration": result.duration,
+                       "nodes": len(result.nodes)})
     
     def debug(self) -> DbtRunResult:
         """Run dbt debug to check configuration"""
@@ -118,40 +452,102 @@ class DbtOrchestrator:
         """Install dbt dependencies"""
         return self._run_dbt_command(["deps"])
     
-    def seed(self, select: Optional[str] = None) -> DbtRunResult:
+    def load(self, upload_dir: Optional[str] = None) -> DbtRunResult:
+        """Bulk-load uploads into the DuckDB warehouse (unchanged files are skipped) instead of seeding them"""
+        from dbt_bulk_loader import UPLOAD_DIR, load_uploads
+
+        start_time = datetime.now()
+        upload_dir = upload_dir or str(self.project_dir / UPLOAD_DIR)
+        try:
+            with stage("dbt_load"):
+                # Same profiles as dbt, so both use the same warehouse file
+                results = load_uploads(upload_dir, project_dir=str(self.project_dir),
+                                       profiles_dir=str(self.profiles_dir))
+        except Exception as e:
+            logger.error(f"❌ Bulk load failed: {e}")
+            return DbtRunResult(command="load", success=False, stdout="", stderr=str(e), return_code=-1,
+                                duration=(datetime.now() - start_time).total_seconds())
+
+        duration = (datetime.now() - start_time).total_seconds()
+        loaded = [r.table for r in results if not r.skipped]
+        summary = f"Loaded {len(loaded)} tables, skipped {len(results) - len(loaded)} unchanged"
+        logger.info(f"✅ Command succeeded: load (took {duration:.2f}s). {summary}")
+        # The source declaration may have changed; the next command re-parses if so
+        return DbtRunResult(command="load", success=True, stdout=summary, stderr="", return_code=0, duration=duration)
+
+    def seed(self, select: Optional[str] = None, state: Optional[str] = None) -> DbtRunResult:
         """Run dbt seed to load CSV files"""
         command = ["seed"]
         if select:
             command.extend(["--select", select])
+        if state:
+            command.extend(["--state", state])
         return self._run_dbt_command(command)
     
-    def run(self, select: Optional[str] = None, models: Optional[List[str]] = None) -> DbtRunResult:
+    def run(self, select: Optional[str] = None, models: Optional[List[str]] = None,
+            state: Optional[str] = None) -> DbtRunResult:
         """Run dbt models"""
         command = ["run"]
         if select:
             command.extend(["--select", select])
         elif models:
             command.extend(["--models"] + models)
+        if state:
+            command.extend(["--state", state])
         return self._run_dbt_command(command)
     
-    def test(self, select: Optional[str] = None) -> DbtRunResult:
+    def test(self, select: Optional[str] = None, state: Optional[str] = None) -> DbtRunResult:
         """Run dbt tests"""
         command = ["test"]
         if select:
             command.extend(["--select", select])
+        if state:
+            command.extend(["--state", state])
         return self._run_dbt_command(command)
     
-    def snapshot(self, select: Optional[str] = None) -> DbtRunResult:
+    def snapshot(self, select: Optional[str] = None, state: Optional[str] = None) -> DbtRunResult:
         """Run dbt snapshots"""
         command = ["snapshot"]
         if select:
             command.extend(["--select", select])
+        if state:
+            command.extend(["--state", state])
         return self._run_dbt_command(command)
     
-    def run_pipeline(self, steps: List[str] = None, select: Optional[str] = None) -> Dict[str, DbtRunResult]:
-        """Run a complete dbt pipeline with specified steps"""
+    def run_pipeline(self, steps: List[str] = None, select: Optional[str] = None,
+                     concurrency: int = 1, state: Optional[str] = None) -> Dict[str, DbtRunResult]:
+        """Run a complete dbt pipeline with specified steps.
+
+        With ``concurrency`` above 1 the selection is split into independent
+        components that run concurrently (see ``run_pipeline_concurrently``),
+        unless the target has a single writer: then one invocation per step,
+        parallelized by dbt's own threads, beats running components one by one.
+        With a ``state`` directory only nodes that are new or changed since the
+        last successful pipeline (and their dependents) are built; the first run
+        builds everything.
+        """
         if steps is None:
             steps = ["seed", "run", "test"]
+        state_args = None
+        if state:
+            if (Path(state) / "manifest.json").exists():
+                select, state_args = modified_selection(state, select), state
+            else:
+                logger.info(f"No saved state in {state}; building everything selected")
+        if concurrency > 1 and self.single_writer():
+            logger.info("Target has a single writer; running each step once across all components")
+        elif concurrency > 1 and set(steps) - {"load"} <= set(COMPONENT_STEPS):
+            results = {}
+            # Loading is one step for every dataset, before the per-component work
+            if "load" in steps:
+                results["load"] = self.load()
+                if not results["load"].success:
+                    return results
+            results.update(self.run_pipeline_concurrently([s for s in steps if s != "load"], select=select,
+                                                          concurrency=concurrency, state=state_args))
+            if state and all(r.success for r in results.values()):
+                self.save_state(state)
+            return results
         
         results = {}
         
@@ -159,15 +555,17 @@ class DbtOrchestrator:
         
         for step in steps:
             if step == "seed":
-                results[step] = self.seed(select=select)
+                results[step] = self.seed(select=select, state=state_args)
             elif step == "run":
-                results[step] = self.run(select=select)
+                results[step] = self.run(select=select, state=state_args)
             elif step == "test":
-                results[step] = self.test(select=select)
+                results[step] = self.test(select=select, state=state_args)
             elif step == "snapshot":
-                results[step] = self.snapshot(select=select)
+                results[step] = self.snapshot(select=select, state=state_args)
             elif step == "deps":
                 results[step] = self.deps()
+            elif step == "load":
+                results[step] = self.load()
             else:
                 logger.warning(f"Unknown step: {step}")
                 continue
@@ -185,15 +583,131 @@ class DbtOrchestrator:
             logger.error(f"❌ Pipeline completed with failures. Successful: {successful_steps}, Failed: {failed_steps}")
         else:
             logger.info(f"✅ Pipeline completed successfully. Steps: {successful_steps}")
+            if state:
+                self.save_state(state)
         
         return results
 
+    def timing_report(self, limit: int = 10, window: Optional[int] = None) -> Dict[str, Any]:
+        """Slowest models and models that regressed against their rolling baseline"""
+        return self.history.report(limit=limit, **({"window": window} if window else {}))
+
+    def save_state(self, state: str) -> None:
+        """Keep the current manifest as the baseline for the next ``state:modified`` comparison"""
+        manifest = self.project_dir / "target" / "manifest.json"
+        if not manifest.exists():
+            logger.warning(f"No manifest at {manifest}; state not saved")
+            return
+        Path(state).mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(manifest, Path(state) / "manifest.json")
+
+    def manifest(self) -> Dict[str, Any]:
+        """Parsed project manifest, from the in-process runner or ``dbt parse``"""
+        if self._in_process is not None:
+            try:
+                return self._in_process.manifest()
+            except Exception as e:
+                logger.warning(f"In-process parse failed ({e}); parsing in a subprocess")
+        result = self._run_dbt_subprocess(["parse"])
+        if not result.success:
+            raise RuntimeError(f"dbt parse failed: {result.stderr or result.stdout}")
+        with open(self.project_dir / "target" / "manifest.json") as f:
+            return json.load(f)
+
+    def resolve_selection(self, select: str, state: Optional[str] = None) -> Set[str]:
+        """unique_ids matched by a dbt selector (via ``dbt ls``)"""
+        command = ["ls", "--select", select, "--output", "json", "--output-keys", "unique_id"]
+        result = self._run_dbt_command(command + (["--state", state] if state else []))
+        if not result.success:
+            raise RuntimeError(f"Could not resolve selection {select!r}: {result.stderr}")
+        selected = set()
+        for line in result.listed:
+            try:
+                selected.add(json.loads(line)["unique_id"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        return selected
+
+    def single_writer(self) -> bool:
+        """True when the target is a DuckDB file, which only one process can write at a time"""
+        from dbt_bulk_loader import profile_output
+
+        output = profile_output(self.project_dir, self.profiles_dir)
+        if output is None:
+            return False
+        return output.get("type") == "duckdb" and output.get("path", ":memory:") != ":memory:"
+
+    def _run_component(self, index: int, component: List[str], steps: List[str],
+                       graph: Dict[str, Dict[str, Any]], concurrent: bool) -> Dict[str, DbtRunResult]:
+        """Run the pipeline steps for one component in order.
+
+        Nodes that fail, and everything downstream of them, are left out of the
+        later steps; the rest of the component carries on.
+        """
+        results = {}
+        first = min(graph[uid]["name"] for uid in component)
+        blocked: Set[str] = set()
+        # Separate target dirs so concurrent runs don't overwrite each other's artifacts
+        target_path = str(self.project_dir / "target" / "components" / str(index))
+        for step in steps:
+            step_uids = [uid for uid in component
+                         if graph[uid]["resource_type"] in COMPONENT_STEPS[step] and uid not in blocked]
+            if not step_uids:
+                continue
+            command = [step, "--select", *sorted(graph[uid]["name"] for uid in step_uids),
+                       "--target-path", target_path]
+            key = f"{step}:{first}"
+            # In-process dbt isn't thread-safe, so concurrent components use the CLI
+            run = self._run_dbt_subprocess if concurrent else self._run_dbt_command
+            results[key] = run(command)
+            if not results[key].success:
+                failed = {node["unique_id"] for node in results[key].nodes
+                          if node.get("status") in FAILED_STATUSES}
+                # Without per-node results, any of this step's nodes may have failed
+                blocked |= downstream(graph, failed or set(step_uids))
+                logger.error(f"❌ Component {first} failed at step: {step}; skipping {len(blocked)} "
+                             f"downstream node(s), the rest of the pipeline continues")
+        return results
+
+    def run_pipeline_concurrently(self, steps: List[str], select: Optional[str] = None,
+                                  concurrency: int = 4, state: Optional[str] = None) -> Dict[str, DbtRunResult]:
+        """Run the steps per independent component of the DAG, ``concurrency`` components at a time.
+
+        A failure only stops what depends on the failed nodes. Results are keyed
+        ``"<step>:<first node in component>"``. A DuckDB file has a single writer,
+        so against one the components run one at a time (``run_pipeline`` doesn't
+        schedule components for such targets at all).
+        """
+        graph = manifest_graph(self.manifest())
+        selected = self.resolve_selection(select, state) if select else {
+            uid for uid, node in graph.items()
+            if any(node["resource_type"] in COMPONENT_STEPS[step] for step in steps)}
+        components = independent_components(graph, selected)
+
+        workers = 1 if self.single_writer() else concurrency
+        logger.info(f"🚀 Scheduling {len(components)} independent components with {workers} worker(s), "
+                    f"steps: {steps}")
+
+        results: Dict[str, DbtRunResult] = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._run_component, i, component, steps, graph, workers > 1)
+                       for i, component in enumerate(components)]
+            for future in futures:
+                results.update(future.result())
+
+        failed = [key for key, result in results.items() if not result.success]
+        if failed:
+            logger.error(f"❌ Pipeline completed with failures: {failed}")
+        else:
+            logger.info(f"✅ Pipeline completed successfully: {len(results)} component steps")
+        return results
+
 def main():
     """CLI interface for the dbt orchestrator"""
     import argparse
     
     parser = argparse.ArgumentParser(description="Yudai V2 dbt Orchestrator")
-    parser.add_argument("command", choices=["debug", "deps", "seed", "run", "test", "snapshot", "pipeline"], 
+    parser.add_argument("command", choices=["debug", "deps", "load", "seed", "run", "test", "snapshot", "pipeline", "report"], 
                        help="dbt command to execute")
     parser.add_argument("--select", help="dbt selector for models/tests")
     parser.add_argument("--models", nargs="+", help="specific models to run")
@@ -201,6 +715,12 @@ def main():
                        help="pipeline steps (for pipeline command)")
     parser.add_argument("--project-dir", help="dbt project directory")
     parser.add_argument("--profiles-dir", help="dbt profiles directory")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="independent components to run at once (for pipeline command)")
+    parser.add_argument("--state", help="only build nodes changed since the last successful pipeline "
+                                        "(state is saved in this directory)")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="run dbt in-process (reusing the parsed manifest) or as CLI subprocesses")
     parser.add_argument("--json", action="store_true", help="output results as JSON")
     
     args = parser.parse_args()
@@ -208,13 +728,16 @@ def main():
     try:
         orchestrator = DbtOrchestrator(
             project_dir=args.project_dir,
-            profiles_dir=args.profiles_dir
+            profiles_dir=args.profiles_dir,
+            backend=args.backend
         )
         
         if args.command == "debug":
             result = orchestrator.debug()
         elif args.command == "deps":
             result = orchestrator.deps()
+        elif args.command == "load":
+            result = orchestrator.load()
         elif args.command == "seed":
             result = orchestrator.seed(select=args.select)
         elif args.command == "run":
@@ -223,8 +746,12 @@ def main():
             result = orchestrator.test(select=args.select)
         elif args.command == "snapshot":
             result = orchestrator.snapshot(select=args.select)
+        elif args.command == "report":
+            print(json.dumps(orchestrator.timing_report(), indent=2))
+            sys.exit(0)
         elif args.command == "pipeline":
-            results = orchestrator.run_pipeline(steps=args.steps, select=args.select)
+            results = orchestrator.run_pipeline(steps=args.steps, select=args.select,
+                                                concurrency=args.concurrency, state=args.state)
             if args.json:
                 print(json.dumps({
                     step: {